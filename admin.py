@@ -12,6 +12,7 @@ from flask import Blueprint, render_template, request, redirect, url_for, sessio
 
 import models
 from modules.utils import safe_int
+from modules.db_manager import make_page_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -207,8 +208,9 @@ def dashboard():
     stats = {}
     recent_activities = []
     if models.db_manager:
-        stats = models.db_manager.get_today_stats()
-        recent_activities = models.db_manager.get_recent_activities(30)
+        with models.db_manager.read_replica():
+            stats = models.db_manager.get_today_stats()
+            recent_activities = models.db_manager.get_recent_activities(30)
     return render_template("admin/dashboard.html", stats=stats, recent_activities=recent_activities)
 
 
@@ -217,10 +219,9 @@ def dashboard():
 @admin_bp.route("/campaigns")
 @admin_required
 def campaigns():
-    import re as _re
-    from datetime import date as _date, datetime as _datetime, timezone as _tz, timedelta as _td
-    from modules.utils import safe_int
-    _KST = _tz(_td(hours=9))
+    from modules.utils import safe_int, now_kst
+    from modules.schedule_engine import schedule_for
+    today_kst = now_kst().date()
 
     status_filter = request.args.get("status", "")
 
@@ -231,10 +232,6 @@ def campaigns():
             1, 9999, status_filter
         )
 
-    # 자동 상태 전환 (모집중→모집마감→마감)
-    if models.db_manager:
-        models.db_manager.auto_update_campaign_statuses()
-
     # 실시간 통계 반영
     stats = {}
     if models.db_manager:
@@ -249,27 +246,9 @@ def campaigns():
         c["리뷰완료"] = str(s.get("review_done", 0))
         c["정산완료"] = str(s.get("settlement_done", 0))
 
-        # 오늘 목표 계산
-        today_target = 0
-        schedule = c.get("일정", [])
-        start_date_str = c.get("시작일", "").strip() if c.get("시작일") else ""
-        if schedule and start_date_str:
-            try:
-                start = _datetime.strptime(start_date_str, "%Y-%m-%d").date()
-                today_kst = _datetime.now(_KST).date()
-                day_index = (today_kst - start).days
-                if 0 <= day_index < len(schedule):
-                    today_target = safe_int(schedule[day_index])
-            except Exception:
-                pass
-        if not today_target:
-            daily_str = c.get("일수량", "").strip() if c.get("일수량") else ""
-            if daily_str:
-                range_match = _re.match(r"(\d+)\s*[-~]\s*(\d+)", daily_str)
-                if range_match:
-                    today_target = safe_int(range_match.group(2))
-                else:
-                    today_target = safe_int(daily_str)
+        # 오늘 목표 계산 (일정 기간 밖/0이면 일수량 표시)
+        schedule = schedule_for(c)
+        today_target = schedule.display_target(today_kst)
         # 총수량 다 찼으면 오늘목표 무의미
         active_cnt = safe_int(c.get("신청수", 0))
         total_cnt = safe_int(c.get("총수량", 0))
@@ -278,12 +257,8 @@ def campaigns():
         c["오늘목표"] = str(today_target)
 
         # 모집전 판단 (시작일 이전)
-        if start_date_str and c.get("상태") in ("모집중", "진행중", ""):
-            try:
-                if _datetime.now(_KST).date() < _datetime.strptime(start_date_str, "%Y-%m-%d").date():
-                    c["_not_started"] = True
-            except Exception:
-                pass
+        if c.get("상태") in ("모집중", "진행중", "") and schedule.not_started(today_kst):
+            c["_not_started"] = True
 
         # 당일마감 판단
         today_done = safe_int(c.get("오늘수량", 0))
@@ -588,6 +563,42 @@ def api_promotion_toggle():
     return jsonify({"ok": False, "error": result.get("error", "서버PC 연결 실패")}), 500
 
 
+@admin_bp.route("/api/db/pool", methods=["GET"])
+@admin_required
+def api_db_pool():
+    """DB 커넥션 풀 지표 (풀 크기 산정용)"""
+    if not models.db_manager:
+        return jsonify({"ok": False, "error": "DB 비활성화"}), 503
+    return jsonify({"ok": True, "pools": models.db_manager.pool_stats()})
+
+
+@admin_bp.route("/api/db/queries", methods=["GET"])
+@admin_required
+def api_db_queries():
+    """쿼리 계측 top-N (?n=20&sort=total|p95|count|max&group=method|scope|scope_method)"""
+    from modules.query_stats import query_stats
+    n = min(max(request.args.get("n", 20, type=int), 1), 200)
+    sort = request.args.get("sort", "total")
+    group = request.args.get("group", "method")
+    return jsonify({
+        "ok": True,
+        "since": query_stats.since,
+        "slow_query_ms": query_stats.slow_ms,
+        "sort": sort,
+        "group": group,
+        "items": query_stats.top(n, sort, group),
+    })
+
+
+@admin_bp.route("/api/db/queries/reset", methods=["POST"])
+@admin_required
+def api_db_queries_reset():
+    """쿼리 계측 초기화 (튜닝 전후 비교용)"""
+    from modules.query_stats import query_stats
+    query_stats.reset()
+    return jsonify({"ok": True})
+
+
 import re as _re
 
 
@@ -859,12 +870,13 @@ def api_campaign_distribute_photos(campaign_id):
         if not unassigned:
             return jsonify({"ok": True, "assigned": 0, "notified": 0, "message": "배분할 리뷰어가 없습니다"})
 
+        # 빈 세트를 한 번에 점유 (동시 신청/배분과 번호 충돌 없음). 세트가 모자라면 앞쪽부터.
+        claimed = models.db_manager.claim_asset_slots(
+            campaign_id, "photo", [p["progress_id"] for p in unassigned])
         for prog in unassigned:
-            next_set = models.db_manager.get_next_photo_set_number(campaign_id)
+            next_set = claimed.get(prog["progress_id"])
             if next_set is None:
-                break
-
-            models.db_manager.assign_photo_set([prog["progress_id"]], next_set)
+                continue
             assigned_count += 1
 
             if skip_notify:
@@ -902,31 +914,21 @@ def api_campaign_distribute_photos(campaign_id):
 
 # ──────── 캠페인 리뷰내용 자동분배 ────────
 
+def _distribute_review_texts(campaign_id: str, unassigned: list[dict]) -> int:
+    """미할당 진행건에 리뷰내용 배분 (사진세트와 같은 번호가 비어 있으면 우선). 배분 건수 반환"""
+    preferred = {p["progress_id"]: p["photo_set_number"]
+                 for p in unassigned if p.get("photo_set_number")}
+    claimed = models.db_manager.claim_asset_slots(
+        campaign_id, "text", [p["progress_id"] for p in unassigned], preferred=preferred)
+    return len(claimed)
+
+
 def _auto_distribute_review_texts(campaign_id: str):
     """리뷰내용 업로드 후 기존 미할당 리뷰어에게 자동 배분"""
     try:
-        review_texts = models.db_manager.get_campaign_review_texts(campaign_id)
-        if not review_texts:
-            return
         unassigned = models.db_manager.get_unassigned_review_text_progress(campaign_id)
-        for prog in unassigned:
-            # 사진세트 번호가 있으면 같은 번호의 리뷰내용 매칭 시도
-            psn = prog.get("photo_set_number")
-            if psn and psn in review_texts:
-                next_num = psn
-                # 이미 다른 사람에게 할당됐는지 체크
-                chk = models.db_manager._fetchone(
-                    """SELECT 1 FROM progress WHERE campaign_id = %s
-                       AND review_text_number = %s AND status NOT IN ('타임아웃취소','취소') LIMIT 1""",
-                    (campaign_id, psn),
-                )
-                if chk:
-                    next_num = models.db_manager.get_next_review_text_number(campaign_id)
-            else:
-                next_num = models.db_manager.get_next_review_text_number(campaign_id)
-            if next_num is None:
-                break
-            models.db_manager.assign_review_text([prog["progress_id"]], next_num)
+        if unassigned:
+            _distribute_review_texts(campaign_id, unassigned)
     except Exception as e:
         logger.warning(f"리뷰내용 자동배분 실패: {e}")
 
@@ -1040,25 +1042,7 @@ def api_distribute_review_texts(campaign_id):
         if not unassigned:
             return jsonify({"ok": True, "assigned": 0, "message": "배분할 리뷰어가 없습니다"})
 
-        assigned_count = 0
-        for prog in unassigned:
-            psn = prog.get("photo_set_number")
-            if psn and psn in review_texts:
-                next_num = psn
-                chk = models.db_manager._fetchone(
-                    """SELECT 1 FROM progress WHERE campaign_id = %s
-                       AND review_text_number = %s AND status NOT IN ('타임아웃취소','취소') LIMIT 1""",
-                    (campaign_id, psn),
-                )
-                if chk:
-                    next_num = models.db_manager.get_next_review_text_number(campaign_id)
-            else:
-                next_num = models.db_manager.get_next_review_text_number(campaign_id)
-            if next_num is None:
-                break
-            models.db_manager.assign_review_text([prog["progress_id"]], next_num)
-            assigned_count += 1
-
+        assigned_count = _distribute_review_texts(campaign_id, unassigned)
         return jsonify({"ok": True, "assigned": assigned_count})
     except Exception as e:
         logger.error(f"리뷰내용 배분 에러: {e}")
@@ -1191,7 +1175,7 @@ def api_campaigns_export_csv():
                 writer.writerow([c.get(col, "") for col in columns])
     else:
         # 필터 기반 전체
-        items, _ = models.db_manager.get_campaigns_page(1, 9999, status, company=company, search=search)
+        items, _ = models.db_manager.get_campaigns_page(1, 9999, status, company=company, search=search, count="none")
         for c in items:
             writer.writerow([c.get(col, "") for col in columns])
 
@@ -1540,7 +1524,7 @@ def reviews():
     purchase_count = 0
     review_count = 0
     if models.db_manager:
-        all_items = models.db_manager.get_all_reviewers()
+        all_items = models.db_manager.get_ai_check_requests()
         # 구매캡쳐 확인요청: AI구매검수가 확인요청인 건
         purchase_items = [i for i in all_items if i.get("AI구매검수") == "확인요청"]
         # 리뷰캡쳐 확인요청: AI리뷰검수가 확인요청인 건
@@ -1690,6 +1674,7 @@ def api_reviews_ai_reject():
                    WHERE id = %s""",
                 (f"구매캡쳐 반려: {reason}", progress_id),
             )
+            models.db_manager.notify_counters_changed()
         else:
             # 리뷰캡쳐 반려: 기존 reject_review 로직
             models.db_manager.reject_review(progress_id, reason)
@@ -1865,15 +1850,10 @@ def settlement_process():
 
     row_indices = request.form.getlist("row_idx")
     processed = 0
-    for id_str in row_indices:
-        try:
-            progress_id = int(id_str)
-            row_data = models.db_manager.get_row_dict(progress_id)
-            amount = row_data.get("입금금액", "0") or "0"
-            models.db_manager.process_settlement(progress_id, amount)
-            processed += 1
-        except Exception as e:
-            logger.error(f"정산 처리 에러 (id {id_str}): {e}")
+    try:
+        processed = len(models.db_manager.bulk_process_settlement(row_indices))
+    except Exception as e:
+        logger.error(f"정산 처리 에러 ({len(row_indices)}건): {e}")
 
     flash(f"{processed}건 정산 처리 완료")
     return redirect(url_for("admin.settlement"))
@@ -1911,11 +1891,7 @@ def settlement_download():
         return redirect(url_for("admin.settlement"))
 
     id_list = [int(x) for x in ids_str.split(",") if x.strip().isdigit()]
-    items = []
-    for pid in id_list:
-        row = models.db_manager.get_row_dict(pid)
-        if row:
-            items.append(row)
+    items = models.db_manager.bulk_get_rows(id_list)
 
     output = io.StringIO()
     output.write('\ufeff')  # UTF-8 BOM for Excel
@@ -1947,17 +1923,27 @@ def reviewers():
     page = request.args.get("page", 1, type=int)
     per_page = 50
     q = request.args.get("q", "").strip()
+    after = request.args.get("after", "")
+    before = request.args.get("before", "")
+    exact = request.args.get("exact", "") == "1"
 
     items = []
     total = 0
     if models.db_manager:
-        items, total = models.db_manager.get_progress_page(page, per_page, q=q)
+        # 이전/다음은 keyset 커서, 총 건수는 요청 시에만 정확히 셈
+        items, total = models.db_manager.get_progress_page(
+            page, per_page, q=q, cursor=after or before, before=bool(before and not after),
+            count="exact" if exact else "estimate",
+        )
 
     total_pages = (total + per_page - 1) // per_page if total else 1
+    next_cursor = make_page_cursor(items[-1]) if len(items) >= per_page else ""
+    prev_cursor = make_page_cursor(items[0]) if page > 1 and items else ""
 
     return render_template("admin/dashboard.html", stats={}, recent_messages=[],
                            reviewers=items, q=q, show_reviewers=True,
-                           page=page, total_pages=total_pages, total=total)
+                           page=page, total_pages=total_pages, total=total,
+                           total_exact=exact, next_cursor=next_cursor, prev_cursor=prev_cursor)
 
 
 # ──────── 가이드 ────────
@@ -2209,15 +2195,7 @@ def api_kakao_bulk():
     if not progress_ids:
         return jsonify({"ok": False, "message": "progress_ids 필수"})
 
-    sent = 0
-    for pid in progress_ids:
-        try:
-            ok = models.kakao_notifier.send_reminder(int(pid), custom_message)
-            if ok:
-                sent += 1
-        except Exception:
-            pass
-
+    sent = models.kakao_notifier.send_reminders(progress_ids, custom_message)
     return jsonify({"ok": True, "sent": sent, "total": len(progress_ids)})
 
 
@@ -2378,6 +2356,8 @@ def debug_campaigns():
         ]
         cards = models.campaign_manager.build_campaign_cards("테스트", "010-0000-0000")
         result["cards"] = cards
+        result["catalog"] = models.campaign_manager.catalog.stats()
+        result["slot_gate"] = models.campaign_manager.slot_gate.stats()
     if models.db_manager:
         result["stats"] = models.db_manager.get_campaign_stats()
         try:
@@ -2399,14 +2379,19 @@ def spreadsheet():
     campaign_filter = request.args.get("campaign", "")
     status_filter = request.args.get("status", "")
     q_filter = request.args.get("q", "").strip()
+    after = request.args.get("after", "")
+    before = request.args.get("before", "")
+    exact = request.args.get("exact", "") == "1"
 
     items = []
     total = 0
     campaigns = []
     if models.db_manager:
+        # 이전/다음은 keyset 커서, 총 건수는 요청 시에만 정확히 셈
         items, total = models.db_manager.get_progress_page(
             page, per_page, campaign_id=campaign_filter, status=status_filter,
-            q=q_filter
+            q=q_filter, cursor=after or before, before=bool(before and not after),
+            count="exact" if exact else "estimate",
         )
         try:
             campaigns = models.db_manager.get_campaigns_simple()
@@ -2414,6 +2399,8 @@ def spreadsheet():
             campaigns = []
 
     total_pages = (total + per_page - 1) // per_page if total else 1
+    next_cursor = make_page_cursor(items[-1]) if len(items) >= per_page else ""
+    prev_cursor = make_page_cursor(items[0]) if page > 1 and items else ""
 
     return render_template("admin/spreadsheet.html",
                            items=items, campaigns=campaigns,
@@ -2422,7 +2409,8 @@ def spreadsheet():
                            q_filter=q_filter,
                            per_page=per_page,
                            page=page, total_pages=total_pages,
-                           total=total)
+                           total=total, total_exact=exact,
+                           next_cursor=next_cursor, prev_cursor=prev_cursor)
 
 
 @admin_bp.route("/api/timeout-sessions")
@@ -2517,8 +2505,6 @@ def api_progress_update():
 
     try:
         models.db_manager.update_progress_field(int(progress_id), field, value)
-        if field == "상태":
-            models.db_manager.auto_update_campaign_statuses()
         return jsonify({"ok": True})
     except Exception as e:
         logger.error(f"스프레드시트 수정 에러: {e}")
@@ -2704,6 +2690,7 @@ def api_progress_extend_time():
             "UPDATE progress SET created_at = NOW(), updated_at = NOW() WHERE id = %s",
             (int(progress_id),)
         )
+        models.db_manager.notify_counters_changed()
         from app import _touch_reviewer_by_row
         _touch_reviewer_by_row(int(progress_id))
         return jsonify({"ok": True})
@@ -2719,13 +2706,10 @@ def api_progress_bulk_delete():
     ids = data.get("progress_ids", [])
     if not ids or not models.db_manager:
         return jsonify({"ok": False, "message": "항목 없음"})
-    done = 0
-    for pid in ids:
-        try:
-            if models.db_manager.delete_progress(int(pid)):
-                done += 1
-        except Exception:
-            pass
+    try:
+        done = len(models.db_manager.bulk_delete_progress(ids))
+    except Exception as e:
+        return jsonify({"ok": False, "message": str(e)})
     return jsonify({"ok": True, "done": done, "total": len(ids)})
 
 
@@ -2738,14 +2722,10 @@ def api_progress_bulk_status():
     status = data.get("status", "")
     if not ids or not status or not models.db_manager:
         return jsonify({"ok": False, "message": "항목/상태 없음"})
-    done = 0
-    for pid in ids:
-        try:
-            models.db_manager.update_progress_field(int(pid), "상태", status)
-            done += 1
-        except Exception:
-            pass
-    models.db_manager.auto_update_campaign_statuses()
+    try:
+        done = len(models.db_manager.bulk_update_status(ids, status))
+    except Exception as e:
+        return jsonify({"ok": False, "message": str(e)})
     return jsonify({"ok": True, "done": done, "total": len(ids)})
 
 
@@ -2757,18 +2737,14 @@ def api_progress_bulk_extend():
     ids = data.get("progress_ids", [])
     if not ids or not models.db_manager:
         return jsonify({"ok": False, "message": "항목 없음"})
-    from app import _touch_reviewer_by_row
-    done = 0
-    for pid in ids:
-        try:
-            models.db_manager._execute(
-                "UPDATE progress SET created_at = NOW(), updated_at = NOW() WHERE id = %s",
-                (int(pid),)
-            )
-            _touch_reviewer_by_row(int(pid))
-            done += 1
-        except Exception:
-            pass
+    from app import _touch_reviewer
+    try:
+        extended = models.db_manager.bulk_extend_timeout(ids)
+    except Exception as e:
+        return jsonify({"ok": False, "message": str(e)})
+    for row in extended:
+        _touch_reviewer(row["name"], row["phone"])
+    done = len(extended)
     return jsonify({"ok": True, "done": done, "total": len(ids)})
 
 
@@ -10,6 +10,7 @@ from functools import wraps
 from flask import Blueprint, request, jsonify
 
 import models
+from modules.http_cache import CACHE_PRIVATE, make_etag, not_modified, etag_json
 
 logger = logging.getLogger(__name__)
 
@@ -41,8 +42,19 @@ def campaigns_need_recruit():
         return jsonify({"error": "시스템 초기화 중"}), 503
 
     web_url = f"https://{WEB_URL}" if WEB_URL else request.host_url.rstrip("/")
+
+    # 홍보 시간대/구매가능시간은 분 단위 → 카탈로그 버전 + 현재 분으로 ETag
+    # (홍보 머리말/꼬리말 설정 변경은 다음 분부터 반영)
+    from modules.utils import now_kst
+    catalog = models.campaign_manager.catalog
+    etag = make_etag("need-recruit", web_url, catalog.version(),
+                     now_kst().strftime("%Y-%m-%d %H:%M"))
+    cached = not_modified(etag, CACHE_PRIVATE)
+    if cached is not None:
+        return cached
+
     data = models.campaign_manager.get_needs_recruit(web_url)
-    return jsonify(data)
+    return etag_json(data, etag, CACHE_PRIVATE)
 
 
 @api_bp.route("/campaigns/<campaign_id>/recruited", methods=["POST"])
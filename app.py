@@ -24,7 +24,7 @@ except Exception:
 import os
 import logging
 
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify
+from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, g
 from flask_socketio import SocketIO
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -86,6 +86,34 @@ if models.db_manager and models.drive_uploader:
     models.drive_queue_worker.start()
 
 
+# ──────── 요청 단위 DB 작업 (쓰기 일괄 커밋) ────────
+#
+# 커넥션은 첫 쓰기부터 요청 끝까지만 고정되고, 외부 전송(signal_sender) 전에는 먼저 커밋된다.
+
+@app.before_request
+def _begin_db_unit():
+    if models.db_manager and request.endpoint != "static":
+        g.db_uow = models.db_manager.begin_unit_of_work(request.endpoint or request.path)
+
+
+@app.after_request
+def _commit_db_unit(response):
+    uow = g.pop("db_uow", None)
+    if uow is not None:
+        # 5xx 응답은 롤백, 그 외는 커밋 (커밋 실패 시 예외 → 500)
+        error = response.status_code if response.status_code >= 500 else None
+        models.db_manager.end_unit_of_work(error)
+        response.headers["X-DB-Queries"] = str(uow.queries)
+    return response
+
+
+@app.teardown_request
+def _close_db_unit(exc):
+    # after_request를 거치지 못한 경우(예외 등) 롤백 후 커넥션 반환
+    if g.pop("db_uow", None) is not None:
+        models.db_manager.end_unit_of_work(exc or "teardown")
+
+
 # ════════════════════════════════════════
 # 리뷰어 페이지 라우트
 # ════════════════════════════════════════
@@ -273,15 +301,20 @@ def _touch_reviewer_by_row(row_idx: int):
         row_data = models.db_manager.get_row_dict(row_idx)
         name = row_data.get("진행자이름", "") or row_data.get("수취인명", "")
         phone = row_data.get("진행자연락처", "") or row_data.get("연락처", "")
-        if name and phone:
-            state = models.state_store.get_by_id(f"{name}_{phone}")
-            if state:
-                state.touch()
-                logger.info(f"업로드로 타임아웃 리셋: {name}_{phone}")
+        _touch_reviewer(name, phone)
     except Exception as e:
         logger.debug(f"타임아웃 리셋 실패 (무시): {e}")
 
 
+def _touch_reviewer(name: str, phone: str):
+    """리뷰어 인메모리 타임아웃 타이머 리셋"""
+    if name and phone and models.state_store:
+        state = models.state_store.get_by_id(f"{name}_{phone}")
+        if state:
+            state.touch()
+            logger.info(f"타임아웃 리셋: {name}_{phone}")
+
+
 def _trigger_ai_verify(capture_type: str, progress_id: int, drive_link: str):
     """업로드 완료 후 AI 검수 백그라운드 트리거"""
     try:
@@ -0,0 +1,114 @@
+"""
+행 변환기 마이크로벤치마크 (DB 불필요)
+
+progress 10,000행을 튜플 커서 결과처럼 만들어 두고 단계별 처리량(rows/sec)을 측정한다.
+
+  zip          : _fetchall의 dict(zip(cols, row))
+  realdict     : 이전 방식 비교용 (RealDictCursor 흉내 dict + dict(r) 복사)
+  sheet_dict   : _progress_sheet_dict (관리자 진행 목록의 행당 변환)
+  ts_strftime  : 이전 방식 비교용 (타임스탬프 필드마다 astimezone(KST).strftime)
+  ts_fast      : 현재 방식 (행당 KST 변환 1회 + _fmt_minute)
+  campaign     : _campaign_to_sheet_dict (캠페인 1,000행)
+
+  python bench/bench_row_converters.py [행 수] [반복 횟수]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone, date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.utils import KST   # noqa: E402
+from modules.db_manager import DBManager, _progress_sheet_dict, _kst, _fmt_minute   # noqa: E402
+
+PROGRESS_COLUMNS = (
+    "id", "campaign_id", "reviewer_id", "store_id", "status", "created_at", "updated_at",
+    "recipient_name", "phone", "bank", "account", "depositor", "address", "nickname",
+    "payment_amount", "order_number", "purchase_date", "purchase_capture_url",
+    "review_deadline", "review_submit_date", "review_capture_url", "review_fee",
+    "payment_total", "settlement_date", "settled_date", "is_collected", "remark",
+    "last_reminder_date", "ai_purchase_result", "ai_purchase_reason", "ai_review_result",
+    "ai_review_reason", "ai_verified_at", "ai_override", "photo_set_number", "review_text_number",
+)
+
+
+def make_progress_rows(n: int) -> list[tuple]:
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for i in range(n):
+        created = base + timedelta(minutes=i)
+        rows.append((
+            i, f"c{i % 50}", i % 3000, f"store{i}", "입금완료", created, created,
+            "홍길동", "01012345678", "국민", "123-456-789", "홍길동", "서울시 어딘가 1-2", "닉",
+            15000, f"ORD{i}", date(2026, 1, 2), "https://example.com/p.jpg",
+            date(2026, 1, 10), date(2026, 1, 9), "https://example.com/r.jpg", 3000,
+            18000, date(2026, 1, 15), date(2026, 1, 16), bool(i % 2), "",
+            None, "통과", "", "통과", "", created, "", i % 5 + 1, i % 7 + 1,
+        ))
+    return rows
+
+
+def make_campaign_rows(n: int) -> list[dict]:
+    created = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [{
+        "id": f"c{i}", "status": "모집중", "company": "업체", "campaign_name": f"캠페인 {i}",
+        "product_name": "상품", "total_qty": 100, "daily_qty": 10, "max_per_person_daily": 2,
+        "payment_amount": 15000, "review_fee": 3000, "is_public": True, "created_at": created,
+        "start_date": date(2026, 1, 2), "deadline_date": None, "daily_schedule": [],
+        "product_codes": {}, "option_list": [], "buy_time": "09:00-18:00",
+    } for i in range(n)]
+
+
+def legacy_sheet_fields(row: dict) -> dict:
+    """이전 방식: 타임스탬프 필드마다 KST 변환 + strftime"""
+    return {
+        "날짜": row["created_at"].astimezone(KST).strftime("%Y-%m-%d %H:%M"),
+        "created_at_iso": row["created_at"].astimezone(KST).isoformat(),
+        "AI검수시간": (row["ai_verified_at"].astimezone(KST).strftime("%Y-%m-%d %H:%M")
+                    if row["ai_verified_at"] else ""),
+    }
+
+
+def fast_sheet_fields(row: dict) -> dict:
+    """현재 방식 (_progress_sheet_dict와 같은 계산)"""
+    created = _kst(row["created_at"])
+    return {
+        "날짜": _fmt_minute(created),
+        "created_at_iso": created.isoformat() if created else "",
+        "AI검수시간": _fmt_minute(_kst(row["ai_verified_at"])),
+    }
+
+
+def bench(label: str, fn, n_rows: int, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<12} {n_rows / best:>14,.0f} rows/sec  ({best * 1000:.1f} ms / {n_rows:,}행)")
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    cols = list(PROGRESS_COLUMNS)
+    tuples = make_progress_rows(n_rows)
+    dicts = [dict(zip(cols, r)) for r in tuples]
+    campaigns = make_campaign_rows(1000)
+    db = DBManager.__new__(DBManager)   # 연결 없이 변환 메서드만 사용
+
+    print(f"progress {n_rows:,}행, 최선 {repeat}회 기준")
+    bench("zip", lambda: [dict(zip(cols, r)) for r in tuples], n_rows, repeat)
+    bench("realdict", lambda: [dict(r) for r in [dict(zip(cols, r)) for r in tuples]], n_rows, repeat)
+    bench("sheet_dict", lambda: [_progress_sheet_dict(r, "업체", "상품", "홍길동", "01012345678", False)
+                                 for r in dicts], n_rows, repeat)
+    bench("ts_strftime", lambda: [legacy_sheet_fields(r) for r in dicts], n_rows, repeat)
+    bench("ts_fast", lambda: [fast_sheet_fields(r) for r in dicts], n_rows, repeat)
+    bench("campaign", lambda: [db._campaign_to_sheet_dict(r) for r in campaigns], len(campaigns), repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -97,7 +97,7 @@ def dashboard():
             """SELECT campaign_id,
                       COUNT(*) FILTER (WHERE status NOT IN ('신청','가이드전달','취소','타임아웃취소','')) as purchased,
                       COUNT(*) FILTER (WHERE status IN ('리뷰완료','입금대기','입금완료')) as reviewed
-               FROM progress
+               FROM progress_all
                WHERE campaign_id = ANY(%s)
                GROUP BY campaign_id""",
             (campaign_ids,)
@@ -371,7 +371,7 @@ def campaign_detail(campaign_id):
     progress_stats = {}
     cid = campaign.get("캠페인ID", campaign_id)
     rows = models.db_manager._fetchall(
-        """SELECT status, COUNT(*) as cnt FROM progress
+        """SELECT status, COUNT(*) as cnt FROM progress_all
            WHERE campaign_id = %s GROUP BY status""",
         (cid,)
     )
@@ -392,7 +392,7 @@ def campaign_detail(campaign_id):
                   p.status, p.purchase_date, p.purchase_capture_url,
                   p.review_deadline, p.review_submit_date, p.review_capture_url,
                   p.ai_review_result, p.ai_review_reason, p.remark
-           FROM progress p
+           FROM progress_all p
            LEFT JOIN campaigns c ON c.id = p.campaign_id
            LEFT JOIN reviewers r ON r.id = p.reviewer_id
            WHERE p.campaign_id = %s
@@ -426,7 +426,7 @@ def api_all_progress():
                   p.status, p.purchase_date, p.purchase_capture_url,
                   p.review_deadline, p.review_submit_date, p.review_capture_url,
                   p.ai_review_result, p.ai_review_reason, p.remark
-           FROM progress p
+           FROM progress_all p
            LEFT JOIN campaigns c ON c.id = p.campaign_id
            LEFT JOIN reviewers r ON r.id = p.reviewer_id
            WHERE c.client_id = %s
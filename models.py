@@ -49,7 +49,12 @@ def init_app(web_url: str = "", socketio=None):
     if database_url:
         from modules.db_manager import DBManager
         try:
-            db_manager = DBManager(database_url)
+            db_manager = DBManager(
+                database_url,
+                min_conn=int(os.environ.get("DB_POOL_MIN", "1")),
+                max_conn=int(os.environ.get("DB_POOL_MAX", "10")),
+                replica_url=os.environ.get("DATABASE_REPLICA_URL", ""),
+            )
             sheets_manager = db_manager  # 하위 호환
             logging.info("PostgreSQL 초기화 완료")
         except Exception as e:
@@ -104,7 +104,7 @@ class ActivityLogger:
         if self._running:
             return
         self._running = True
-        t = threading.Thread(target=self._flush_loop, daemon=True)
+        t = threading.Thread(target=self._flush_loop, daemon=True, name="activity-log-flush")
         t.start()
 
     def _flush_loop(self):
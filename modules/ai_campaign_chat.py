@@ -832,7 +832,7 @@ class AICampaignChat:
                 # 여러 캠페인 합산
                 all_items = []
                 for cid in campaign_ids:
-                    items, _ = db.get_progress_page(1, 9999, cid, status, query)
+                    items, _ = db.get_progress_page(1, 9999, cid, status, query, count="none")
                     all_items.extend(items)
                 for it in all_items:
                     writer.writerow([it.get(col, "") for col in columns])
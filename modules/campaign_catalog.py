@@ -0,0 +1,238 @@
+"""
+campaign_catalog.py - 캠페인 카탈로그 스냅샷
+
+리뷰어 캠페인 목록, 채팅 카드, 활성 캠페인 목록, 홍보 대상 조회가 각자
+캠페인 + 카운터를 다시 읽고 잔여수량/일일목표/마감사유를 계산하던 것을
+프로세스당 스냅샷 하나로 모은다.
+
+  빌드   : get_campaign_board() 1 쿼리 + 캠페인별 파생값 미리 계산 (일일목표는 schedule_engine)
+  만료   : CATALOG_TTL (다른 워커의 쓰기가 반영되는 최대 지연)
+  무효화 : DBManager 변경 알림 (캠페인 수정, progress 상태 변경) 즉시
+  KST 날짜가 바뀌면 일일목표/오늘 신청수가 달라지므로 재빌드
+
+스냅샷마다 캠페인 버전(id + updated_at)과 카운터 버전 해시를 계산해 두고,
+조건부 GET(ETag)에서 응답을 다시 만들지 않고 비교하는 데 쓴다.
+"""
+
+import time
+import hashlib
+import logging
+import threading
+
+from modules.utils import now_kst, safe_int, parse_buy_time
+from modules.schedule_engine import schedule_for
+
+logger = logging.getLogger(__name__)
+
+CATALOG_TTL = 15   # 초
+
+
+def _buy_window(buy_time_str: str):
+    """구매가능시간 → (시작분, 종료분, 자정넘김) 또는 None(제한 없음/파싱 실패)"""
+    if not buy_time_str:
+        return None
+    parsed = parse_buy_time(buy_time_str)
+    if not parsed:
+        return None
+    sh, sm, eh, em, next_day = parsed
+    return sh * 60 + sm, eh * 60 + em, next_day
+
+
+def _in_window(window, now_minutes: int) -> bool:
+    """utils.is_within_buy_time과 같은 판정 (파싱은 빌드 시 1회)"""
+    if window is None:
+        return True
+    start, end, next_day = window
+    if next_day:
+        return now_minutes >= start or now_minutes <= end
+    return start <= now_minutes <= end
+
+
+def _digest(parts) -> str:
+    h = hashlib.sha1()
+    for p in parts:
+        h.update(p.encode())
+        h.update(b"\n")
+    return h.hexdigest()[:12]
+
+
+class _Snapshot:
+    __slots__ = ("entries", "by_id", "day", "built_at", "catalog_version", "counters_version")
+
+    def __init__(self, entries: list[dict], day: str):
+        self.entries = entries
+        self.by_id = {e["campaign_id"]: e for e in entries}
+        self.day = day
+        self.built_at = time.monotonic()
+        # 내용이 같으면 재빌드해도 같은 값 → TTL 만료만으로는 ETag가 바뀌지 않음
+        self.catalog_version = _digest(
+            [day] + [f"{e['campaign_id']}@{e['campaign'].get('updated_at', '')}" for e in entries])
+        self.counters_version = _digest(
+            f"{e['campaign_id']}:{e['reserved']},{e['done']},{e['review_stage']},"
+            f"{e['payment_stage']},{e['today_done']}" for e in entries)
+
+
+class CampaignCatalog:
+    """공개 + 모집중/진행중 캠페인 카탈로그 (파생값 포함)
+
+    항목 dict (공유 객체 — 호출자는 수정 금지, campaign은 복사해서 사용):
+      campaign        시트 컬럼명 dict
+      campaign_id, total
+      done            구매완료 건수 (없으면 완료수량) — 채팅/모집글 잔여 기준
+      reserved        진행중 슬롯 수 (없으면 완료수량) — 리뷰어 목록 잔여 기준
+      review_stage, payment_stage, today_done
+      daily_target, daily_full
+      total_remaining 총수량 - done
+      remaining       실효 잔여 (일일목표가 있으면 일일 잔여와 총 잔여 중 작은 값)
+      board_remaining 리뷰어 목록 표시용 잔여 (일일목표가 있으면 일일 잔여, 없으면 총수량 - reserved)
+      closed_reason   리뷰어 목록 기준 마감사유 ("" = 신청 가능)
+      not_started, start_date
+      buy_time, buy_window (buy_time_active()로 현재 시각 판정)
+    """
+
+    def __init__(self, db, ttl: float = CATALOG_TTL):
+        self.db = db
+        self.ttl = ttl
+        self._snapshot = None
+        self._generation = 0   # 무효화마다 증가 → 빌드 중 무효화된 결과는 저장 안 함
+        self._build_lock = threading.Lock()
+        self.builds = 0
+        self.invalidations = 0
+        db.add_change_listener(self._on_change)
+
+    # ─────────── 무효화 ───────────
+
+    def _on_change(self, kind: str, campaign_id: str = None):
+        self.invalidate()
+
+    def invalidate(self):
+        self._generation += 1
+        self._snapshot = None
+        self.invalidations += 1
+
+    # ─────────── 조회 ───────────
+
+    def entries(self) -> list[dict]:
+        """카탈로그 항목 목록 (등록일 최신순). DB 에러는 호출자에게 전파."""
+        return self._get().entries
+
+    def get(self, campaign_id: str) -> dict | None:
+        """캠페인 1건 항목. 비공개/모집중 아님이면 None."""
+        return self._get().by_id.get(campaign_id)
+
+    def version(self) -> str:
+        """현재 스냅샷 버전 "<캠페인 버전>-<카운터 버전>" (ETag용)"""
+        snap = self._get()
+        return f"{snap.catalog_version}-{snap.counters_version}"
+
+    @staticmethod
+    def buy_time_active(entry: dict, now=None) -> bool:
+        now = now or now_kst()
+        return _in_window(entry["buy_window"], now.hour * 60 + now.minute)
+
+    def buy_time_state(self, now=None) -> str:
+        """캠페인별 구매가능시간 여부 비트열 (분 단위로 바뀌는 값 → ETag에 포함)"""
+        now = now or now_kst()
+        minutes = now.hour * 60 + now.minute
+        return "".join("1" if _in_window(e["buy_window"], minutes) else "0"
+                       for e in self._get().entries)
+
+    def stats(self) -> dict:
+        snap = self._snapshot
+        return {
+            "size": len(snap.entries) if snap else 0,
+            "version": f"{snap.catalog_version}-{snap.counters_version}" if snap else None,
+            "age_sec": round(time.monotonic() - snap.built_at, 1) if snap else None,
+            "ttl": self.ttl,
+            "builds": self.builds,
+            "invalidations": self.invalidations,
+        }
+
+    def _fresh(self, day: str):
+        snap = self._snapshot
+        if snap and snap.day == day and time.monotonic() - snap.built_at < self.ttl:
+            return snap
+        return None
+
+    def _get(self) -> _Snapshot:
+        today = now_kst().date()
+        day = today.isoformat()
+        snap = self._fresh(day)
+        if snap:
+            return snap
+        with self._build_lock:
+            # 대기하는 동안 다른 그린스레드가 빌드했으면 재사용
+            snap = self._fresh(day)
+            if snap:
+                return snap
+            generation = self._generation
+            snap = _Snapshot(self._build(today), day)
+            self.builds += 1
+            if generation == self._generation:
+                self._snapshot = snap
+        return snap
+
+    # ─────────── 빌드 ───────────
+
+    def _build(self, today) -> list[dict]:
+        return [self._entry(row, today) for row in self.db.get_campaign_board()]
+
+    def _entry(self, row: dict, today) -> dict:
+        c = row["campaign"]
+        total = safe_int(c.get("총수량", 0))
+        legacy_done = safe_int(c.get("완료수량", 0))
+        done = row["purchase_done"] or legacy_done
+        reserved = row["reserved"] or legacy_done
+        review_stage = row["review_stage"]
+        payment_stage = row["payment_stage"]
+        today_done = row["today"]
+
+        schedule = schedule_for(c)
+        daily_target = schedule.target(today)
+        daily_full = daily_target > 0 and today_done >= daily_target
+        total_remaining = total - done
+        if daily_target > 0:
+            remaining = min(total_remaining, daily_target - today_done)
+            board_remaining = daily_target - today_done
+        else:
+            remaining = total_remaining
+            board_remaining = total - reserved
+
+        # 마감 판단: 입금대기+ >= 총수량 → 캠페인마감, 리뷰대기+ >= 총수량 → 모집마감
+        if total > 0 and payment_stage >= total:
+            closed_reason = "캠페인마감"
+        elif total > 0 and review_stage >= total:
+            closed_reason = "모집마감"
+        elif total - reserved <= 0:
+            closed_reason = "마감"
+        elif daily_full:
+            closed_reason = "금일마감"
+        else:
+            closed_reason = ""
+
+        start_date = (c.get("시작일") or "").strip()
+        not_started = schedule.not_started(today)
+        if not_started and not closed_reason:
+            closed_reason = f"{start_date} 오픈"
+
+        buy_time = (c.get("구매가능시간") or "").strip()
+        return {
+            "campaign": c,
+            "campaign_id": c.get("캠페인ID", ""),
+            "total": total,
+            "done": done,
+            "reserved": reserved,
+            "review_stage": review_stage,
+            "payment_stage": payment_stage,
+            "today_done": today_done,
+            "daily_target": daily_target,
+            "daily_full": daily_full,
+            "total_remaining": total_remaining,
+            "remaining": remaining,
+            "board_remaining": board_remaining,
+            "closed_reason": closed_reason,
+            "not_started": not_started,
+            "start_date": start_date,
+            "buy_time": buy_time,
+            "buy_window": _buy_window(buy_time),
+        }
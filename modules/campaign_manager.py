@@ -5,7 +5,10 @@ campaign_manager.py - 캠페인 관리
 """
 
 import logging
-from modules.utils import today_str, safe_int, is_within_buy_time
+from modules.utils import today_str, safe_int, now_kst
+from modules.campaign_catalog import CampaignCatalog
+from modules.slot_gate import SlotGate
+from modules.schedule_engine import schedule_for
 
 logger = logging.getLogger(__name__)
 
@@ -25,51 +28,21 @@ class CampaignManager:
 
     def __init__(self, db):
         self.db = db
+        self.catalog = CampaignCatalog(db)
+        self.slot_gate = SlotGate(db)
 
     def get_active_campaigns(self) -> list[dict]:
-        """모집 중인 캠페인 목록"""
-        all_campaigns = self.db.get_all_campaigns()
-
-        # 실제 신청 건수
-        actual_counts = {}
-        try:
-            actual_counts = self.db.count_all_campaigns()
-        except Exception:
-            pass
-
-        # 오늘 신청 건수
-        today_counts = {}
-        try:
-            today_counts = self.db.count_today_all_campaigns()
-        except Exception:
-            pass
-
+        """모집 중인 캠페인 목록 (카탈로그 기준, 잔여 > 0)"""
+        now = now_kst()
         active = []
-        for c in all_campaigns:
-            status = c.get("상태", "")
-            # 비공개 캠페인 제외
-            if c.get("공개여부", "").strip().upper() in ("N",):
+        for e in self.catalog.entries():
+            if e["total_remaining"] <= 0 or e["remaining"] <= 0:
                 continue
-            if status in ("모집중", "진행중", ""):
-                total = safe_int(c.get("총수량", 0))
-                campaign_id = c.get("캠페인ID", "")
-                # 실제 신청 건수 우선, 없으면 완료수량
-                done = actual_counts.get(campaign_id, 0) or safe_int(c.get("완료수량", 0))
-                total_remaining = total - done
-                if total_remaining > 0:
-                    # 일일 목표가 있으면 일일 잔여 기준
-                    daily_target = self._get_today_target(c)
-                    if daily_target > 0:
-                        today_done = today_counts.get(campaign_id, 0)
-                        remaining = min(total_remaining, daily_target - today_done)
-                    else:
-                        remaining = total_remaining
-                    if remaining <= 0:
-                        continue
-                    c["_남은수량"] = remaining
-                    c["_완료수량"] = done
-                    c["_buy_time_active"] = is_within_buy_time(c.get("구매가능시간", ""))
-                    active.append(c)
+            c = dict(e["campaign"])
+            c["_남은수량"] = e["remaining"]
+            c["_완료수량"] = e["done"]
+            c["_buy_time_active"] = self.catalog.buy_time_active(e, now)
+            active.append(c)
         return active
 
     def get_campaign_by_index(self, index: int) -> dict | None:
@@ -91,67 +64,31 @@ class CampaignManager:
         모집중 캠페인 + 마감 캠페인 모두 표시.
         마감 캠페인은 closed=True로 표시하되 신청 불가.
         """
-        import re
-        all_campaigns = self.db.get_all_campaigns()
-        if not all_campaigns:
+        entries = self.catalog.entries()
+        if not entries:
             return []
 
-        # 실제 신청 건수
-        actual_counts = {}
-        try:
-            actual_counts = self.db.count_all_campaigns()
-        except Exception:
-            pass
-
         # 리뷰어 이력 조회
-        reviewer_items = []
+        my_history = {}
         if name and phone:
             try:
-                reviewer_items = self.db.search_by_name_phone(name, phone)
+                my_history = self.db.get_my_campaign_history(name, phone)
             except Exception:
                 pass
 
-        # 오늘 캠페인별 진행 건수
-        today_counts = {}
-        try:
-            today_counts = self.db.count_today_all_campaigns()
-        except Exception:
-            pass
-
+        now = now_kst()
         cards = []
         card_index = 0
-        for c in all_campaigns:
-            campaign_status = c.get("상태", "")
-            # 비공개 캠페인 제외
-            if c.get("공개여부", "").strip().upper() in ("N",):
-                continue
-
-            total = safe_int(c.get("총수량", 0))
-            campaign_id = c.get("캠페인ID", "")
-            done = actual_counts.get(campaign_id, 0) or safe_int(c.get("완료수량", 0))
-            total_remaining = total - done
-
-            # 모집중이 아닌 캠페인(중지/마감 등)은 목록에서 제외
-            if campaign_status not in ("모집중", "진행중", ""):
-                continue
-
-            # 마감 판단 (모집중이지만 잔여수량 0)
-            is_closed = False
-            closed_reason = ""
-            if total_remaining <= 0:
-                is_closed = True
+        for e in entries:
+            c = e["campaign"]
+            # 마감 판단 (모집중이지만 잔여수량 0 → 마감, 일일목표 도달 → 금일마감)
+            if e["total_remaining"] <= 0:
                 closed_reason = "마감"
-
-            # 금일 마감 체크
-            daily_target = self._get_today_target(c)
-            today_done = today_counts.get(campaign_id, 0)
-            daily_full = daily_target > 0 and today_done >= daily_target
-            if not is_closed and daily_full:
-                is_closed = True
+            elif e["daily_full"]:
                 closed_reason = "금일마감"
-
-            buy_time_str = c.get("구매가능시간", "").strip()
-            buy_time_active = is_within_buy_time(buy_time_str)
+            else:
+                closed_reason = ""
+            is_closed = bool(closed_reason)
 
             # 상세 정보
             product_price = c.get("상품금액", "") or c.get("결제금액", "")
@@ -162,25 +99,20 @@ class CampaignManager:
             if not is_closed:
                 card_index += 1
             card_value = f"campaign_{card_index}" if not is_closed else ""
-            # 실효 잔여: 일일목표가 있으면 일일 잔여와 총 잔여 중 작은 값
-            if daily_target > 0:
-                daily_remaining = daily_target - today_done
-                remaining = min(total_remaining, daily_remaining)
-            else:
-                remaining = total_remaining
+            remaining = e["remaining"]
 
             card = {
                 "value": card_value,
                 "name": c.get("캠페인명", "") or c.get("상품명", ""),
                 "store": c.get("업체명", ""),
-                "total": total,
+                "total": e["total"],
                 "remaining": max(remaining, 0),
-                "daily_target": daily_target,
-                "today_done": today_done,
-                "daily_full": daily_full,
+                "daily_target": e["daily_target"],
+                "today_done": e["today_done"],
+                "daily_full": e["daily_full"],
                 "urgent": not is_closed and remaining <= 5,
-                "buy_time": buy_time_str or "",
-                "buy_time_closed": not buy_time_active,
+                "buy_time": e["buy_time"],
+                "buy_time_closed": not self.catalog.buy_time_active(e, now),
                 "product_price": str(product_price),
                 "review_fee": str(review_fee),
                 "platform": str(platform),
@@ -189,16 +121,9 @@ class CampaignManager:
             }
 
             # 이 캠페인에서의 내 진행 이력
-            if campaign_id and reviewer_items:
-                my_history = []
-                for item in reviewer_items:
-                    if item.get("캠페인ID") == campaign_id:
-                        sid = item.get("아이디", "").strip()
-                        status = item.get("상태", "")
-                        if sid and status not in ("타임아웃취소", "취소"):
-                            my_history.append({"id": sid, "status": status})
-                if my_history:
-                    card["my_history"] = my_history
+            history = my_history.get(e["campaign_id"])
+            if history:
+                card["my_history"] = [{"id": h["id"], "status": h["status"]} for h in history]
 
             cards.append(card)
 
@@ -208,32 +133,7 @@ class CampaignManager:
 
     def _get_today_target(self, campaign: dict) -> int:
         """오늘 목표 수량. 일정이 있으면 해당 날짜 목표, 없으면 일수량 최대값."""
-        import re
-        from datetime import datetime
-        from modules.utils import now_kst
-
-        schedule = campaign.get("일정", [])
-        start_date_str = campaign.get("시작일", "").strip()
-
-        if schedule and start_date_str:
-            try:
-                start = datetime.strptime(start_date_str, "%Y-%m-%d").date()
-                day_index = (now_kst().date() - start).days
-                if 0 <= day_index < len(schedule):
-                    return safe_int(schedule[day_index])
-                elif day_index >= len(schedule):
-                    return 0  # 일정 종료
-            except Exception:
-                pass
-
-        # 폴백: 일수량 최대값
-        daily_str = campaign.get("일수량", "").strip()
-        if daily_str:
-            range_match = re.match(r"(\d+)\s*[-~]\s*(\d+)", daily_str)
-            if range_match:
-                return safe_int(range_match.group(2))
-            return safe_int(daily_str)
-        return 0
+        return schedule_for(campaign).target()
 
     def build_campaign_list_text(self, name: str = "", phone: str = "") -> str:
         """채팅용 캠페인 목록 텍스트 (하위호환)"""
@@ -315,12 +215,9 @@ class CampaignManager:
         """홍보가 필요한 캠페인 목록 + 통합 모집글.
         Returns: {"campaigns": [...], "combined_message": str|None}
         """
+        # get_active_campaigns()가 잔여 > 0만 남기므로 금일마감 캠페인은 이미 제외됨
         active = self.get_active_campaigns()
-        today_counts = {}
-        try:
-            today_counts = self.db.count_today_all_campaigns()
-        except Exception:
-            pass
+        now_hm = now_kst().strftime("%H:%M")
 
         result = []
         for c in active:
@@ -328,19 +225,12 @@ class CampaignManager:
             if promo_enabled == "N":
                 continue
 
-            daily_target = self._get_today_target(c)
-            campaign_id = c.get("캠페인ID", "")
-            if daily_target > 0 and today_counts.get(campaign_id, 0) >= daily_target:
-                continue
-
             if not c.get("_buy_time_active", True):
                 continue
 
             promo_start = (c.get("홍보시작시간") or "").strip()
             promo_end = (c.get("홍보종료시간") or "").strip()
             if promo_enabled == "Y" and promo_start and promo_end:
-                from modules.utils import now_kst
-                now_hm = now_kst().strftime("%H:%M")
                 if not (promo_start <= now_hm < promo_end):
                     continue
 
@@ -408,13 +298,12 @@ class CampaignManager:
         campaign = self.get_campaign_by_id(campaign_id)
         if not campaign:
             return 0
-        daily_target = self._get_today_target(campaign)
-        if daily_target <= 0:
+        schedule = schedule_for(campaign)
+        if schedule.target() <= 0:
             return -1  # 일일 제한 없음
         try:
             counts = self.db.count_today_all_campaigns()
-            today_count = counts.get(campaign_id, 0)
-            return max(0, daily_target - today_count)
+            return schedule.remaining(counts.get(campaign_id, 0))
         except Exception:
             return -1
 
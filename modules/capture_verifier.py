@@ -558,7 +558,7 @@ def verify_capture_async(
         except Exception as e:
             logger.error("AI 검수 비동기 에러: %s", e, exc_info=True)
 
-    t = threading.Thread(target=_run, daemon=True)
+    t = threading.Thread(target=_run, daemon=True, name="capture-verify")
     t.start()
 
 
@@ -581,6 +581,7 @@ def _auto_reject(progress_id: int, capture_type: str, reason: str, db_manager):
                    WHERE id = %s""",
                 (f"AI 자동반려: {reason}", progress_id),
             )
+        db_manager.notify_counters_changed()
         logger.info("AI 자동반려: progress=%s type=%s reason=%s",
                      progress_id, capture_type, reason)
     except Exception as e:
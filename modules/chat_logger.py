@@ -2,7 +2,7 @@
 chat_logger.py - 대화 이력 저장 (PostgreSQL 영구 보관)
 
 모든 메시지를 DB에 즉시 저장. 서버 재시작 시에도 이력 유지.
-3개월 이상 된 로그 자동 삭제.
+3개월 지난 월 파티션 자동 삭제 (chat_messages 월별 파티션).
 """
 
 import time
@@ -48,12 +48,17 @@ class ChatLogger:
         if self._running:
             return
         self._running = True
-        self._thread = threading.Thread(target=self._cleanup_loop, daemon=True)
+        self._thread = threading.Thread(target=self._cleanup_loop, daemon=True, name="chat-log-cleanup")
         self._thread.start()
 
     def _cleanup_loop(self):
         while self._running:
             time.sleep(CLEANUP_INTERVAL)
+            try:
+                if self._db:
+                    self._db.maintain_chat_partitions()
+            except Exception as e:
+                logger.error(f"대화이력 파티션 관리 에러: {e}")
             try:
                 if self._db:
                     deleted = self._db.cleanup_old_chat(RETENTION_DAYS)
@@ -0,0 +1,236 @@
+"""
+conn_pool.py - 대기열 있는 PostgreSQL 커넥션 풀
+
+ThreadedConnectionPool은 maxconn을 넘으면 즉시 PoolError를 던진다.
+신청 폭주나 백그라운드 작업이 겹칠 때 그대로 500이 되므로, 여기서는
+커넥션이 반납될 때까지 timeout 동안 기다린다.
+
+eventlet monkey_patch 환경에서는 threading.Condition이 그린스레드용으로
+바뀌므로 대기 중에도 워커 전체가 막히지 않는다.
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+
+import psycopg2
+import psycopg2.extensions
+from psycopg2.pool import PoolError
+
+logger = logging.getLogger(__name__)
+
+POOL_WAIT_TIMEOUT = 10       # 커넥션 대기 최대 시간 (초)
+POOL_IDLE_TIMEOUT = 300      # minconn 초과분은 5분 유휴 시 닫음
+POOL_VALIDATE_AFTER = 30     # 30초 이상 놀던 커넥션은 꺼낼 때 SELECT 1로 확인
+
+
+class PoolTimeout(PoolError):
+    """timeout 안에 커넥션을 얻지 못함 (기존 PoolError 처리 코드와 호환)"""
+
+
+class GreenConnectionPool:
+    """대기열 + 유휴 커넥션 유지 + 상태 확인 + 지표 수집 풀
+
+    ThreadedConnectionPool과 같은 getconn/putconn/closeall 인터페이스.
+    """
+
+    def __init__(self, minconn: int, maxconn: int, dsn: str,
+                 timeout: float = POOL_WAIT_TIMEOUT, name: str = "primary",
+                 **connect_kwargs):
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.dsn = dsn
+        self.connect_kwargs = connect_kwargs   # psycopg2.connect 추가 인자 (cursor_factory 등)
+        self.timeout = timeout
+        self.name = name
+        self._cond = threading.Condition()
+        self._idle = deque()   # (conn, 반납 시각). 오른쪽이 최근 → 최근 것부터 재사용
+        self._size = 0         # 열린 커넥션 수 (유휴 + 사용 중)
+        self._in_use = 0
+        self._waiting = 0
+        self._closed = False
+        # 지표
+        self._peak_in_use = 0
+        self._peak_waiting = 0
+        self._gets = 0
+        self._waits = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+
+        for _ in range(minconn):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+
+    def _connect(self):
+        """새 연결 (락 밖에서 호출 → 연결 대기 동안 다른 꺼내기/반납을 막지 않음)"""
+        conn = psycopg2.connect(self.dsn, **self.connect_kwargs)
+        with self._cond:
+            self._created += 1
+        return conn
+
+    # ─────────── 꺼내기/반납 ───────────
+
+    def getconn(self, timeout: float | None = None):
+        """커넥션 꺼내기. 모두 사용 중이면 반납될 때까지 대기 (초과 시 PoolTimeout)"""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            conn, idle_since = self._acquire(deadline)
+            if conn is None:
+                # 새 커넥션 자리 확보 → 락 밖에서 연결
+                try:
+                    conn = self._connect()
+                except Exception:
+                    self._release_slot()
+                    raise
+            elif not self._usable(conn, idle_since):
+                self._discard(conn)
+                continue
+            break
+        with self._cond:
+            self._gets += 1
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+        return conn
+
+    def _acquire(self, deadline: float):
+        """유휴 커넥션 또는 새 커넥션 자리(None, 0) 확보"""
+        with self._cond:
+            blocked_at = None
+            while True:
+                if self._closed:
+                    raise PoolError("connection pool is closed")
+                if self._idle or self._size < self.maxconn:
+                    if blocked_at is not None:
+                        self._record_wait(time.monotonic() - blocked_at)
+                    if self._idle:
+                        return self._idle.pop()
+                    self._size += 1
+                    return None, 0.0
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    logger.warning("DB 커넥션 대기 시간 초과 (%s, %d개 모두 사용 중, 대기 %d)",
+                                   self.name, self.maxconn, self._waiting)
+                    raise PoolTimeout(
+                        f"connection pool exhausted ({self.maxconn} in use)")
+                if blocked_at is None:
+                    blocked_at = time.monotonic()
+                self._waiting += 1
+                self._peak_waiting = max(self._peak_waiting, self._waiting)
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+    def _record_wait(self, wait: float):
+        """대기 지표 기록 (락 안에서 호출)"""
+        self._waits += 1
+        self._wait_total += wait
+        self._wait_max = max(self._wait_max, wait)
+        if wait >= 1:
+            logger.info("DB 커넥션 대기 %.2fs (%s, 사용 중 %d/%d)",
+                        wait, self.name, self._in_use, self.maxconn)
+
+    def _usable(self, conn, idle_since: float) -> bool:
+        if conn.closed:
+            return False
+        if time.monotonic() - idle_since < POOL_VALIDATE_AFTER:
+            return True
+        # 오래 놀던 커넥션: 서버 재시작/유휴 연결 끊김 대비
+        try:
+            with conn.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def putconn(self, conn, key=None, close: bool = False):
+        """커넥션 반납. close=True 또는 끊긴 커넥션이면 닫고 자리만 돌려준다."""
+        if not close and not conn.closed:
+            status = conn.info.transaction_status
+            if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                # 커밋/롤백 안 된 채 반납 → 다음 사용자에게 트랜잭션이 새지 않도록 정리
+                try:
+                    conn.rollback()
+                except Exception:
+                    close = True
+        with self._cond:
+            self._in_use -= 1
+            if close or conn.closed or self._closed:
+                self._size -= 1
+                self._discarded += 1
+                to_close = [conn]
+            else:
+                self._idle.append((conn, time.monotonic()))
+                to_close = self._trim_idle()
+            self._cond.notify()
+        for c in to_close:
+            self._close_quietly(c)
+
+    def _trim_idle(self) -> list:
+        """minconn을 넘는 오래된 유휴 커넥션 정리 대상 (락 안에서 호출)"""
+        expired = []
+        cutoff = time.monotonic() - POOL_IDLE_TIMEOUT
+        while (self._idle and self._size > self.minconn
+               and self._idle[0][1] < cutoff):
+            expired.append(self._idle.popleft()[0])
+            self._size -= 1
+        return expired
+
+    def _discard(self, conn):
+        self._close_quietly(conn)
+        self._release_slot()
+        with self._cond:
+            self._discarded += 1
+
+    def _release_slot(self):
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def closeall(self):
+        with self._cond:
+            self._closed = True
+            idle = [c for c, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for c in idle:
+            self._close_quietly(c)
+
+    # ─────────── 지표 ───────────
+
+    def stats(self) -> dict:
+        """풀 크기 산정용 지표 (프로세스 시작 이후 누적)"""
+        with self._cond:
+            return {
+                "name": self.name,
+                "minconn": self.minconn,
+                "maxconn": self.maxconn,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "waiting": self._waiting,
+                "peak_in_use": self._peak_in_use,
+                "peak_waiting": self._peak_waiting,
+                "gets": self._gets,
+                "waits": self._waits,
+                "wait_avg_ms": round(self._wait_total * 1000 / self._waits, 1) if self._waits else 0.0,
+                "wait_max_ms": round(self._wait_max * 1000, 1),
+                "timeouts": self._timeouts,
+                "created": self._created,
+                "discarded": self._discarded,
+            }
@@ -5,15 +5,24 @@ Google Sheets를 대체하는 메인 데이터 저장소.
 테이블: campaigns, reviewers, progress
 """
 
+import sys
+import json
+import time
 import logging
+import threading
 from datetime import datetime, timedelta
 from contextlib import contextmanager
 
 import psycopg2
+import psycopg2.extensions
+import psycopg2.errors
 import psycopg2.extras
-from psycopg2.pool import ThreadedConnectionPool
 
 from modules.utils import today_str, now_kst, KST
+from modules.ttl_cache import TTLCache
+from modules.conn_pool import GreenConnectionPool
+from modules.query_stats import query_stats
+from modules.schedule_engine import schedule_for
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +52,99 @@ _DUP_IGNORE_STATUSES = (STATUS_APPLIED, STATUS_GUIDE_SENT,
 # 동시진행그룹 체크 무시 상태 (취소/타임아웃만 무시, 신청~입금완료는 모두 차단)
 _EXCLUSIVE_IGNORE_STATUSES = (STATUS_TIMEOUT, STATUS_CANCELLED, "")
 
+# 신청 불가 캠페인 상태
+_APPLY_CLOSED_CAMPAIGN_STATUSES = ("모집마감", "마감", "종료")
+
+# 작업 단위(요청/백그라운드 작업)당 쿼리 수 경고 기준
+UOW_QUERY_WARN = 40
+
+# 리뷰어 (이름, 연락처) → reviewers 행 캐시
+REVIEWER_CACHE_SIZE = 5000
+REVIEWER_CACHE_TTL = 600   # 10분
+
+# 목록 총 건수: 추정치가 이 값 미만이면 정확히 COUNT (작은 결과는 COUNT도 빠름)
+PAGE_EXACT_COUNT_BELOW = 2000
+
+# 캠페인 캐시 (쓰기 시 명시적 무효화, TTL은 외부 수정 대비 안전장치)
+CAMPAIGN_CACHE_SIZE = 2000
+CAMPAIGN_CACHE_TTL = 60
+
+# 읽기 전용 복제본 (DATABASE_REPLICA_URL)
+REPLICA_MAX_LAG_SECONDS = 5        # 복제 지연이 이보다 크면 primary로 읽기
+REPLICA_CHECK_INTERVAL = 10        # 지연/상태 재확인 주기 (초)
+
+
+class UnitOfWork:
+    """요청/작업 단위 DB 컨텍스트 (쓰기 트랜잭션 1개)
+
+    커넥션은 첫 쓰기(_commit 지연) 시점부터 고정되고, 작업 단위가 끝나거나
+    flush_unit_of_work()가 불릴 때 커밋 후 반환한다. 미커밋 쓰기가 없는 동안의
+    읽기는 문장마다 커넥션을 풀에 돌려주므로, 읽기만 하는 요청이나 외부 API를
+    기다리는 요청이 커넥션/트랜잭션을 잡고 있지 않는다.
+    """
+
+    __slots__ = ("label", "conn", "depth", "queries", "dirty", "started", "on_commit", "busy")
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.conn = None
+        self.depth = 0
+        self.queries = 0      # _conn() 호출 수 (DB 왕복 단위)
+        self.dirty = False    # 커밋 대기 중인 쓰기 존재 여부
+        self.started = time.monotonic()
+        self.on_commit = []   # 커밋 직후 실행 (캐시 재무효화 등)
+        self.busy = 0         # 진행 중인 _conn() 블록 수 (중첩 중에는 커넥션 반환 안 함)
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.monotonic() - self.started) * 1000
+
+
+# ─────────── 쿼리 계측 ───────────
+#
+# 풀 커넥션의 기본 cursor_factory를 _TimedCursor로 지정 → 모든 cursor.execute가
+# 소요시간/행 수/호출 메서드와 함께 query_stats에 기록된다 (_conn()을 직접 쓰는 메서드 포함).
+
+# 메서드 이름 추적 시 건너뛸 공통 헬퍼
+_QUERY_HELPERS = frozenset((
+    "_fetchall", "_fetchone", "_execute", "_execute_returning", "_execute_returning_all",
+    "_read", "_run_select", "_conn", "_replica_conn", "__enter__", "__exit__",
+))
+
+
+def _caller_method() -> str:
+    """쿼리를 실행한 DBManager 메서드 이름 (공통 헬퍼는 건너뜀)"""
+    f = sys._getframe(2)
+    fallback = f.f_code.co_name
+    while f is not None:
+        code = f.f_code
+        if code.co_filename == __file__ and code.co_name not in _QUERY_HELPERS:
+            return code.co_name
+        f = f.f_back
+    return fallback
+
+
+class _TimedCursorMixin:
+    def execute(self, query, vars=None):
+        start = time.perf_counter()
+        error = True
+        try:
+            result = super().execute(query, vars)
+            error = False
+            return result
+        finally:
+            query_stats.record(_caller_method(), (time.perf_counter() - start) * 1000,
+                               self.rowcount, query, error)
+
+
+class _TimedCursor(_TimedCursorMixin, psycopg2.extensions.cursor):
+    pass
+
+
+class _TimedDictCursor(_TimedCursorMixin, psycopg2.extras.RealDictCursor):
+    pass
+
+
 _SCHEMA_SQL = """
 CREATE TABLE IF NOT EXISTS campaigns (
     id              TEXT PRIMARY KEY,
@@ -176,6 +278,7 @@ CREATE INDEX IF NOT EXISTS idx_progress_campaign ON progress(campaign_id);
 CREATE INDEX IF NOT EXISTS idx_progress_reviewer ON progress(reviewer_id);
 CREATE INDEX IF NOT EXISTS idx_progress_status ON progress(status);
 CREATE INDEX IF NOT EXISTS idx_progress_created ON progress(created_at);
+CREATE INDEX IF NOT EXISTS idx_progress_created_id ON progress(created_at DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_progress_store ON progress(campaign_id, store_id);
 
 CREATE TABLE IF NOT EXISTS inquiries (
@@ -372,271 +475,1370 @@ CREATE INDEX IF NOT EXISTS idx_admins_login ON admins(login_id);
 """
 
 
+# ──────── 스키마 버전 ────────
+
+_SCHEMA_VERSION_SQL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version         INTEGER PRIMARY KEY,
+    description     TEXT DEFAULT '',
+    applied_at      TIMESTAMPTZ DEFAULT NOW()
+);
+"""
+
+# 마이그레이션 직렬화용 advisory lock 키
+_MIGRATION_LOCK_KEY = 72019001
+
+
+# ──────── 캠페인 카운터 (progress 트리거로 트랜잭션 내 동기화) ────────
+
+_COUNTERS_SQL = """
+CREATE TABLE IF NOT EXISTS campaign_counters (
+    campaign_id     TEXT PRIMARY KEY,
+    total_rows      INTEGER NOT NULL DEFAULT 0,   -- 전체 행 (취소 포함)
+    reserved        INTEGER NOT NULL DEFAULT 0,   -- 취소/타임아웃취소 제외
+    purchase_done   INTEGER NOT NULL DEFAULT 0,   -- 구매캡쳐대기 이상 (_DONE_STATUSES)
+    review_stage    INTEGER NOT NULL DEFAULT 0,   -- 리뷰대기 이상
+    review_done     INTEGER NOT NULL DEFAULT 0,   -- 리뷰제출 이상
+    payment_wait    INTEGER NOT NULL DEFAULT 0,   -- 입금대기
+    settled         INTEGER NOT NULL DEFAULT 0,   -- 입금완료
+    updated_at      TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS campaign_daily_counters (
+    campaign_id     TEXT NOT NULL,
+    day             DATE NOT NULL,                -- created_at KST 날짜
+    reserved        INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (campaign_id, day)
+);
+CREATE INDEX IF NOT EXISTS idx_daily_counters_day ON campaign_daily_counters(day);
+
+CREATE OR REPLACE FUNCTION campaign_counters_apply(cid TEXT, st TEXT, created TIMESTAMPTZ, d INTEGER)
+RETURNS void AS $$
+DECLARE
+    is_reserved BOOLEAN := st IS NOT NULL AND st NOT IN ('취소', '타임아웃취소');
+BEGIN
+    -- 삭제된 캠페인 (ON DELETE SET NULL 연쇄 중)은 무시
+    IF NOT EXISTS (SELECT 1 FROM campaigns WHERE id = cid) THEN
+        RETURN;
+    END IF;
+    INSERT INTO campaign_counters AS c (campaign_id, total_rows, reserved, purchase_done,
+                                        review_stage, review_done, payment_wait, settled)
+    VALUES (
+        cid, d,
+        CASE WHEN is_reserved THEN d ELSE 0 END,
+        CASE WHEN st IN ('구매캡쳐대기', '리뷰대기', '리뷰제출', '입금대기', '입금완료') THEN d ELSE 0 END,
+        CASE WHEN st IN ('리뷰대기', '리뷰제출', '입금대기', '입금완료') THEN d ELSE 0 END,
+        CASE WHEN st IN ('리뷰제출', '입금대기', '입금완료') THEN d ELSE 0 END,
+        CASE WHEN st = '입금대기' THEN d ELSE 0 END,
+        CASE WHEN st = '입금완료' THEN d ELSE 0 END
+    )
+    ON CONFLICT (campaign_id) DO UPDATE SET
+        total_rows = c.total_rows + EXCLUDED.total_rows,
+        reserved = c.reserved + EXCLUDED.reserved,
+        purchase_done = c.purchase_done + EXCLUDED.purchase_done,
+        review_stage = c.review_stage + EXCLUDED.review_stage,
+        review_done = c.review_done + EXCLUDED.review_done,
+        payment_wait = c.payment_wait + EXCLUDED.payment_wait,
+        settled = c.settled + EXCLUDED.settled,
+        updated_at = NOW();
+    IF is_reserved AND created IS NOT NULL THEN
+        INSERT INTO campaign_daily_counters AS dc (campaign_id, day, reserved)
+        VALUES (cid, (created AT TIME ZONE 'Asia/Seoul')::date, d)
+        ON CONFLICT (campaign_id, day) DO UPDATE SET reserved = dc.reserved + EXCLUDED.reserved;
+    END IF;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION progress_counters_trg() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.campaign_id IS NOT NULL THEN
+        PERFORM campaign_counters_apply(OLD.campaign_id, OLD.status, OLD.created_at, -1);
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') AND NEW.campaign_id IS NOT NULL THEN
+        PERFORM campaign_counters_apply(NEW.campaign_id, NEW.status, NEW.created_at, 1);
+    END IF;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'trg_progress_counters_ins_del') THEN
+        CREATE TRIGGER trg_progress_counters_ins_del
+            AFTER INSERT OR DELETE ON progress
+            FOR EACH ROW EXECUTE FUNCTION progress_counters_trg();
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'trg_progress_counters_upd') THEN
+        CREATE TRIGGER trg_progress_counters_upd
+            AFTER UPDATE OF status, campaign_id, created_at ON progress
+            FOR EACH ROW
+            WHEN (OLD.status IS DISTINCT FROM NEW.status
+                  OR OLD.campaign_id IS DISTINCT FROM NEW.campaign_id
+                  OR OLD.created_at IS DISTINCT FROM NEW.created_at)
+            EXECUTE FUNCTION progress_counters_trg();
+    END IF;
+END $$;
+"""
+
+# 자동 상태 전환: 카운터가 늘어난 캠페인 1건만 확인
+#   모집중 → 모집마감 (리뷰대기 이상 >= 총수량), 모집마감 → 마감 (리뷰제출 이상 >= 총수량)
+# 캠페인 행이 잠겨 있으면(신청 트랜잭션 등) 기다리지 않고 건너뜀 → 보정 스윕이 반영
+_STATUS_TRANSITION_SQL = """
+CREATE OR REPLACE FUNCTION campaign_status_transition_trg() RETURNS trigger AS $$
+BEGIN
+    UPDATE campaigns c
+    SET status = CASE WHEN NEW.review_done >= c.total_qty THEN '마감' ELSE '모집마감' END,
+        updated_at = NOW()
+    WHERE c.id = (SELECT id FROM campaigns
+                  WHERE id = NEW.campaign_id AND total_qty > 0
+                    AND ((status = '모집중' AND NEW.review_stage >= total_qty)
+                         OR (status = '모집마감' AND NEW.review_done >= total_qty))
+                  FOR NO KEY UPDATE SKIP LOCKED);
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'trg_campaign_status_transition_ins') THEN
+        CREATE TRIGGER trg_campaign_status_transition_ins
+            AFTER INSERT ON campaign_counters
+            FOR EACH ROW
+            WHEN (NEW.review_stage > 0)
+            EXECUTE FUNCTION campaign_status_transition_trg();
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'trg_campaign_status_transition_upd') THEN
+        CREATE TRIGGER trg_campaign_status_transition_upd
+            AFTER UPDATE OF review_stage, review_done ON campaign_counters
+            FOR EACH ROW
+            WHEN (NEW.review_stage > OLD.review_stage OR NEW.review_done > OLD.review_done)
+            EXECUTE FUNCTION campaign_status_transition_trg();
+    END IF;
+END $$;
+"""
+
+# 카운터 재계산 (드리프트 보정)용 집계 — 트리거와 같은 기준
+_COUNTERS_AGG_SQL = """
+    SELECT p.campaign_id,
+           COUNT(*) AS total_rows,
+           COUNT(*) FILTER (WHERE p.status NOT IN ('취소', '타임아웃취소')) AS reserved,
+           COUNT(*) FILTER (WHERE p.status IN ('구매캡쳐대기', '리뷰대기', '리뷰제출', '입금대기', '입금완료')) AS purchase_done,
+           COUNT(*) FILTER (WHERE p.status IN ('리뷰대기', '리뷰제출', '입금대기', '입금완료')) AS review_stage,
+           COUNT(*) FILTER (WHERE p.status IN ('리뷰제출', '입금대기', '입금완료')) AS review_done,
+           COUNT(*) FILTER (WHERE p.status = '입금대기') AS payment_wait,
+           COUNT(*) FILTER (WHERE p.status = '입금완료') AS settled
+    FROM progress_all p
+    JOIN campaigns c ON c.id = p.campaign_id
+    {where}
+    GROUP BY p.campaign_id
+"""
+
+# 최근 2일(KST) 일별 신청 집계
+_DAILY_AGG_SQL = """
+    SELECT p.campaign_id, (p.created_at AT TIME ZONE 'Asia/Seoul')::date AS day, COUNT(*) AS reserved
+    FROM progress p
+    JOIN campaigns c ON c.id = p.campaign_id
+    WHERE p.created_at >= (((NOW() AT TIME ZONE 'Asia/Seoul')::date - 1)::timestamp AT TIME ZONE 'Asia/Seoul')
+      AND p.status NOT IN ('취소', '타임아웃취소')
+      {where}
+    GROUP BY 1, 2
+"""
+
+# 카운터 트리거가 자동 전환할 수 있는 캠페인 상태 (모집중 → 모집마감 → 마감)
+_AUTO_TRANSITION_FROM_STATUSES = ("모집중", "모집마감")
+
+_COUNTER_COLUMNS = ("total_rows", "reserved", "purchase_done", "review_stage",
+                    "review_done", "payment_wait", "settled")
+
+# 일별 카운터 보관 일수
+DAILY_COUNTER_RETENTION_DAYS = 7
+
+# 드리프트 보정 트랜잭션당 캠페인 수 (잠그는 카운터 행 수 상한)
+RECONCILE_BATCH_SIZE = 100
+
+
+# ──────── 진행건 아카이브 (hot/cold 분리) ────────
+#
+# 입금완료 후 오래 지난 + 캠페인도 마감된 행은 더 이상 바뀌지 않으므로 progress_archive로 옮겨
+# progress(hot)를 작게 유지한다. 과거 이력 조회는 progress_all 뷰(progress UNION ALL archive).
+# progress에 컬럼을 추가하는 마이그레이션은 끝에 _sync_progress_archive(cur)를 호출할 것.
+
+ARCHIVE_AFTER_DAYS = 30       # 입금완료일 기준 경과일
+ARCHIVE_BATCH_SIZE = 500      # 배치(트랜잭션)당 이동 행 수
+ARCHIVE_MAX_BATCHES = 20      # 1회 실행당 최대 배치 수
+_ARCHIVE_CLOSED_CAMPAIGN_STATUSES = ("마감", "종료")
+
+_PROGRESS_ARCHIVE_SQL = """
+CREATE TABLE IF NOT EXISTS progress_archive (LIKE progress);
+ALTER TABLE progress_archive ADD COLUMN IF NOT EXISTS archived_at TIMESTAMPTZ DEFAULT NOW();
+CREATE UNIQUE INDEX IF NOT EXISTS idx_progress_archive_id ON progress_archive(id);
+CREATE INDEX IF NOT EXISTS idx_progress_archive_reviewer ON progress_archive(reviewer_id, campaign_id, store_id);
+CREATE INDEX IF NOT EXISTS idx_progress_archive_store ON progress_archive(campaign_id, store_id);
+CREATE INDEX IF NOT EXISTS idx_progress_archive_created ON progress_archive(created_at);
+
+-- 아카이브 이동(DELETE)은 카운터에서 빼지 않음: 카운터는 progress_all 기준
+CREATE OR REPLACE FUNCTION progress_counters_trg() RETURNS trigger AS $$
+BEGIN
+    IF current_setting('kabiseo.archiving', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.campaign_id IS NOT NULL THEN
+        PERFORM campaign_counters_apply(OLD.campaign_id, OLD.status, OLD.created_at, -1);
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') AND NEW.campaign_id IS NOT NULL THEN
+        PERFORM campaign_counters_apply(NEW.campaign_id, NEW.status, NEW.created_at, 1);
+    END IF;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+"""
+
+# LIKE progress는 FK를 복사하지 않음 → 캠페인 삭제 시 아카이브 행만 옛 id를 가리키다가
+# 같은 id로 새 캠페인이 생기면 progress_all에서 그 캠페인 이력으로 잡힘.
+# 이미 남은 고아 campaign_id는 NULL로 정리 후 progress와 같은 FK 추가 (NOT VALID → VALIDATE로 짧은 잠금)
+_PROGRESS_ARCHIVE_FK_SQL = """
+UPDATE progress_archive a SET campaign_id = NULL
+WHERE a.campaign_id IS NOT NULL
+  AND NOT EXISTS (SELECT 1 FROM campaigns c WHERE c.id = a.campaign_id);
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'progress_archive_campaign_id_fkey') THEN
+        ALTER TABLE progress_archive ADD CONSTRAINT progress_archive_campaign_id_fkey
+            FOREIGN KEY (campaign_id) REFERENCES campaigns(id) ON DELETE SET NULL NOT VALID;
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'progress_archive_reviewer_id_fkey') THEN
+        ALTER TABLE progress_archive ADD CONSTRAINT progress_archive_reviewer_id_fkey
+            FOREIGN KEY (reviewer_id) REFERENCES reviewers(id) NOT VALID;
+    END IF;
+END $$;
+"""
+
+
+# ──────── 사진세트/리뷰내용 슬롯 ────────
+#
+# 캠페인의 사진세트·리뷰내용 번호마다 슬롯 1행. 배분은 빈 슬롯을 FOR UPDATE SKIP LOCKED로
+# 잡아서 점유하므로 동시 신청끼리 같은 번호를 받지 않고, progress 전체를 NOT IN으로 훑지 않는다.
+# progress 쪽 변경(취소/타임아웃/삭제/번호 수동 변경)은 트리거가 슬롯에 반영한다.
+
+_ASSET_SOURCES = {
+    # kind: (원본 테이블, 원본 번호 컬럼, progress 번호 컬럼)
+    "photo": ("campaign_photos", "set_number", "photo_set_number"),
+    "text": ("campaign_review_texts", "text_number", "review_text_number"),
+}
+
+_ASSET_SLOTS_SQL = """
+CREATE TABLE IF NOT EXISTS campaign_asset_slots (
+    campaign_id     TEXT NOT NULL REFERENCES campaigns(id) ON DELETE CASCADE,
+    kind            TEXT NOT NULL,                -- 'photo' | 'text'
+    number          INTEGER NOT NULL,
+    progress_id     INTEGER,                      -- 점유 진행건 (NULL = 빈 슬롯)
+    claimed_at      TIMESTAMPTZ,
+    PRIMARY KEY (campaign_id, kind, number)
+);
+CREATE INDEX IF NOT EXISTS idx_asset_slots_free
+    ON campaign_asset_slots(campaign_id, kind, number) WHERE progress_id IS NULL;
+CREATE INDEX IF NOT EXISTS idx_asset_slots_progress
+    ON campaign_asset_slots(progress_id) WHERE progress_id IS NOT NULL;
+
+CREATE OR REPLACE FUNCTION progress_asset_slots_trg() RETURNS trigger AS $$
+BEGIN
+    -- 아카이브 이동은 점유 유지 (완료된 리뷰의 사진/문구를 재배분하지 않음)
+    IF current_setting('kabiseo.archiving', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        UPDATE campaign_asset_slots SET progress_id = NULL, claimed_at = NULL
+        WHERE progress_id = OLD.id;
+        RETURN NULL;
+    END IF;
+    IF TG_OP = 'UPDATE' THEN
+        UPDATE campaign_asset_slots SET progress_id = NULL, claimed_at = NULL
+        WHERE progress_id = OLD.id
+          AND (NEW.status IN ('취소', '타임아웃취소')
+               OR campaign_id IS DISTINCT FROM NEW.campaign_id
+               OR (kind = 'photo' AND number IS DISTINCT FROM NEW.photo_set_number)
+               OR (kind = 'text' AND number IS DISTINCT FROM NEW.review_text_number));
+    END IF;
+    IF NEW.status NOT IN ('취소', '타임아웃취소') THEN
+        -- 수동 지정/복구된 번호: 비어 있으면 점유
+        UPDATE campaign_asset_slots SET progress_id = NEW.id, claimed_at = NOW()
+        WHERE campaign_id = NEW.campaign_id AND progress_id IS NULL
+          AND ((kind = 'photo' AND number = NEW.photo_set_number)
+               OR (kind = 'text' AND number = NEW.review_text_number));
+    END IF;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'trg_progress_asset_slots_ins') THEN
+        CREATE TRIGGER trg_progress_asset_slots_ins
+            AFTER INSERT ON progress
+            FOR EACH ROW
+            WHEN (NEW.photo_set_number IS NOT NULL OR NEW.review_text_number IS NOT NULL)
+            EXECUTE FUNCTION progress_asset_slots_trg();
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'trg_progress_asset_slots_del') THEN
+        CREATE TRIGGER trg_progress_asset_slots_del
+            AFTER DELETE ON progress
+            FOR EACH ROW
+            WHEN (OLD.photo_set_number IS NOT NULL OR OLD.review_text_number IS NOT NULL)
+            EXECUTE FUNCTION progress_asset_slots_trg();
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'trg_progress_asset_slots_upd') THEN
+        CREATE TRIGGER trg_progress_asset_slots_upd
+            AFTER UPDATE OF status, campaign_id, photo_set_number, review_text_number ON progress
+            FOR EACH ROW
+            WHEN (OLD.status IS DISTINCT FROM NEW.status
+                  OR OLD.campaign_id IS DISTINCT FROM NEW.campaign_id
+                  OR OLD.photo_set_number IS DISTINCT FROM NEW.photo_set_number
+                  OR OLD.review_text_number IS DISTINCT FROM NEW.review_text_number)
+            EXECUTE FUNCTION progress_asset_slots_trg();
+    END IF;
+END $$;
+"""
+
+
+def _asset_slot_fill_sql(kind: str, campaign_filter: bool) -> str:
+    """원본 테이블 번호 중 슬롯이 없는 것을 채우는 INSERT (현재 점유 진행건 포함)"""
+    table, number_col, progress_col = _ASSET_SOURCES[kind]
+    where = "WHERE campaign_id = %s" if campaign_filter else ""
+    return f"""
+        INSERT INTO campaign_asset_slots (campaign_id, kind, number, progress_id, claimed_at)
+        SELECT DISTINCT ON (src.campaign_id, src.number)
+               src.campaign_id, '{kind}', src.number, p.id,
+               CASE WHEN p.id IS NULL THEN NULL ELSE NOW() END
+        FROM (SELECT DISTINCT campaign_id, {number_col} AS number FROM {table} {where}) src
+        LEFT JOIN progress p ON p.campaign_id = src.campaign_id
+                            AND p.{progress_col} = src.number
+                            AND p.status NOT IN ('취소', '타임아웃취소')
+        ORDER BY src.campaign_id, src.number, p.created_at
+        ON CONFLICT (campaign_id, kind, number) DO NOTHING"""
+
+
+# ──────── 검색 (pg_trgm) ────────
+
+# 부분일치(ILIKE '%q%') 검색 컬럼별 trigram GIN 인덱스
+_TRGM_INDEXES = (
+    ("idx_reviewers_name_trgm", "reviewers", "name"),
+    ("idx_reviewers_phone_trgm", "reviewers", "phone"),
+    ("idx_progress_recipient_trgm", "progress", "recipient_name"),
+    ("idx_progress_phone_trgm", "progress", "phone"),
+    ("idx_progress_store_id_trgm", "progress", "store_id"),
+    ("idx_campaigns_name_trgm", "campaigns", "campaign_name"),
+    ("idx_campaigns_product_trgm", "campaigns", "product_name"),
+    ("idx_campaigns_company_trgm", "campaigns", "company"),
+    ("idx_chat_message_trgm", "chat_messages", "message"),
+    ("idx_chat_reviewer_trgm", "chat_messages", "reviewer_id"),
+)
+
+# ──────── 대화이력 월별 파티션 ────────
+#
+# chat_messages는 created_at 기준 월별 RANGE 파티션 (chat_messages_YYYYMM, KST 월 경계).
+# 보관기간 정리는 DELETE 대신 기간이 통째로 지난 파티션을 DROP → bloat/vacuum 부담 없음.
+
+CHAT_PARTITION_MONTHS_AHEAD = 2   # 이번 달 + 앞으로 2개월 파티션 미리 생성
+_CHAT_PARTITION_PREFIX = "chat_messages_"
+_CHAT_DEFAULT_PARTITION = "chat_messages_default"   # 범위 밖 행 안전망 (평소 비어 있음)
+CHAT_DETACH_LOCK_TIMEOUT = "3s"   # 파티션 DETACH가 잠금을 기다리는 최대 시간 (넘으면 다음 주기에 재시도)
+
+
+def _add_months(d, months: int):
+    """d가 속한 달의 1일 기준 months개월 뒤 1일"""
+    y, m = divmod(d.year * 12 + d.month - 1 + months, 12)
+    return d.replace(year=y, month=m + 1, day=1)
+
+
+def _chat_partition_month(relname: str):
+    """chat_messages_YYYYMM → 해당 월 1일(date), 월 파티션 이름이 아니면 None"""
+    suffix = relname[len(_CHAT_PARTITION_PREFIX):]
+    if relname.startswith(_CHAT_PARTITION_PREFIX) and suffix.isdigit() and len(suffix) == 6:
+        return datetime.strptime(suffix, "%Y%m").date()
+    return None
+
+
+def _chat_partition_ddl(month_start) -> str:
+    month_end = _add_months(month_start, 1)
+    name = f"{_CHAT_PARTITION_PREFIX}{month_start:%Y%m}"
+    return (f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF chat_messages "
+            f"FOR VALUES FROM ('{month_start:%Y-%m-%d} 00:00+09') "
+            f"TO ('{month_end:%Y-%m-%d} 00:00+09')")
+
+
+# 자주 도는 조건용 부분/복합 인덱스 (이름, 정의)
+_HOT_INDEXES = (
+    # TimeoutManager._check_db_stale (15초마다): 진행 중 신청/가이드전달만 담는 작은 인덱스
+    ("idx_progress_pending_created",
+     "progress(created_at) WHERE status IN ('신청', '가이드전달')"),
+    # delete_old_cancelled_rows
+    ("idx_progress_cancelled_created",
+     "progress(created_at) WHERE status IN ('타임아웃취소', '취소')"),
+    # 중복 체크/타임아웃 취소/내 신청내역 (reviewer_id 단독 인덱스 대체)
+    ("idx_progress_reviewer_campaign_store", "progress(reviewer_id, campaign_id, store_id)"),
+    # search_by_depositor
+    ("idx_progress_depositor_status", "progress(depositor, status)"),
+    # AI 검수 확인요청 (/admin/reviews, 대시보드 배지)
+    ("idx_progress_ai_purchase_check",
+     "progress(created_at) WHERE ai_purchase_result = '확인요청'"),
+    ("idx_progress_ai_review_check",
+     "progress(created_at) WHERE ai_review_result = '확인요청'"),
+    # get_chat_history / count_chat_unread (reviewer_id 단독 인덱스 대체)
+    ("idx_chat_reviewer_sender_created", "chat_messages(reviewer_id, sender, created_at)"),
+    ("idx_chat_reviewer_created", "chat_messages(reviewer_id, created_at)"),
+    # 최근 활동 피드 (sender='user' 최신순)
+    ("idx_chat_user_created", "chat_messages(created_at) WHERE sender = 'user'"),
+)
+
+# 위 복합 인덱스의 선두 컬럼과 겹쳐 쓰기 비용만 드는 인덱스 (제거 대상, 대체 인덱스)
+_REDUNDANT_INDEXES = (
+    ("idx_progress_reviewer", "idx_progress_reviewer_campaign_store"),
+    ("idx_chat_reviewer", "idx_chat_reviewer_created"),
+)
+
+# 진행자 이름/연락처로 먼저 찾는 reviewer id 최대 개수
+SEARCH_REVIEWER_LIMIT = 1000
+
+
+def _int_ids(values) -> list[int]:
+    """요청으로 받은 id 목록 → 정수 리스트 (잘못된 값 제외, 중복 제거, 순서 유지)"""
+    ids = []
+    seen = set()
+    for v in values or ():
+        try:
+            i = int(v)
+        except (ValueError, TypeError):
+            continue
+        if i not in seen:
+            seen.add(i)
+            ids.append(i)
+    return ids
+
+
+def _like_pattern(q: str) -> str:
+    """부분일치 패턴 ('%q%'). 검색어의 %, _, \\ 는 문자 그대로 취급."""
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _ilike_any(columns, q: str) -> tuple[str, list]:
+    """여러 컬럼 부분일치 OR 조건. 컬럼별 trigram 인덱스가 BitmapOr로 결합됨.
+
+    COALESCE로 감싸면 인덱스를 못 타므로 컬럼을 그대로 비교 (NULL은 불일치).
+    """
+    pattern = _like_pattern(q)
+    sql = "(" + " OR ".join(f"{c} ILIKE %s" for c in columns) + ")"
+    return sql, [pattern] * len(columns)
+
+
+# ──────── 행 변환기 (import 시 1회 컴파일) ────────
+
+# 캠페인 컬럼별 변환 종류: 아래 외 컬럼은 str
+_CAMPAIGN_SPECIAL_KINDS = {
+    "created_at": ("등록일", "created"),
+    "deadline_date": ("신청마감일", "date"),
+    "start_date": ("시작일", "date"),
+    "product_codes": ("상품코드", "codes"),
+    "daily_schedule": ("일정", "schedule"),
+    "option_list": ("옵션목록", "optlist"),
+}
+
+
+def _compile_campaign_sheet_keys(field_map: dict, bool_cols: set, int_cols: set) -> dict:
+    """DB 컬럼 → (시트 키, 변환 종류) 테이블"""
+    reverse_map = {v: k for k, v in field_map.items()}
+    table = {}
+    for db_col in set(reverse_map) | set(bool_cols) | set(int_cols):
+        sheet_key = reverse_map.get(db_col, db_col)
+        if db_col in bool_cols:
+            table[db_col] = (sheet_key, "bool")
+        elif db_col in int_cols:
+            table[db_col] = (sheet_key, "int")
+        else:
+            table[db_col] = (sheet_key, "str")
+    table.update(_CAMPAIGN_SPECIAL_KINDS)
+    return table
+
+
+def _kst(ts):
+    """TIMESTAMPTZ → KST datetime (None 허용)"""
+    return ts.astimezone(KST) if ts else None
+
+
+def _fmt_minute(k) -> str:
+    """KST datetime → 'YYYY-MM-DD HH:MM' (strftime보다 빠름)"""
+    if k is None:
+        return ""
+    return f"{k.year:04d}-{k.month:02d}-{k.day:02d} {k.hour:02d}:{k.minute:02d}"
+
+
+def make_page_cursor(item: dict) -> str:
+    """목록 항목 → keyset 커서 문자열 ("created_at ISO|id")"""
+    if not item or not item.get("created_at_iso"):
+        return ""
+    return f"{item['created_at_iso']}|{item['id']}"
+
+
+def _parse_page_cursor(cursor: str):
+    """keyset 커서 → (created_at, id 문자열). 형식 오류면 None"""
+    if not cursor:
+        return None
+    ts, sep, key = cursor.partition("|")
+    if not sep or not key:
+        return None
+    try:
+        return datetime.fromisoformat(ts), key
+    except ValueError:
+        return None
+
+
+def _str_or_empty(v) -> str:
+    return str(v) if v else ""
+
+
+def _progress_sheet_dict(row: dict, company, product_label, reviewer_name,
+                         reviewer_phone, kakao_friend) -> dict:
+    """progress 행 → 시트 컬럼명 dict (공통 필드).
+
+    타임스탬프는 KST 변환을 행당 1회만 하고 문자열은 필요한 형식으로만 만든다.
+    """
+    g = row.get
+    created = _kst(g("created_at"))
+    return {
+        "_row_idx": row["id"],
+        "id": row["id"],
+        "캠페인ID": g("campaign_id", ""),
+        "업체명": company,
+        "날짜": _fmt_minute(created),
+        "created_at_iso": created.isoformat() if created else "",
+        "제품명": product_label,
+        "수취인명": g("recipient_name", ""),
+        "연락처": g("phone", ""),
+        "은행": g("bank", ""),
+        "계좌": g("account", ""),
+        "예금주": g("depositor", ""),
+        "결제금액": str(g("payment_amount", 0) or ""),
+        "아이디": g("store_id", ""),
+        "주문번호": g("order_number", ""),
+        "주소": g("address", ""),
+        "닉네임": g("nickname", ""),
+        "진행자이름": reviewer_name,
+        "진행자연락처": reviewer_phone,
+        "카카오친구": kakao_friend,
+        "상태": g("status", ""),
+        "구매일": _str_or_empty(g("purchase_date")),
+        "구매캡쳐링크": g("purchase_capture_url", ""),
+        "리뷰기한": _str_or_empty(g("review_deadline")),
+        "리뷰제출일": _str_or_empty(g("review_submit_date")),
+        "리뷰캡쳐링크": g("review_capture_url", ""),
+        "리뷰비": str(g("review_fee", 0) or ""),
+        "입금금액": str(g("payment_total", 0) or ""),
+        "입금정리": _str_or_empty(g("settlement_date")),
+        "입금완료": _str_or_empty(g("settled_date")),
+        "회수여부": "Y" if g("is_collected") else "",
+        "비고": g("remark", ""),
+        "AI구매검수": g("ai_purchase_result", ""),
+        "AI구매사유": g("ai_purchase_reason", ""),
+        "AI리뷰검수": g("ai_review_result", ""),
+        "AI리뷰사유": g("ai_review_reason", ""),
+        "AI검수시간": _fmt_minute(_kst(g("ai_verified_at"))),
+        "AI관리자판정": g("ai_override", ""),
+        "사진세트": g("photo_set_number"),
+        "리뷰내용번호": g("review_text_number"),
+    }
+
+
 class DBManager:
     """PostgreSQL CRUD 매니저 (SheetsManager 대체)"""
 
-    def __init__(self, database_url: str, min_conn: int = 1, max_conn: int = 10):
+    def __init__(self, database_url: str, min_conn: int = 1, max_conn: int = 10,
+                 replica_url: str = ""):
         self.database_url = database_url
-        self.pool = ThreadedConnectionPool(min_conn, max_conn, database_url)
+        self.pool = GreenConnectionPool(min_conn, max_conn, database_url,
+                                        cursor_factory=_TimedCursor)
+        self.replica_pool = None
+        self._replica_ok = False
+        self._replica_checked = 0.0
+        if replica_url:
+            try:
+                self.replica_pool = GreenConnectionPool(min_conn, max_conn, replica_url,
+                                                        name="replica",
+                                                        cursor_factory=_TimedCursor)
+            except Exception as e:
+                logger.warning("복제본 연결 실패 (primary만 사용): %s", e)
+        self._local = threading.local()  # eventlet monkey_patch 시 그린스레드 단위
+        self._reviewer_cache = TTLCache(REVIEWER_CACHE_SIZE, REVIEWER_CACHE_TTL)
+        self._campaign_cache = TTLCache(CAMPAIGN_CACHE_SIZE, CAMPAIGN_CACHE_TTL)
+        self._campaign_versions = {}  # id → (updated_at, 시트 dict) 변환 결과 재사용
+        self._campaign_snapshot_lock = threading.Lock()
+        self._change_listeners = []   # 캠페인/카운터 변경 콜백 (캠페인 카탈로그 등)
         self._init_schema()
         logger.info("DBManager 초기화 완료")
 
+    # ─────────── 스키마 마이그레이션 ───────────
+    #
+    # 번호순으로 1회만 적용하고 schema_version에 기록한다. 평상시 부팅은 버전 조회 1회로 끝.
+    # 새 스키마 변경은 _SCHEMA_SQL/기존 단계 수정 대신 아래 목록에 다음 번호로 추가할 것.
+    # 각 단계는 autocommit 커서로 실행됨 (문장 단위 커밋, 실패 시 해당 문장만 실패).
+    # 단계가 False를 반환하면 기록하지 않음 → 다음 부팅 때 그 단계만 다시 시도 (뒤 단계는 계속 적용).
+
+    _MIGRATIONS = (
+        (1, "기본 스키마 + 컬럼 추가/데이터 보정", "_migrate_baseline"),
+        (2, "pg_trgm 부분일치 검색 인덱스", "_migrate_trgm_indexes"),
+        (3, "캠페인 카운터 테이블/트리거", "_migrate_campaign_counters"),
+        (4, "진행/채팅 조회용 부분·복합 인덱스", "_migrate_hot_indexes"),
+        (5, "progress_archive + progress_all 뷰", "_migrate_progress_archive"),
+        (6, "chat_messages 월별 파티션 전환", "_migrate_chat_partitions"),
+        (7, "사진세트/리뷰내용 배분 슬롯", "_migrate_asset_slots"),
+        (8, "캠페인 자동 상태 전환 트리거", "_migrate_status_transitions"),
+        (9, "진행/채팅 인덱스 재확인 (INVALID 재생성)", "_migrate_hot_indexes"),
+        (10, "progress_archive 외래키 (캠페인/리뷰어)", "_migrate_progress_archive_fks"),
+    )
+
     def _init_schema(self):
+        """미적용 마이그레이션만 advisory lock 아래에서 적용"""
+        latest = self._MIGRATIONS[-1][0]
+        pending = self._pending_migrations()
+        if not pending:
+            logger.info("DB 스키마 최신 (v%d) - 마이그레이션 생략", latest)
+            return
+
+        applied = []
         with self._conn() as conn:
-            with conn.cursor() as cur:
-                cur.execute(_SCHEMA_SQL)
-                # 마이그레이션: 기존 테이블에 새 컬럼 추가
-                try:
-                    cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS last_reminder_date DATE")
-                except Exception:
-                    pass
-                try:
-                    cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS payment_amount INTEGER DEFAULT 0")
-                except Exception:
-                    pass
-                try:
-                    cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS daily_schedule JSONB DEFAULT '[]'")
-                    cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS start_date DATE")
-                except Exception:
-                    pass
-                try:
-                    cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS product_codes JSONB DEFAULT '{}'")
-                except Exception:
-                    pass
-                try:
-                    cur.execute("ALTER TABLE managers ADD COLUMN IF NOT EXISTS notify_start TEXT DEFAULT '09:00'")
-                    cur.execute("ALTER TABLE managers ADD COLUMN IF NOT EXISTS notify_end TEXT DEFAULT '22:00'")
-                except Exception:
-                    pass
-                try:
-                    cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS promotion_message TEXT DEFAULT ''")
-                except Exception:
-                    pass
-                try:
-                    cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS campaign_name TEXT DEFAULT ''")
-                except Exception:
-                    pass
-                try:
-                    cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS promo_enabled BOOLEAN DEFAULT FALSE")
-                    cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS promo_categories TEXT DEFAULT ''")
-                    cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS promo_start TEXT DEFAULT '09:00'")
-                    cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS promo_end TEXT DEFAULT '22:00'")
-                    cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS promo_cooldown INTEGER DEFAULT 60")
-                except Exception:
-                    pass
-                # AI 검수 컬럼
-                try:
-                    cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS ai_instructions TEXT DEFAULT ''")
-                    cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS ai_purchase_result TEXT DEFAULT ''")
-                    cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS ai_purchase_reason TEXT DEFAULT ''")
-                    cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS ai_review_result TEXT DEFAULT ''")
-                    cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS ai_review_reason TEXT DEFAULT ''")
-                    cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS ai_verified_at TIMESTAMPTZ")
-                    cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS ai_override TEXT DEFAULT ''")
-                except Exception:
-                    pass
-                # 1인 일일 제한
-                try:
-                    cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS max_per_person_daily INTEGER DEFAULT 0")
-                except Exception:
-                    pass
-                # AI 구매/리뷰 검수 지침 분리
-                try:
-                    cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS ai_purchase_instructions TEXT DEFAULT ''")
-                    cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS ai_review_instructions TEXT DEFAULT ''")
-                except Exception:
-                    pass
-                # 사진 세트 할당 번호
-                try:
-                    cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS photo_set_number INTEGER")
-                except Exception:
-                    pass
-                # 리뷰내용 할당 번호
-                try:
-                    cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS review_text_number INTEGER")
-                except Exception:
-                    pass
-                # 동시진행그룹
-                try:
-                    cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS exclusive_group TEXT DEFAULT ''")
-                    cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS exclusive_days INTEGER DEFAULT 0")
-                except Exception:
-                    pass
-                # Drive 업로드 큐 - upload_pending 컬럼
-                try:
-                    cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS upload_pending TEXT DEFAULT ''")
-                except Exception:
-                    pass
-                # 타임아웃 경고 중복방지
-                try:
-                    cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS timeout_warned_at TIMESTAMPTZ")
-                except Exception:
-                    pass
-                # 마이그레이션: progress.campaign_id FK를 ON DELETE SET NULL로 변경 + NOT NULL 해제
-                try:
-                    cur.execute("""
-                        DO $$
-                        BEGIN
-                            -- NOT NULL 제약 해제
-                            ALTER TABLE progress ALTER COLUMN campaign_id DROP NOT NULL;
-                            -- 기존 FK 제약조건 찾아서 삭제 후 재생성
-                            IF EXISTS (
-                                SELECT 1 FROM information_schema.table_constraints
-                                WHERE table_name = 'progress' AND constraint_type = 'FOREIGN KEY'
-                                AND constraint_name IN (
-                                    SELECT constraint_name FROM information_schema.constraint_column_usage
-                                    WHERE table_name = 'campaigns' AND column_name = 'id'
-                                )
-                            ) THEN
-                                EXECUTE (
-                                    SELECT 'ALTER TABLE progress DROP CONSTRAINT ' || constraint_name
-                                    FROM information_schema.table_constraints tc
-                                    JOIN information_schema.constraint_column_usage ccu USING (constraint_name, constraint_schema)
-                                    WHERE tc.table_name = 'progress' AND tc.constraint_type = 'FOREIGN KEY'
-                                    AND ccu.table_name = 'campaigns' AND ccu.column_name = 'id'
-                                    LIMIT 1
-                                );
-                                ALTER TABLE progress ADD CONSTRAINT progress_campaign_id_fkey
-                                    FOREIGN KEY (campaign_id) REFERENCES campaigns(id) ON DELETE SET NULL;
-                            END IF;
-                        END $$;
-                    """)
-                except Exception:
-                    pass
-                # 마이그레이션: campaigns에 업체(client) 관련 컬럼
-                try:
-                    cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS client_id INTEGER")
-                    cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS reject_reason TEXT DEFAULT ''")
-                except Exception:
-                    pass
-                # notices.vote_enabled 컬럼 마이그레이션
-                try:
-                    cur.execute("ALTER TABLE notices ADD COLUMN IF NOT EXISTS vote_enabled BOOLEAN DEFAULT FALSE")
-                except Exception:
-                    pass
-                # 기존 purchase_date 빈 건 일괄 수정 (구매캡쳐 있으면 created_at 기준)
-                try:
-                    cur.execute("""
-                        UPDATE progress SET purchase_date = (created_at AT TIME ZONE 'Asia/Seoul')::date
-                        WHERE purchase_date IS NULL
-                          AND purchase_capture_url IS NOT NULL AND purchase_capture_url != ''
-                    """)
-                    if cur.rowcount > 0:
-                        logger.info("purchase_date 일괄 수정: %d건", cur.rowcount)
-                except Exception:
-                    pass
-                # 기존 payment_total 빈 건 일괄 수정 (결제금액+리뷰비 → 입금금액)
-                try:
-                    cur.execute("""
-                        UPDATE progress p SET payment_total = COALESCE(p.payment_amount, 0) + COALESCE(p.review_fee, 0)
-                        WHERE (p.payment_total IS NULL OR p.payment_total = 0)
-                          AND (COALESCE(p.payment_amount, 0) + COALESCE(p.review_fee, 0)) > 0
-                    """)
-                    if cur.rowcount > 0:
-                        logger.info("payment_total 일괄 수정: %d건", cur.rowcount)
-                except Exception:
-                    pass
-                # 마이그레이션: 대행사(agency) 지원
-                try:
-                    cur.execute("ALTER TABLE clients ADD COLUMN IF NOT EXISTS agency_id INTEGER DEFAULT NULL")
-                    cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS agency_id INTEGER DEFAULT NULL")
-                except Exception:
-                    pass
-                # 마이그레이션: 리뷰기한 빈 건 일괄 채우기 (구매일 + 캠페인 리뷰기한일수)
-                try:
-                    cur.execute("""
-                        UPDATE progress p SET review_deadline =
-                            (p.purchase_date + c.review_deadline_days * INTERVAL '1 day')::date
-                        FROM campaigns c
-                        WHERE p.campaign_id = c.id
-                          AND c.review_deadline_days > 0
-                          AND p.purchase_date IS NOT NULL
-                          AND (p.review_deadline IS NULL)
-                    """)
-                    if cur.rowcount > 0:
-                        logger.info("리뷰기한 빈 건 일괄 채우기: %d건", cur.rowcount)
-                except Exception:
-                    pass
-                # 기존 구매캡쳐 반려 비고 잔류 정리: 재제출 완료된 건의 비고 클리어
-                try:
-                    cur.execute("""
-                        UPDATE progress SET remark = ''
-                        WHERE (remark LIKE '구매캡쳐 반려%%' OR remark LIKE 'AI 자동반려%%')
-                          AND purchase_capture_url IS NOT NULL AND purchase_capture_url != ''
-                    """)
-                    if cur.rowcount > 0:
-                        logger.info("구매캡쳐 반려 비고 잔류 정리: %d건", cur.rowcount)
-                except Exception:
-                    pass
-                # 마이그레이션: 중복 clients 정리 (같은 company_name → 가장 오래된 것만 유지)
-                try:
-                    # 1) 중복 client_id → 남길 ID로 campaigns 업데이트
-                    cur.execute("""
-                        UPDATE campaigns SET client_id = keeper.keep_id
-                        FROM (
-                            SELECT c.id AS dup_id, first_value(c.id) OVER (
-                                PARTITION BY LOWER(TRIM(c.company_name))
-                                ORDER BY c.created_at ASC, c.id ASC
-                            ) AS keep_id
-                            FROM clients c
-                        ) keeper
-                        WHERE campaigns.client_id = keeper.dup_id
-                          AND keeper.dup_id != keeper.keep_id
-                    """)
-                    # 2) 중복 client 삭제
-                    cur.execute("""
-                        DELETE FROM clients WHERE id IN (
-                            SELECT id FROM (
-                                SELECT id, ROW_NUMBER() OVER (
-                                    PARTITION BY LOWER(TRIM(company_name))
-                                    ORDER BY created_at ASC, id ASC
-                                ) as rn
-                                FROM clients
-                            ) ranked WHERE rn > 1
+            conn.autocommit = True
+            try:
+                with conn.cursor() as cur:
+                    # 롤링 재시작 시 여러 프로세스가 동시에 적용하지 않도록 직렬화
+                    cur.execute("SELECT pg_advisory_lock(%s)", (_MIGRATION_LOCK_KEY,))
+                    try:
+                        cur.execute(_SCHEMA_VERSION_SQL)
+                        cur.execute("SELECT version FROM schema_version")
+                        done = {row[0] for row in cur.fetchall()}
+                        for version, description, method in self._MIGRATIONS:
+                            if version in done:
+                                continue
+                            started = time.monotonic()
+                            if getattr(self, method)(cur) is False:
+                                logger.warning("마이그레이션 v%d 미완료 (다음 부팅 시 재시도): %s",
+                                               version, description)
+                                continue
+                            cur.execute(
+                                "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                                (version, description)
+                            )
+                            applied.append(version)
+                            logger.info("마이그레이션 v%d 적용: %s (%.1fs)",
+                                        version, description, time.monotonic() - started)
+                    finally:
+                        cur.execute("SELECT pg_advisory_unlock(%s)", (_MIGRATION_LOCK_KEY,))
+            finally:
+                conn.autocommit = False
+        logger.info("DB 스키마 확인/생성 완료 (적용 %s)", applied or "없음")
+
+        # 카운터 테이블 최초 생성 시 progress에서 채움
+        if 3 in applied:
+            try:
+                self.reconcile_campaign_counters()
+            except Exception as e:
+                logger.error("캠페인 카운터 초기화 실패: %s", e)
+
+    def _pending_migrations(self) -> list[int]:
+        """아직 기록되지 않은 마이그레이션 번호 (schema_version 없으면 전체)"""
+        versions = [version for version, _, _ in self._MIGRATIONS]
+        row = self._fetchone(
+            """SELECT CASE WHEN to_regclass('schema_version') IS NULL THEN '{}'::int[]
+                      ELSE (SELECT COALESCE(array_agg(version), '{}') FROM schema_version) END AS v"""
+        )
+        done = set(row["v"] or []) if row else set()
+        return [v for v in versions if v not in done]
+
+    def _migrate_baseline(self, cur):
+        cur.execute(_SCHEMA_SQL)
+        # 마이그레이션: 기존 테이블에 새 컬럼 추가
+        try:
+            cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS last_reminder_date DATE")
+        except Exception:
+            pass
+        try:
+            cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS payment_amount INTEGER DEFAULT 0")
+        except Exception:
+            pass
+        try:
+            cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS daily_schedule JSONB DEFAULT '[]'")
+            cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS start_date DATE")
+        except Exception:
+            pass
+        try:
+            cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS product_codes JSONB DEFAULT '{}'")
+        except Exception:
+            pass
+        try:
+            cur.execute("ALTER TABLE managers ADD COLUMN IF NOT EXISTS notify_start TEXT DEFAULT '09:00'")
+            cur.execute("ALTER TABLE managers ADD COLUMN IF NOT EXISTS notify_end TEXT DEFAULT '22:00'")
+        except Exception:
+            pass
+        try:
+            cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS promotion_message TEXT DEFAULT ''")
+        except Exception:
+            pass
+        try:
+            cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS campaign_name TEXT DEFAULT ''")
+        except Exception:
+            pass
+        try:
+            cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS promo_enabled BOOLEAN DEFAULT FALSE")
+            cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS promo_categories TEXT DEFAULT ''")
+            cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS promo_start TEXT DEFAULT '09:00'")
+            cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS promo_end TEXT DEFAULT '22:00'")
+            cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS promo_cooldown INTEGER DEFAULT 60")
+        except Exception:
+            pass
+        # AI 검수 컬럼
+        try:
+            cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS ai_instructions TEXT DEFAULT ''")
+            cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS ai_purchase_result TEXT DEFAULT ''")
+            cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS ai_purchase_reason TEXT DEFAULT ''")
+            cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS ai_review_result TEXT DEFAULT ''")
+            cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS ai_review_reason TEXT DEFAULT ''")
+            cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS ai_verified_at TIMESTAMPTZ")
+            cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS ai_override TEXT DEFAULT ''")
+        except Exception:
+            pass
+        # 1인 일일 제한
+        try:
+            cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS max_per_person_daily INTEGER DEFAULT 0")
+        except Exception:
+            pass
+        # AI 구매/리뷰 검수 지침 분리
+        try:
+            cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS ai_purchase_instructions TEXT DEFAULT ''")
+            cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS ai_review_instructions TEXT DEFAULT ''")
+        except Exception:
+            pass
+        # 사진 세트 할당 번호
+        try:
+            cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS photo_set_number INTEGER")
+        except Exception:
+            pass
+        # 리뷰내용 할당 번호
+        try:
+            cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS review_text_number INTEGER")
+        except Exception:
+            pass
+        # 동시진행그룹
+        try:
+            cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS exclusive_group TEXT DEFAULT ''")
+            cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS exclusive_days INTEGER DEFAULT 0")
+        except Exception:
+            pass
+        # Drive 업로드 큐 - upload_pending 컬럼
+        try:
+            cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS upload_pending TEXT DEFAULT ''")
+        except Exception:
+            pass
+        # 타임아웃 경고 중복방지
+        try:
+            cur.execute("ALTER TABLE progress ADD COLUMN IF NOT EXISTS timeout_warned_at TIMESTAMPTZ")
+        except Exception:
+            pass
+        # 마이그레이션: progress.campaign_id FK를 ON DELETE SET NULL로 변경 + NOT NULL 해제
+        try:
+            cur.execute("""
+                DO $$
+                BEGIN
+                    -- NOT NULL 제약 해제
+                    ALTER TABLE progress ALTER COLUMN campaign_id DROP NOT NULL;
+                    -- 기존 FK 제약조건 찾아서 삭제 후 재생성
+                    IF EXISTS (
+                        SELECT 1 FROM information_schema.table_constraints
+                        WHERE table_name = 'progress' AND constraint_type = 'FOREIGN KEY'
+                        AND constraint_name IN (
+                            SELECT constraint_name FROM information_schema.constraint_column_usage
+                            WHERE table_name = 'campaigns' AND column_name = 'id'
                         )
-                    """)
-                    if cur.rowcount > 0:
-                        logger.info("중복 clients 정리: %d건 삭제", cur.rowcount)
-                except Exception:
-                    pass
-            conn.commit()
-        logger.info("DB 스키마 확인/생성 완료")
+                    ) THEN
+                        EXECUTE (
+                            SELECT 'ALTER TABLE progress DROP CONSTRAINT ' || constraint_name
+                            FROM information_schema.table_constraints tc
+                            JOIN information_schema.constraint_column_usage ccu USING (constraint_name, constraint_schema)
+                            WHERE tc.table_name = 'progress' AND tc.constraint_type = 'FOREIGN KEY'
+                            AND ccu.table_name = 'campaigns' AND ccu.column_name = 'id'
+                            LIMIT 1
+                        );
+                        ALTER TABLE progress ADD CONSTRAINT progress_campaign_id_fkey
+                            FOREIGN KEY (campaign_id) REFERENCES campaigns(id) ON DELETE SET NULL;
+                    END IF;
+                END $$;
+            """)
+        except Exception:
+            pass
+        # 마이그레이션: campaigns에 업체(client) 관련 컬럼
+        try:
+            cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS client_id INTEGER")
+            cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS reject_reason TEXT DEFAULT ''")
+        except Exception:
+            pass
+        # notices.vote_enabled 컬럼 마이그레이션
+        try:
+            cur.execute("ALTER TABLE notices ADD COLUMN IF NOT EXISTS vote_enabled BOOLEAN DEFAULT FALSE")
+        except Exception:
+            pass
+        # 기존 purchase_date 빈 건 일괄 수정 (구매캡쳐 있으면 created_at 기준)
+        try:
+            cur.execute("""
+                UPDATE progress SET purchase_date = (created_at AT TIME ZONE 'Asia/Seoul')::date
+                WHERE purchase_date IS NULL
+                  AND purchase_capture_url IS NOT NULL AND purchase_capture_url != ''
+            """)
+            if cur.rowcount > 0:
+                logger.info("purchase_date 일괄 수정: %d건", cur.rowcount)
+        except Exception:
+            pass
+        # 기존 payment_total 빈 건 일괄 수정 (결제금액+리뷰비 → 입금금액)
+        try:
+            cur.execute("""
+                UPDATE progress p SET payment_total = COALESCE(p.payment_amount, 0) + COALESCE(p.review_fee, 0)
+                WHERE (p.payment_total IS NULL OR p.payment_total = 0)
+                  AND (COALESCE(p.payment_amount, 0) + COALESCE(p.review_fee, 0)) > 0
+            """)
+            if cur.rowcount > 0:
+                logger.info("payment_total 일괄 수정: %d건", cur.rowcount)
+        except Exception:
+            pass
+        # 마이그레이션: 대행사(agency) 지원
+        try:
+            cur.execute("ALTER TABLE clients ADD COLUMN IF NOT EXISTS agency_id INTEGER DEFAULT NULL")
+            cur.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS agency_id INTEGER DEFAULT NULL")
+        except Exception:
+            pass
+        # 마이그레이션: 리뷰기한 빈 건 일괄 채우기 (구매일 + 캠페인 리뷰기한일수)
+        try:
+            cur.execute("""
+                UPDATE progress p SET review_deadline =
+                    (p.purchase_date + c.review_deadline_days * INTERVAL '1 day')::date
+                FROM campaigns c
+                WHERE p.campaign_id = c.id
+                  AND c.review_deadline_days > 0
+                  AND p.purchase_date IS NOT NULL
+                  AND (p.review_deadline IS NULL)
+            """)
+            if cur.rowcount > 0:
+                logger.info("리뷰기한 빈 건 일괄 채우기: %d건", cur.rowcount)
+        except Exception:
+            pass
+        # 기존 구매캡쳐 반려 비고 잔류 정리: 재제출 완료된 건의 비고 클리어
+        try:
+            cur.execute("""
+                UPDATE progress SET remark = ''
+                WHERE (remark LIKE '구매캡쳐 반려%%' OR remark LIKE 'AI 자동반려%%')
+                  AND purchase_capture_url IS NOT NULL AND purchase_capture_url != ''
+            """)
+            if cur.rowcount > 0:
+                logger.info("구매캡쳐 반려 비고 잔류 정리: %d건", cur.rowcount)
+        except Exception:
+            pass
+        # 마이그레이션: 중복 clients 정리 (같은 company_name → 가장 오래된 것만 유지)
+        try:
+            # 1) 중복 client_id → 남길 ID로 campaigns 업데이트
+            cur.execute("""
+                UPDATE campaigns SET client_id = keeper.keep_id
+                FROM (
+                    SELECT c.id AS dup_id, first_value(c.id) OVER (
+                        PARTITION BY LOWER(TRIM(c.company_name))
+                        ORDER BY c.created_at ASC, c.id ASC
+                    ) AS keep_id
+                    FROM clients c
+                ) keeper
+                WHERE campaigns.client_id = keeper.dup_id
+                  AND keeper.dup_id != keeper.keep_id
+            """)
+            # 2) 중복 client 삭제
+            cur.execute("""
+                DELETE FROM clients WHERE id IN (
+                    SELECT id FROM (
+                        SELECT id, ROW_NUMBER() OVER (
+                            PARTITION BY LOWER(TRIM(company_name))
+                            ORDER BY created_at ASC, id ASC
+                        ) as rn
+                        FROM clients
+                    ) ranked WHERE rn > 1
+                )
+            """)
+            if cur.rowcount > 0:
+                logger.info("중복 clients 정리: %d건 삭제", cur.rowcount)
+        except Exception:
+            pass
+
+    def _migrate_trgm_indexes(self, cur):
+        # 부분일치 검색용 pg_trgm 확장 + GIN 인덱스 (확장 권한 없으면 기존 ILIKE 그대로)
+        try:
+            cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            for idx_name, table, col in _TRGM_INDEXES:
+                cur.execute(
+                    f"CREATE INDEX IF NOT EXISTS {idx_name} ON {table} USING gin ({col} gin_trgm_ops)"
+                )
+        except Exception as e:
+            logger.warning("pg_trgm 인덱스 생성 실패 (ILIKE 순차검색 유지): %s", e)
+
+    def _migrate_campaign_counters(self, cur):
+        # 여러 문장을 한 번에 실행 → 하나의 암묵적 트랜잭션으로 원자 적용
+        cur.execute(_COUNTERS_SQL)
+
+    @staticmethod
+    def _index_valid(cur, idx_name: str) -> bool | None:
+        """인덱스 사용 가능 여부 (pg_index.indisvalid, 없으면 None)"""
+        cur.execute("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)", (idx_name,))
+        row = cur.fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _drop_index_quietly(cur, idx_name: str):
+        try:
+            cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {idx_name}")
+        except Exception as e:
+            logger.warning("인덱스 삭제 실패 %s: %s", idx_name, e)
+
+    def _migrate_hot_indexes(self, cur) -> bool:
+        # autocommit이므로 CONCURRENTLY 가능 → 운영 중 progress 쓰기를 막지 않음
+        # 실패한 CONCURRENTLY는 INVALID 인덱스를 남기고, IF NOT EXISTS는 그 이름을 보고 그냥 통과함
+        # → 존재 여부가 아니라 indisvalid로 판단
+        created = set()
+        for idx_name, definition in _HOT_INDEXES:
+            valid = self._index_valid(cur, idx_name)
+            if valid is False:
+                self._drop_index_quietly(cur, idx_name)
+            if not valid:
+                try:
+                    cur.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {idx_name} ON {definition}")
+                except Exception as e:
+                    logger.warning("인덱스 생성 실패 (순차검색 유지) %s: %s", idx_name, e)
+                    self._drop_index_quietly(cur, idx_name)
+                    continue
+                if not self._index_valid(cur, idx_name):
+                    logger.warning("인덱스 INVALID (순차검색 유지) %s", idx_name)
+                    self._drop_index_quietly(cur, idx_name)
+                    continue
+            created.add(idx_name)
+        # 대체 인덱스가 유효한 경우에만 기존 단일 컬럼 인덱스 제거
+        for idx_name, replaced_by in _REDUNDANT_INDEXES:
+            if replaced_by in created:
+                cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {idx_name}")
+        return len(created) == len(_HOT_INDEXES)
+
+    def _migrate_progress_archive(self, cur):
+        cur.execute(_PROGRESS_ARCHIVE_SQL)
+        self._sync_progress_archive(cur)
+
+    @staticmethod
+    def _sync_progress_archive(cur):
+        """progress에 새로 생긴 컬럼을 archive에도 추가하고 progress_all 뷰 재생성"""
+        cur.execute("""
+            SELECT column_name, format_type(a.atttypid, a.atttypmod)
+            FROM information_schema.columns ic
+            JOIN pg_attribute a ON a.attrelid = 'progress'::regclass
+                               AND a.attname = ic.column_name
+            WHERE ic.table_schema = current_schema() AND ic.table_name = 'progress'
+            ORDER BY ic.ordinal_position
+        """)
+        columns = cur.fetchall()
+        for name, col_type in columns:
+            cur.execute(f'ALTER TABLE progress_archive ADD COLUMN IF NOT EXISTS "{name}" {col_type}')
+        col_list = ", ".join(f'"{name}"' for name, _ in columns)
+        cur.execute("DROP VIEW IF EXISTS progress_all")
+        cur.execute(f"""
+            CREATE VIEW progress_all AS
+            SELECT {col_list} FROM progress
+            UNION ALL
+            SELECT {col_list} FROM progress_archive
+        """)
+
+    def _migrate_chat_partitions(self, cur):
+        cur.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass('chat_messages')")
+        row = cur.fetchone()
+        if row and row[0] == "p":
+            return
+        cur.execute("SELECT MIN(created_at) FROM chat_messages")
+        oldest = cur.fetchone()[0]
+        this_month = now_kst().date().replace(day=1)
+        first = (oldest.astimezone(KST).date().replace(day=1)
+                 if oldest else this_month)
+        months = []
+        m = first
+        while m <= _add_months(this_month, CHAT_PARTITION_MONTHS_AHEAD):
+            months.append(m)
+            m = _add_months(m, 1)
+
+        index_ddl = ["CREATE INDEX IF NOT EXISTS idx_chat_created ON chat_messages(created_at)"]
+        index_ddl += [f"CREATE INDEX IF NOT EXISTS {name} ON {definition}"
+                      for name, definition in _HOT_INDEXES if definition.startswith("chat_messages(")]
+        cur.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if cur.fetchone():
+            index_ddl += [f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({col} gin_trgm_ops)"
+                          for name, table, col in _TRGM_INDEXES if table == "chat_messages"]
+
+        # 한 번의 execute = 암묵적 트랜잭션 1개 → 전환 도중 실패하면 원래 테이블 그대로
+        # 기존 id 시퀀스를 그대로 이어 쓰고, 기존 테이블 삭제 전에 소유권을 새 테이블로 옮긴다
+        statements = [
+            "ALTER TABLE chat_messages RENAME TO chat_messages_legacy",
+            "ALTER TABLE chat_messages_legacy RENAME CONSTRAINT chat_messages_pkey TO chat_messages_legacy_pkey",
+            """CREATE TABLE chat_messages (
+                   id              INTEGER NOT NULL DEFAULT nextval('chat_messages_id_seq'),
+                   reviewer_id     TEXT NOT NULL,
+                   sender          TEXT NOT NULL DEFAULT 'user',
+                   message         TEXT NOT NULL DEFAULT '',
+                   rating          TEXT DEFAULT '',
+                   created_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                   PRIMARY KEY (id, created_at)
+               ) PARTITION BY RANGE (created_at)""",
+            "ALTER SEQUENCE chat_messages_id_seq OWNED BY chat_messages.id",
+            f"CREATE TABLE IF NOT EXISTS {_CHAT_DEFAULT_PARTITION} PARTITION OF chat_messages DEFAULT",
+            *[_chat_partition_ddl(m) for m in months],
+            """INSERT INTO chat_messages (id, reviewer_id, sender, message, rating, created_at)
+               SELECT id, reviewer_id, sender, message, rating, COALESCE(created_at, NOW())
+               FROM chat_messages_legacy""",
+            "DROP TABLE chat_messages_legacy",
+            *index_ddl,
+        ]
+        cur.execute(";\n".join(statements))
+        logger.info("chat_messages 파티션 전환: %d개월", len(months))
+
+    def _migrate_asset_slots(self, cur):
+        # 테이블/트리거 생성 + 기존 사진세트·리뷰내용과 현재 배분 현황으로 채우기를 한 트랜잭션으로
+        backfill = [_asset_slot_fill_sql(kind, campaign_filter=False) for kind in _ASSET_SOURCES]
+        cur.execute(_ASSET_SLOTS_SQL + ";\n".join(backfill))
+
+    def _migrate_status_transitions(self, cur):
+        cur.execute(_STATUS_TRANSITION_SQL)
+
+    def _migrate_progress_archive_fks(self, cur):
+        cur.execute(_PROGRESS_ARCHIVE_FK_SQL)
+        for name in ("progress_archive_campaign_id_fkey", "progress_archive_reviewer_id_fkey"):
+            try:
+                cur.execute(f"ALTER TABLE progress_archive VALIDATE CONSTRAINT {name}")
+            except Exception as e:
+                # 아카이브 이동 후 삭제된 리뷰어 등 기존 고아 행 → 새 쓰기만 검사하는 상태로 유지
+                logger.warning("progress_archive 외래키 검증 실패 (신규 행만 적용) %s: %s", name, e)
+
+    # ─────────── 작업 단위 (unit of work) ───────────
+
+    def current_unit_of_work(self):
+        """현재 스레드(그린스레드)의 작업 단위. 없으면 None"""
+        return getattr(self._local, "uow", None)
+
+    def begin_unit_of_work(self, label: str = "") -> UnitOfWork:
+        """작업 단위 시작. 이미 진행 중이면 중첩 카운트만 증가."""
+        uow = self.current_unit_of_work()
+        if uow is not None:
+            uow.depth += 1
+            return uow
+        uow = UnitOfWork(label)
+        self._local.uow = uow
+        query_stats.set_scope(label)
+        return uow
+
+    def end_unit_of_work(self, error=None):
+        """작업 단위 종료: 오류 없으면 커밋, 오류면 롤백 후 커넥션 반환.
+
+        중첩된 경우 가장 바깥 작업 단위에서만 실제로 커밋한다.
+        """
+        uow = self.current_unit_of_work()
+        if uow is None:
+            return None
+        if uow.depth > 0:
+            uow.depth -= 1
+            return uow
+        self._local.uow = None
+        query_stats.clear_scope()
+        conn = uow.conn
+        if conn is not None:
+            try:
+                if error is None:
+                    conn.commit()
+                else:
+                    conn.rollback()
+                    if uow.dirty:
+                        self._invalidate_local_caches()
+            finally:
+                self.pool.putconn(conn)
+        # 커밋 전에 다른 요청이 옛 값을 다시 캐시했을 수 있으므로 한 번 더 무효화
+        for fn in uow.on_commit:
+            fn()
+        if uow.queries >= UOW_QUERY_WARN:
+            logger.warning("작업 단위 쿼리 과다: %s %d건 (%.0fms)",
+                           uow.label, uow.queries, uow.elapsed_ms)
+        else:
+            logger.debug("작업 단위 종료: %s %d건 (%.0fms)",
+                         uow.label, uow.queries, uow.elapsed_ms)
+        return uow
+
+    def flush_unit_of_work(self):
+        """커밋 지점: 작업 단위의 미커밋 쓰기를 지금 커밋하고 커넥션 반환.
+
+        외부 API 호출(카톡/태스크 전송 등) 전에 호출 → 네트워크 대기 동안 행 잠금과
+        커넥션을 잡지 않고, 이미 발송한 알림의 기록이 이후 롤백으로 사라지지 않는다.
+        작업 단위 밖이거나 미커밋 쓰기가 없으면 아무것도 하지 않는다.
+        """
+        uow = self.current_unit_of_work()
+        if uow is None or uow.conn is None or uow.busy:
+            return
+        conn, uow.conn = uow.conn, None
+        dirty, uow.dirty = uow.dirty, False
+        callbacks, uow.on_commit = uow.on_commit, []
+        try:
+            if dirty:
+                conn.commit()
+        except BaseException:
+            self._invalidate_local_caches()
+            self.pool.putconn(conn, close=conn.closed != 0)
+            raise
+        self.pool.putconn(conn)
+        for fn in callbacks:
+            fn()
+
+    @contextmanager
+    def unit_of_work(self, label: str = ""):
+        """요청/백그라운드 작업 단위 컨텍스트
+
+        블록 안의 모든 쿼리는 같은 커넥션을 쓰고, 쓰기는 블록 종료 시 한 번에 커밋된다.
+        """
+        uow = self.begin_unit_of_work(label)
+        try:
+            yield uow
+        except BaseException as e:
+            self.end_unit_of_work(e)
+            raise
+        self.end_unit_of_work()
+
+    @contextmanager
+    def _short_transaction(self):
+        """행 잠금을 잡는 짧은 쓰기 트랜잭션.
+
+        작업 단위 안이라도 앞선 미커밋 쓰기가 없으면 블록 끝에서 바로 커밋해
+        잠금을 요청 끝(외부 API 호출 등)까지 끌고 가지 않는다.
+        앞선 쓰기가 있으면 원자성을 위해 평소처럼 작업 단위 종료 시 커밋.
+        """
+        uow = self.current_unit_of_work()
+        with self._conn() as conn:
+            yield conn
+            if uow is not None and uow.conn is conn and not uow.dirty:
+                conn.commit()
+            else:
+                self._commit(conn)
+
+    def _on_commit(self, fn):
+        """작업 단위 진행 중이면 커밋 직후에도 fn 실행 (캐시 무효화용)"""
+        uow = self.current_unit_of_work()
+        if uow is not None:
+            uow.on_commit.append(fn)
+
+    def _invalidate_local_caches(self):
+        """롤백된 쓰기가 캐시에 남지 않도록 인메모리 캐시 비움"""
+        self._reviewer_cache.clear()
+        self._drop_campaign_cache()
+
+    def _commit(self, conn):
+        """쓰기 커밋. 작업 단위 진행 중이면 종료 시점까지 미룬다."""
+        uow = self.current_unit_of_work()
+        if uow is not None and uow.conn is conn:
+            uow.dirty = True
+            return
+        conn.commit()
+
+    @staticmethod
+    def _uow_stmt(conn, sql):
+        """작업 단위 내부 제어문 (SAVEPOINT 등) — 쿼리 계측에서 제외"""
+        with conn.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
+            cur.execute(sql)
 
     @contextmanager
     def _conn(self):
-        conn = self.pool.getconn()
+        uow = self.current_unit_of_work()
+        if uow is None:
+            conn = self.pool.getconn()
+            try:
+                yield conn
+            finally:
+                self.pool.putconn(conn)
+            return
+
+        if uow.conn is None:
+            uow.conn = self.pool.getconn()
+        uow.queries += 1
+        conn = uow.conn
+        # 미커밋 쓰기가 있으면 SAVEPOINT로 보호: 문장 하나 실패가 앞선 쓰기를 날리지 않도록
+        protected = uow.dirty
+        if protected:
+            self._uow_stmt(conn, "SAVEPOINT uow_stmt")
+        uow.busy += 1
         try:
             yield conn
-        finally:
+        except BaseException:
+            uow.busy -= 1
+            if conn.closed:
+                # 커넥션 끊김: 풀에서 폐기하고 다음 쿼리에서 새로 꺼낸다
+                self.pool.putconn(conn, close=True)
+                uow.conn = None
+                uow.dirty = False
+            elif protected:
+                self._uow_stmt(conn, "ROLLBACK TO SAVEPOINT uow_stmt")
+            else:
+                conn.rollback()
+                if not uow.busy:
+                    self._release_uow_conn(uow)
+            raise
+        uow.busy -= 1
+        if protected:
+            self._uow_stmt(conn, "RELEASE SAVEPOINT uow_stmt")
+        elif not uow.dirty and not uow.busy and uow.conn is conn:
+            # 미커밋 쓰기 없음 → 읽기 트랜잭션을 끝내고 커넥션 반환
+            self._release_uow_conn(uow)
+
+    def _release_uow_conn(self, uow):
+        """미커밋 쓰기가 없는 작업 단위 커넥션 반환 (풀이 열린 읽기 트랜잭션을 롤백)"""
+        conn, uow.conn = uow.conn, None
+        if conn is not None:
             self.pool.putconn(conn)
 
-    def _fetchall(self, sql, params=None):
-        with self._conn() as conn:
-            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-                cur.execute(sql, params)
-                return [dict(r) for r in cur.fetchall()]
+    def pool_stats(self) -> dict:
+        """커넥션 풀 지표 (사용 중/대기 시간/타임아웃)"""
+        stats = {"primary": self.pool.stats()}
+        if self.replica_pool is not None:
+            stats["replica"] = self.replica_pool.stats()
+        return stats
+
+    # ─────────── 읽기 복제본 라우팅 ───────────
+    #
+    # 기본은 모두 primary. read_replica() 블록 안의 _fetchall/_fetchone만 복제본으로 보낸다
+    # (관리자 대시보드처럼 몇 초 늦어도 되는 읽기 전용 화면). 리뷰어가 신청/업로드 직후
+    # 조회하는 내역/진행현황/입금현황은 이전 요청의 쓰기가 보여야 하므로 복제본에 보내지 않는다.
+    # 다음 경우는 블록 안이어도 primary:
+    #   - 같은 작업 단위에서 이미 쓰기가 있었음 (read-after-write)
+    #   - 호출 시 replica=False 지정
+    #   - 복제 지연 > REPLICA_MAX_LAG_SECONDS 이거나 복제본 장애
+
+    @contextmanager
+    def read_replica(self, enabled: bool = True):
+        """블록 안의 읽기 쿼리를 복제본으로 라우팅 (복제본 미설정 시 무시)"""
+        prev = getattr(self._local, "read_replica", False)
+        self._local.read_replica = enabled
+        try:
+            yield
+        finally:
+            self._local.read_replica = prev
+
+    def _use_replica(self, replica=None) -> bool:
+        if self.replica_pool is None:
+            return False
+        if replica is None:
+            replica = getattr(self._local, "read_replica", False)
+        if not replica:
+            return False
+        uow = self.current_unit_of_work()
+        if uow is not None and uow.dirty:
+            return False
+        return self._replica_healthy()
+
+    def _replica_healthy(self) -> bool:
+        """복제 지연 확인 (REPLICA_CHECK_INTERVAL 동안 결과 재사용)"""
+        now = time.monotonic()
+        if now - self._replica_checked < REPLICA_CHECK_INTERVAL:
+            return self._replica_ok
+        self._replica_checked = now
+        try:
+            # primary의 현재 WAL 위치까지 재생했으면 지연 없음 (primary 유휴 시 replay 시각이 오래돼도 지연 아님).
+            # 못 따라잡았으면 마지막 재생 트랜잭션 시각 기준 지연
+            primary_lsn = self._fetchone("SELECT pg_current_wal_lsn()::text AS lsn", replica=False)["lsn"]
+            with self._replica_conn() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        SELECT CASE
+                            WHEN NOT pg_is_in_recovery() THEN 0
+                            WHEN pg_last_wal_replay_lsn() >= %s::pg_lsn THEN 0
+                            ELSE EXTRACT(EPOCH FROM NOW() - pg_last_xact_replay_timestamp())
+                        END
+                    """, (primary_lsn,))
+                    lag = cur.fetchone()[0]
+                    lag = float("inf") if lag is None else float(lag)
+        except Exception as e:
+            if self._replica_ok:
+                logger.warning("복제본 상태 확인 실패 → primary 사용: %s", e)
+            self._replica_ok = False
+            return False
+        ok = lag <= REPLICA_MAX_LAG_SECONDS
+        if ok != self._replica_ok:
+            if ok:
+                logger.info("복제본 읽기 재개 (지연 %.1fs)", lag)
+            else:
+                logger.warning("복제 지연 %.1fs → primary로 읽기", lag)
+        self._replica_ok = ok
+        return ok
 
-    def _fetchone(self, sql, params=None):
+    @contextmanager
+    def _replica_conn(self):
+        conn = self.replica_pool.getconn()
+        try:
+            conn.autocommit = True  # 읽기 전용: idle in transaction 방지
+            yield conn
+        except BaseException:
+            self.replica_pool.putconn(conn, close=conn.closed != 0)
+            raise
+        self.replica_pool.putconn(conn)
+
+    def _read(self, sql, params, one: bool, replica=None):
+        """SELECT 실행 → (컬럼명, 행 목록). 복제본 연결 오류 시 primary로 재시도."""
+        if self._use_replica(replica):
+            try:
+                with self._replica_conn() as conn:
+                    return self._run_select(conn, sql, params, one)
+            except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+                logger.warning("복제본 읽기 실패 → primary 재시도: %s", e)
+                self._replica_ok = False
+                self._replica_checked = time.monotonic()
         with self._conn() as conn:
-            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-                cur.execute(sql, params)
-                row = cur.fetchone()
-                return dict(row) if row else None
+            return self._run_select(conn, sql, params, one)
+
+    @staticmethod
+    def _run_select(conn, sql, params, one: bool):
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
+            rows = [cur.fetchone()] if one else cur.fetchall()
+            cols = [d[0] for d in cur.description] if cur.description else []
+        return cols, rows
+
+    # 튜플 커서 + 컬럼명 zip: RealDictCursor(행마다 RealDictRow 생성) + dict(r) 복사보다 빠름
+
+    def _fetchall(self, sql, params=None, replica=None):
+        """replica: None=read_replica() 블록 설정 따름, True/False=호출 단위 강제"""
+        cols, rows = self._read(sql, params, False, replica)
+        return [dict(zip(cols, r)) for r in rows]
+
+    def _fetchone(self, sql, params=None, replica=None):
+        cols, rows = self._read(sql, params, True, replica)
+        row = rows[0]
+        if not row:
+            return None
+        return dict(zip(cols, row))
 
     def _execute(self, sql, params=None):
         with self._conn() as conn:
             with conn.cursor() as cur:
                 cur.execute(sql, params)
-            conn.commit()
+            self._commit(conn)
 
     def _execute_returning(self, sql, params=None):
         with self._conn() as conn:
             with conn.cursor() as cur:
                 cur.execute(sql, params)
                 result = cur.fetchone()
-            conn.commit()
+            self._commit(conn)
             return result[0] if result else None
 
+    def _execute_returning_all(self, sql, params=None) -> list[dict]:
+        """쓰기 + RETURNING 여러 행 (일괄 UPDATE/DELETE용)"""
+        with self._conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, params)
+                rows = cur.fetchall()
+                cols = [d[0] for d in cur.description]
+            self._commit(conn)
+        return [dict(zip(cols, r)) for r in rows]
+
     # ─────────── reviewers ───────────
 
     def upsert_reviewer(self, name: str, phone: str) -> int:
@@ -647,23 +1849,47 @@ class DBManager:
             ON CONFLICT (name, phone) DO UPDATE SET updated_at = NOW()
             RETURNING id
         """
+        self.invalidate_reviewer(name, phone)
         return self._execute_returning(sql, (name, phone))
 
     def get_reviewer(self, name: str, phone: str) -> dict | None:
-        return self._fetchone(
-            "SELECT * FROM reviewers WHERE name = %s AND phone = %s",
-            (name, phone)
-        )
+        """(이름, 연락처) → reviewers 행. 인메모리 캐시 우선 (없는 리뷰어는 캐시하지 않음)"""
+        key = (name, phone)
+        row = self._reviewer_cache.get(key)
+        if row is None:
+            row = self._fetchone(
+                "SELECT * FROM reviewers WHERE name = %s AND phone = %s",
+                (name, phone)
+            )
+            if not row:
+                return None
+            self._reviewer_cache.set(key, row)
+        return dict(row)
+
+    def invalidate_reviewer(self, name: str, phone: str):
+        """리뷰어 캐시 무효화 (reviewers 행을 직접 수정한 경우 호출)"""
+        key = (name, phone)
+        self._reviewer_cache.pop(key)
+        self._on_commit(lambda: self._reviewer_cache.pop(key))
 
     def get_reviewer_by_id(self, reviewer_id: int) -> dict | None:
         return self._fetchone("SELECT * FROM reviewers WHERE id = %s", (reviewer_id,))
 
+    def search_reviewer_ids(self, q: str, limit: int = SEARCH_REVIEWER_LIMIT) -> list[int]:
+        """이름/연락처 부분일치 리뷰어 id 목록 (trigram 인덱스)"""
+        cond, params = _ilike_any(("name", "phone"), q)
+        rows = self._fetchall(
+            f"SELECT id FROM reviewers WHERE {cond} LIMIT %s", tuple(params) + (limit,)
+        )
+        return [r["id"] for r in rows]
+
     def update_kakao_friend(self, name: str, phone: str, status: bool):
         """카카오 친구추가 상태 업데이트"""
         self._execute(
             "UPDATE reviewers SET kakao_friend = %s, updated_at = NOW() WHERE name = %s AND phone = %s",
             (status, name, phone)
         )
+        self.invalidate_reviewer(name, phone)
 
     def update_reviewer_store_ids(self, name: str, phone: str, store_id: str):
         """캠페인 등록 시 아이디목록 + 참여횟수 업데이트"""
@@ -680,6 +1906,7 @@ class DBManager:
                WHERE name = %s AND phone = %s""",
             (", ".join(id_list), name, phone)
         )
+        self.invalidate_reviewer(name, phone)
 
     def get_all_reviewers_db(self) -> list[dict]:
         return self._fetchall("SELECT * FROM reviewers ORDER BY created_at DESC")
@@ -687,9 +1914,106 @@ class DBManager:
     # ─────────── campaigns ───────────
 
     def get_all_campaigns(self) -> list[dict]:
-        rows = self._fetchall("SELECT * FROM campaigns WHERE status != '임시저장' ORDER BY created_at DESC")
-        # 하위 호환: 시트 컬럼명 매핑
-        return [self._campaign_to_sheet_dict(r) for r in rows]
+        """임시저장 제외 전체 캠페인 (시트 컬럼명 dict). 캐시된 스냅샷 사용."""
+        return [dict(c) for c in self._get_campaign_snapshot()]
+
+    def _get_campaign_snapshot(self) -> list[dict]:
+        """임시저장 제외 전체 캠페인 스냅샷 (공유 객체 — 호출자는 수정 금지)"""
+        snapshot = self._campaign_cache.get("__all__")
+        if snapshot is not None:
+            return snapshot
+        with self._campaign_snapshot_lock:
+            snapshot = self._campaign_cache.get("__all__")
+            if snapshot is not None:
+                return snapshot
+            rows = self._fetchall("SELECT * FROM campaigns WHERE status != '임시저장' ORDER BY created_at DESC")
+            # 하위 호환: 시트 컬럼명 매핑 (updated_at이 같으면 이전 변환 결과 재사용)
+            snapshot = [self._campaign_sheet_dict_versioned(r) for r in rows]
+            for c in snapshot:
+                self._campaign_cache.set(c["id"], c)
+            self._campaign_cache.set("__all__", snapshot)
+        return snapshot
+
+    def _campaign_sheet_dict_versioned(self, row: dict) -> dict:
+        """(id, updated_at) 버전이 같으면 기존 시트 dict 재사용, 아니면 새로 변환"""
+        cached = self._campaign_versions.get(row["id"])
+        version = row.get("updated_at")
+        if cached and version is not None and cached[0] == version:
+            return cached[1]
+        d = self._campaign_to_sheet_dict(row)
+        self._campaign_versions[row["id"]] = (version, d)
+        return d
+
+    def invalidate_campaign(self, campaign_id: str = None):
+        """캠페인 캐시 무효화. campaign_id 없으면 전체."""
+        self._drop_campaign_cache(campaign_id)
+        self._on_commit(lambda: self._drop_campaign_cache(campaign_id))
+
+    def _drop_campaign_cache(self, campaign_id: str = None):
+        self._campaign_cache.pop("__all__")
+        if campaign_id is None:
+            self._campaign_cache.clear()
+            self._campaign_versions.clear()
+        else:
+            self._campaign_cache.pop(campaign_id)
+            self._campaign_versions.pop(campaign_id, None)
+        self._notify_change("campaign", campaign_id)
+
+    # ─────────── 변경 알림 ───────────
+
+    def add_change_listener(self, fn):
+        """캠페인/카운터 변경 시 호출할 콜백 등록. fn(kind, campaign_id)
+
+        kind: "campaign"(캠페인 수정) | "counters"(progress 쓰기 → 카운터 변동)
+        campaign_id가 None이면 전체 또는 알 수 없음.
+        """
+        self._change_listeners.append(fn)
+
+    def _notify_change(self, kind: str, campaign_id: str = None):
+        for fn in self._change_listeners:
+            try:
+                fn(kind, campaign_id)
+            except Exception as e:
+                logger.warning("변경 알림 콜백 에러 (%s): %s", kind, e)
+
+    def notify_counters_changed(self, campaign_id: str = None, stage_changed: bool = True):
+        """progress 상태/등록일을 바꾼 직후 호출 (모듈 밖에서 _execute로 바꾼 경우 포함).
+
+        작업 단위 중이면 커밋 직후에도 한 번 더 알림.
+        stage_changed: 구매/리뷰 단계가 바뀌었을 수 있음 → 카운터 트리거가 캠페인 상태를
+        전환했는지 커밋 후 확인해 캐시 반영 (신규 '신청' 등록만이면 False)
+        """
+        self._notify_change("counters", campaign_id)
+        self._on_commit(lambda: self._notify_change("counters", campaign_id))
+        if stage_changed:
+            if self.current_unit_of_work() is None:
+                self._sync_transitioned_campaigns(campaign_id)
+            else:
+                self._on_commit(lambda: self._sync_transitioned_campaigns(campaign_id))
+
+    def _sync_transitioned_campaigns(self, campaign_id: str = None):
+        """트리거가 바꾼 캠페인 상태를 캐시에 반영.
+
+        캐시에 모집중/모집마감으로 남은 캠페인만 DB 상태와 비교 (PK 조회 1회) → 다르면 무효화.
+        campaign_id 없으면 캐시된 전체 스냅샷 기준.
+        """
+        if campaign_id is None:
+            cached = self._campaign_cache.get("__all__") or []
+        else:
+            cached = [self._campaign_cache.get(campaign_id)]
+        candidates = {c["id"]: c.get("상태") for c in cached
+                      if c and c.get("상태") in _AUTO_TRANSITION_FROM_STATUSES}
+        if not candidates:
+            return
+        try:
+            rows = self._fetchall("SELECT id, status FROM campaigns WHERE id = ANY(%s)",
+                                  (list(candidates),), replica=False)
+        except Exception as e:
+            logger.warning("캠페인 상태 전환 확인 실패: %s", e)
+            return
+        for r in rows:
+            if r["status"] != candidates[r["id"]]:
+                self._drop_campaign_cache(r["id"])
 
     def get_campaigns_simple(self) -> list[dict]:
         """드롭다운/필터용 경량 캠페인 목록 (id + 이름만)"""
@@ -701,11 +2025,56 @@ class DBManager:
                ORDER BY created_at DESC"""
         )
 
+    def _count_rows(self, from_where: str, params: tuple, count: str = "exact"):
+        """목록 총 건수.
+
+        count: "exact" = COUNT(*), "estimate" = 플래너 추정치 (작으면 정확히 셈),
+               "none" = 세지 않음 (None 반환)
+        """
+        if count == "none":
+            return None
+        if count == "estimate":
+            row = self._fetchone(f"EXPLAIN (FORMAT JSON) SELECT 1 {from_where}", params)
+            plan = next(iter(row.values())) if row else None
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            try:
+                estimate = int(plan[0]["Plan"]["Plan Rows"])
+            except (TypeError, KeyError, IndexError, ValueError):
+                estimate = None
+            if estimate is not None and estimate >= PAGE_EXACT_COUNT_BELOW:
+                return estimate
+        row = self._fetchone(f"SELECT COUNT(*) AS cnt {from_where}", params)
+        return row.get("cnt", 0) if row else 0
+
+    @staticmethod
+    def _keyset_clause(cursor: str, before: bool, created_col: str, id_col: str, id_cast=str):
+        """keyset 조건 + 정렬. (조건 SQL | None, 파라미터, ORDER BY, 역순 여부)"""
+        parsed = _parse_page_cursor(cursor)
+        if parsed:
+            try:
+                key = id_cast(parsed[1])
+            except (TypeError, ValueError):
+                parsed = None
+        if not parsed:
+            return None, [], f"{created_col} DESC, {id_col} DESC", False
+        op = ">" if before else "<"
+        cond = f"({created_col}, {id_col}) {op} (%s, %s)"
+        if before:
+            return cond, [parsed[0], key], f"{created_col} ASC, {id_col} ASC", True
+        return cond, [parsed[0], key], f"{created_col} DESC, {id_col} DESC", False
+
     def get_campaigns_page(self, page: int = 1, per_page: int = 20,
                            status: str = "", company: str = "",
                            search: str = "",
-                           agency_id: int = 0, client_id: int = 0) -> tuple[list, int]:
-        """캠페인 페이지네이션. (items, total_count) 반환."""
+                           agency_id: int = 0, client_id: int = 0,
+                           cursor: str = "", before: bool = False,
+                           count: str = "exact") -> tuple[list, int]:
+        """캠페인 페이지네이션. (items, total_count) 반환.
+
+        cursor가 있으면 OFFSET 대신 keyset (created_at, id) 기준으로 다음/이전 페이지 조회.
+        (커서는 make_page_cursor(항목)으로 생성)
+        """
         conditions = []
         params = []
         if status:
@@ -715,8 +2084,9 @@ class DBManager:
             # 임시저장은 기본 목록에서 제외 (status 필터 없을 때)
             conditions.append("status != '임시저장'")
         if company:
-            conditions.append("COALESCE(company, '') ILIKE %s")
-            params.append(f"%{company}%")
+            cond, cond_params = _ilike_any(("company",), company)
+            conditions.append(cond)
+            params.extend(cond_params)
         if agency_id:
             conditions.append("agency_id = %s")
             params.append(agency_id)
@@ -724,77 +2094,155 @@ class DBManager:
             conditions.append("client_id = %s")
             params.append(client_id)
         if search:
-            conditions.append("(COALESCE(campaign_name, '') ILIKE %s OR COALESCE(product_name, '') ILIKE %s)")
-            params.append(f"%{search}%")
-            params.append(f"%{search}%")
+            cond, cond_params = _ilike_any(("campaign_name", "product_name"), search)
+            conditions.append(cond)
+            params.extend(cond_params)
 
         where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
 
         # 총 건수
-        count_sql = f"SELECT COUNT(*) AS cnt FROM campaigns {where}"
-        total = self._fetchone(count_sql, tuple(params)).get("cnt", 0)
+        total = self._count_rows(f"FROM campaigns {where}", tuple(params), count)
 
         # 페이지 데이터
-        offset = (page - 1) * per_page
-        data_sql = f"SELECT * FROM campaigns {where} ORDER BY created_at DESC LIMIT %s OFFSET %s"
-        rows = self._fetchall(data_sql, tuple(params) + (per_page, offset))
+        key_cond, key_params, order, reverse = self._keyset_clause(cursor, before, "created_at", "id")
+        if key_cond:
+            where = ("WHERE " + " AND ".join(conditions + [key_cond]))
+            data_sql = f"SELECT * FROM campaigns {where} ORDER BY {order} LIMIT %s"
+            rows = self._fetchall(data_sql, tuple(params + key_params) + (per_page,))
+            if reverse:
+                rows.reverse()
+        else:
+            offset = (page - 1) * per_page
+            data_sql = f"SELECT * FROM campaigns {where} ORDER BY {order} LIMIT %s OFFSET %s"
+            rows = self._fetchall(data_sql, tuple(params) + (per_page, offset))
         return [self._campaign_to_sheet_dict(r) for r in rows], total
 
     def get_campaign_stats(self) -> dict:
-        """캠페인별 진행 통계를 SQL 집계로 반환. {campaign_id: {...stats}}"""
+        """캠페인별 진행 통계 (campaign_counters 기반). {campaign_id: {...stats}}"""
         sql = """
-            SELECT campaign_id,
-                   COUNT(*) FILTER (WHERE status NOT IN ('취소','타임아웃취소')) AS active_count,
-                   COUNT(*) FILTER (WHERE status = '입금완료') AS done_count,
-                   COUNT(*) FILTER (WHERE status IN ('리뷰대기','리뷰제출','입금대기','입금완료')) AS purchase_done,
-                   COUNT(*) FILTER (WHERE status IN ('리뷰제출','입금대기','입금완료')) AS review_done,
-                   COUNT(*) FILTER (WHERE status = '입금대기') AS settlement_pending,
-                   COUNT(*) FILTER (WHERE status = '입금완료') AS settlement_done,
-                   COUNT(*) FILTER (WHERE (created_at AT TIME ZONE 'Asia/Seoul')::date = (NOW() AT TIME ZONE 'Asia/Seoul')::date
-                                    AND status NOT IN ('취소','타임아웃취소')) AS today_count
-            FROM progress
-            GROUP BY campaign_id
+            SELECT c.campaign_id, c.reserved, c.settled, c.review_stage, c.review_done,
+                   c.payment_wait, COALESCE(d.reserved, 0) AS today_count
+            FROM campaign_counters c
+            LEFT JOIN campaign_daily_counters d
+              ON d.campaign_id = c.campaign_id
+             AND d.day = (NOW() AT TIME ZONE 'Asia/Seoul')::date
+            WHERE c.total_rows > 0
         """
         rows = self._fetchall(sql)
         result = {}
         for r in rows:
             result[r["campaign_id"]] = {
-                "active": r["active_count"],
-                "done": r["done_count"],
-                "purchase_done": r["purchase_done"],
+                "active": r["reserved"],
+                "done": r["settled"],
+                "purchase_done": r["review_stage"],
                 "review_done": r["review_done"],
-                "settlement_pending": r["settlement_pending"],
-                "settlement_done": r["settlement_done"],
+                "settlement_pending": r["payment_wait"],
+                "settlement_done": r["settled"],
                 "today": r["today_count"],
             }
         return result
 
-    def auto_update_campaign_statuses(self):
-        """자동 상태 전환: 모집중→모집마감 (구매완료>=총수량), 모집마감→마감 (리뷰완료>=총수량)"""
-        # 모집중 → 모집마감 (리뷰대기 이상 = 구매 완료한 인원 >= 총수량)
-        sql_recruit_close = """
-            UPDATE campaigns SET status = '모집마감'
-            WHERE status = '모집중'
-              AND total_qty > 0
-              AND (SELECT COUNT(*) FROM progress p
-                   WHERE p.campaign_id = campaigns.id
-                     AND p.status IN ('리뷰대기','리뷰제출','입금대기','입금완료')) >= total_qty
+    def reconcile_campaign_statuses(self) -> list[str]:
+        """자동 상태 전환 보정 스윕 (저빈도, TimeoutManager).
+
+        전환은 campaign_counters 트리거가 카운터가 늘어난 캠페인만 그때그때 처리한다.
+        여기서는 트리거가 잠금 경합으로 건너뛴 전환만 카운터 기준으로 한 번에 반영.
+        Returns: 상태가 바뀐 캠페인 ID 목록
         """
-        self._execute(sql_recruit_close)
-        # 모집마감 → 마감
-        sql_close = """
-            UPDATE campaigns SET status = '마감'
-            WHERE status = '모집마감'
-              AND total_qty > 0
-              AND (SELECT COUNT(*) FROM progress p
-                   WHERE p.campaign_id = campaigns.id
-                     AND p.status IN ('리뷰제출','입금대기','입금완료')) >= total_qty
+        rows = self._execute_returning_all(
+            """UPDATE campaigns c
+               SET status = CASE WHEN cc.review_done >= c.total_qty THEN '마감' ELSE '모집마감' END,
+                   updated_at = NOW()
+               FROM campaign_counters cc
+               WHERE cc.campaign_id = c.id AND c.total_qty > 0
+                 AND ((c.status = '모집중' AND cc.review_stage >= c.total_qty)
+                      OR (c.status = '모집마감' AND cc.review_done >= c.total_qty))
+               RETURNING c.id"""
+        )
+        changed = [r["id"] for r in rows]
+        for cid in changed:
+            self.invalidate_campaign(cid)
+        return changed
+
+    _BOARD_EXTRA_COLUMNS = ("board_reserved", "board_purchase_done", "board_review_stage",
+                            "board_payment_stage", "board_today")
+
+    def get_campaign_board(self) -> list[dict]:
+        """캠페인 카탈로그용 스냅샷 (1 쿼리, 리뷰어 무관).
+
+        공개 + 모집중/진행중 캠페인과 카운터, 오늘 신청수를 한 번에 조회.
+        Returns: [{"campaign": 시트 dict (공유 객체 — 수정 금지), "reserved", "purchase_done",
+                   "review_stage", "payment_stage", "today"}]
         """
-        self._execute(sql_close)
+        rows = self._fetchall(
+            """SELECT c.*,
+                      COALESCE(cc.reserved, 0) AS board_reserved,
+                      COALESCE(cc.purchase_done, 0) AS board_purchase_done,
+                      COALESCE(cc.review_stage, 0) AS board_review_stage,
+                      COALESCE(cc.payment_wait + cc.settled, 0) AS board_payment_stage,
+                      COALESCE(d.reserved, 0) AS board_today
+               FROM campaigns c
+               LEFT JOIN campaign_counters cc ON cc.campaign_id = c.id
+               LEFT JOIN campaign_daily_counters d
+                 ON d.campaign_id = c.id AND d.day = (NOW() AT TIME ZONE 'Asia/Seoul')::date
+               WHERE c.is_public
+                 AND (c.status IN ('모집중', '진행중', '') OR c.status IS NULL)
+               ORDER BY c.created_at DESC"""
+        )
+        board = []
+        for row in rows:
+            extra = {k: row.pop(k) for k in self._BOARD_EXTRA_COLUMNS}
+            board.append({
+                "campaign": self._campaign_sheet_dict_versioned(row),
+                "reserved": extra["board_reserved"],
+                "purchase_done": extra["board_purchase_done"],
+                "review_stage": extra["board_review_stage"],
+                "payment_stage": extra["board_payment_stage"],
+                "today": extra["board_today"],
+            })
+        return board
+
+    def get_my_campaign_ids(self, name: str, phone: str) -> list[dict]:
+        """리뷰어의 진행중 아이디 (취소/타임아웃 제외, 최신순). 캠페인 목록 오버레이용.
+
+        reviewers(name, phone) → progress(reviewer_id, ...) 인덱스만 타는 1 쿼리.
+        Returns: [{"campaign_id", "store_id", "status", "progress_id"}]
+        """
+        if not name or not phone:
+            return []
+        return self._fetchall(
+            """SELECT p.campaign_id, btrim(p.store_id) AS store_id,
+                      p.status, p.id AS progress_id
+               FROM progress p
+               JOIN reviewers r ON r.id = p.reviewer_id
+               WHERE r.name = %s AND r.phone = %s
+                 AND btrim(COALESCE(p.store_id, '')) != ''
+                 AND p.status NOT IN (%s, %s)
+               ORDER BY p.created_at DESC""",
+            (name, phone, STATUS_TIMEOUT, STATUS_CANCELLED)
+        )
+
+    def get_my_campaign_history(self, name: str, phone: str) -> dict:
+        """get_my_campaign_ids()를 캠페인별로 묶은 것 (기존 my_history 형식).
+
+        Returns: {캠페인ID: [{"id", "status", "progress_id"}]}
+        """
+        history = {}
+        for r in self.get_my_campaign_ids(name, phone):
+            history.setdefault(r["campaign_id"], []).append(
+                {"id": r["store_id"], "status": r["status"], "progress_id": r["progress_id"]})
+        return history
 
     def get_campaign_by_id(self, campaign_id: str) -> dict | None:
+        cached = self._campaign_cache.get(campaign_id)
+        if cached is not None:
+            return dict(cached)
         row = self._fetchone("SELECT * FROM campaigns WHERE id = %s", (campaign_id,))
-        return self._campaign_to_sheet_dict(row) if row else None
+        if not row:
+            return None
+        d = self._campaign_sheet_dict_versioned(row)
+        self._campaign_cache.set(campaign_id, d)
+        return dict(d)
 
     def create_campaign(self, data: dict) -> str:
         """캠페인 생성. data는 시트 컬럼명 형태도 허용."""
@@ -844,6 +2292,7 @@ class DBManager:
             )
         """
         self._execute(sql, d)
+        self.invalidate_campaign(d["id"])
         return d["id"]
 
     def update_campaign(self, campaign_id: str, data: dict):
@@ -863,6 +2312,7 @@ class DBManager:
         params.append(campaign_id)
         sql = f"UPDATE campaigns SET {', '.join(sets)} WHERE id = %s"
         self._execute(sql, params)
+        self.invalidate_campaign(campaign_id)
 
     # 캠페인 시트↔DB 컬럼 매핑
     _CAMPAIGN_FIELD_MAP = {
@@ -960,6 +2410,8 @@ class DBManager:
         "agency_id",
     }
 
+    _CAMPAIGN_SHEET_KEYS = _compile_campaign_sheet_keys(_CAMPAIGN_FIELD_MAP, _BOOL_COLUMNS, _INT_COLUMNS)
+
     def _convert_campaign_value(self, col: str, value):
         if col in self._BOOL_COLUMNS:
             if isinstance(value, bool):
@@ -1067,38 +2519,39 @@ class DBManager:
         """DB row → 시트 컬럼명 dict (하위 호환)"""
         if not row:
             return {}
-        reverse_map = {v: k for k, v in self._CAMPAIGN_FIELD_MAP.items()}
+        table = self._CAMPAIGN_SHEET_KEYS
         result = {"id": row["id"]}
         for db_col, value in row.items():
-            sheet_key = reverse_map.get(db_col, db_col)
-            if db_col in self._BOOL_COLUMNS:
+            spec = table.get(db_col)
+            if spec is None:
+                result[db_col] = str(value) if value is not None else ""
+                continue
+            sheet_key, kind = spec
+            if kind == "str":
+                result[sheet_key] = str(value) if value is not None else ""
+            elif kind == "bool":
                 result[sheet_key] = "Y" if value else "N"
-            elif db_col in self._INT_COLUMNS:
+            elif kind == "int":
                 result[sheet_key] = str(value) if value else "0"
-            elif db_col == "created_at":
-                result["등록일"] = value.astimezone(KST).strftime("%Y-%m-%d") if value else ""
-            elif db_col == "deadline_date":
-                result["신청마감일"] = str(value) if value else ""
-            elif db_col == "start_date":
-                result["시작일"] = str(value) if value else ""
-            elif db_col == "product_codes":
-                result["상품코드"] = value if isinstance(value, dict) else {}
-            elif db_col == "daily_schedule":
-                import json
+            elif kind == "created":
+                result[sheet_key] = value.astimezone(KST).strftime("%Y-%m-%d") if value else ""
+                result["created_at_iso"] = value.astimezone(KST).isoformat() if value else ""
+            elif kind == "date":
+                result[sheet_key] = str(value) if value else ""
+            elif kind == "codes":
+                result[sheet_key] = value if isinstance(value, dict) else {}
+            elif kind == "schedule":
                 if isinstance(value, list):
-                    result["일정"] = value
+                    result[sheet_key] = value
                 elif isinstance(value, str):
                     try:
-                        result["일정"] = json.loads(value)
+                        result[sheet_key] = json.loads(value)
                     except Exception:
-                        result["일정"] = []
+                        result[sheet_key] = []
                 else:
-                    result["일정"] = value if isinstance(value, list) else []
-            elif db_col == "option_list":
-                import json
-                result["옵션목록"] = json.dumps(value) if value else "[]"
-            else:
-                result[sheet_key] = str(value) if value is not None else ""
+                    result[sheet_key] = []
+            else:  # optlist
+                result[sheet_key] = json.dumps(value) if value else "[]"
         # _row_idx 호환 (PK id를 사용)
         result["_row_idx"] = row["id"]
         result["캠페인ID"] = row["id"]
@@ -1119,22 +2572,28 @@ class DBManager:
         else:
             reviewer_id = reviewer["id"]
 
+        progress_id = self._execute_returning(
+            self._PROGRESS_INSERT_SQL, self._progress_insert_params(campaign_id, reviewer_id, data))
+        self.notify_counters_changed(campaign_id)
+        return progress_id
+
+    _PROGRESS_INSERT_COLUMNS = """campaign_id, reviewer_id, store_id, status, created_at,
+            recipient_name, phone, bank, account, depositor,
+            address, nickname, payment_amount, review_fee, payment_total, remark"""
+    _PROGRESS_INSERT_ROW = """(%s, %s, %s, %s, NOW(),
+            %s, %s, %s, %s, %s,
+            %s, %s, %s, %s, %s, %s)"""
+    _PROGRESS_INSERT_SQL = (f"INSERT INTO progress ({_PROGRESS_INSERT_COLUMNS}) "
+                            f"VALUES {_PROGRESS_INSERT_ROW} RETURNING id")
+    # execute_values용 다중 행 INSERT (VALUES %s 자리에 행 템플릿 반복)
+    _PROGRESS_INSERT_MANY_SQL = (f"INSERT INTO progress ({_PROGRESS_INSERT_COLUMNS}) "
+                                 f"VALUES %s RETURNING id, store_id")
+
+    def _progress_insert_params(self, campaign_id: str, reviewer_id: int, data: dict) -> tuple:
         payment_amount = self._safe_int(data.get("결제금액", 0))
         review_fee = self._safe_int(data.get("리뷰비", 0))
         payment_total = review_fee + payment_amount if (review_fee or payment_amount) else 0
-
-        sql = """
-            INSERT INTO progress (
-                campaign_id, reviewer_id, store_id, status, created_at,
-                recipient_name, phone, bank, account, depositor,
-                address, nickname, payment_amount, review_fee, payment_total, remark
-            ) VALUES (
-                %s, %s, %s, %s, NOW(),
-                %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s, %s
-            ) RETURNING id
-        """
-        progress_id = self._execute_returning(sql, (
+        return (
             campaign_id,
             reviewer_id,
             data.get("아이디", ""),
@@ -1150,8 +2609,201 @@ class DBManager:
             review_fee,
             payment_total,
             data.get("비고", ""),
-        ))
-        return progress_id
+        )
+
+    # ─────────── 신청 슬롯 예약 (/api/apply) ───────────
+    #
+    # 정원/일일잔여/1인일일제한/중복/동시진행그룹 확인과 INSERT를 한 트랜잭션에서,
+    # 캠페인 행 잠금(FOR NO KEY UPDATE) 아래 처리한다. 같은 캠페인 신청은 잠금 순서대로
+    # 직렬화되므로 동시 신청이 카운터를 동시에 읽고 정원을 초과하는 일이 없다.
+    # (NO KEY UPDATE: progress FK 확인용 KEY SHARE 잠금과는 충돌하지 않음)
+
+    def reserve_slots(self, campaign_id: str, name: str, phone: str, store_ids) -> dict:
+        """캠페인 신청 슬롯 예약.
+
+        Returns: {"ok": bool, "reason": 실패 사유 코드 또는 "", (사유별 값),
+                  "results": [{"store_id", "ok", "progress_id" | "error"}],
+                  "total_remaining", "daily_remaining"(-1=제한 없음)}
+        reason: not_found | closed | capacity(remaining) | daily(remaining)
+                | per_person(limit, remaining) | "" (아이디별 결과는 results)
+        잔여는 카운터를 읽은 경우에만 포함 (등록 성공 시 등록 후 값). 실패 결과는 SlotGate.record
+        """
+        sids = [str(s).strip() for s in store_ids or []]
+        sids = [s for s in sids if s]
+        result = {"ok": False, "reason": "", "results": []}
+        if not sids:
+            return result
+
+        reviewer = self.get_reviewer(name, phone)
+        with self._short_transaction() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT * FROM campaigns WHERE id = %s FOR NO KEY UPDATE", (campaign_id,))
+                row = cur.fetchone()
+                if not row:
+                    result["reason"] = "not_found"
+                    return result
+                camp = dict(zip([d[0] for d in cur.description], row))
+                if camp.get("status") in _APPLY_CLOSED_CAMPAIGN_STATUSES:
+                    result["reason"] = "closed"
+                    return result
+
+                # 정원 (잠금 이후 읽으므로 앞선 신청의 커밋이 반영된 값)
+                cur.execute(
+                    """SELECT COALESCE((SELECT reserved FROM campaign_counters WHERE campaign_id = %s), 0),
+                              COALESCE((SELECT reserved FROM campaign_daily_counters
+                                        WHERE campaign_id = %s
+                                          AND day = (NOW() AT TIME ZONE 'Asia/Seoul')::date), 0)""",
+                    (campaign_id, campaign_id)
+                )
+                reserved, today_reserved = cur.fetchone()
+                capacity = (camp.get("total_qty") or 0) - reserved
+                daily_target = schedule_for(self._campaign_to_sheet_dict(camp)).target()
+                daily_left = max(0, daily_target - today_reserved) if daily_target > 0 else -1
+                result.update(total_remaining=capacity, daily_remaining=daily_left)
+                if not reviewer:
+                    # 잠금 전 조회 이후 같은 사람의 첫 신청이 먼저 커밋됐을 수 있음 → 1인 제한 누락 방지
+                    cur.execute("SELECT id FROM reviewers WHERE name = %s AND phone = %s", (name, phone))
+                    found = cur.fetchone()
+                    if found:
+                        reviewer = {"id": found[0]}
+                if capacity < len(sids):
+                    result.update(reason="capacity", remaining=max(0, capacity))
+                    return result
+
+                if 0 <= daily_left < len(sids):
+                    result.update(reason="daily", remaining=daily_left)
+                    return result
+
+                max_pp = camp.get("max_per_person_daily") or 0
+                if max_pp > 0:
+                    already = 0
+                    if reviewer:
+                        cur.execute(
+                            """SELECT COUNT(*) FROM progress
+                               WHERE reviewer_id = %s AND campaign_id = %s
+                                 AND (created_at AT TIME ZONE 'Asia/Seoul')::date = (NOW() AT TIME ZONE 'Asia/Seoul')::date
+                                 AND status NOT IN (%s, %s)""",
+                            (reviewer["id"], campaign_id, STATUS_TIMEOUT, STATUS_CANCELLED)
+                        )
+                        already = cur.fetchone()[0]
+                    if already + len(sids) > max_pp:
+                        result.update(reason="per_person", limit=max_pp,
+                                      remaining=max(0, max_pp - already))
+                        return result
+
+                if reviewer:
+                    reviewer_id = reviewer["id"]
+                else:
+                    cur.execute(
+                        """INSERT INTO reviewers (name, phone, created_at) VALUES (%s, %s, NOW())
+                           ON CONFLICT (name, phone) DO UPDATE SET updated_at = NOW()
+                           RETURNING id""",
+                        (name, phone)
+                    )
+                    reviewer_id = cur.fetchone()[0]
+                    self.invalidate_reviewer(name, phone)
+
+                # 아이디 전체를 한 번에 확인: 같은 캠페인 중복 + 동시진행그룹 사용 중
+                duplicates, conflicts = self._store_id_conflicts(
+                    cur, campaign_id, sids, (camp.get("exclusive_group") or "").strip(),
+                    camp.get("exclusive_days") or 0)
+
+                accepted, errors = [], []   # errors: 요청 순서대로 (아이디, 에러 또는 None)
+                for sid in sids:
+                    if sid in duplicates or sid in accepted:
+                        errors.append((sid, "이미 등록된 아이디"))
+                    elif sid in conflicts:
+                        errors.append((sid, f"동시진행 캠페인 [{conflicts[sid]}]에서 사용 중"))
+                    else:
+                        accepted.append(sid)
+                        errors.append((sid, None))
+
+                inserted = {}
+                if accepted:
+                    # 진행 행 다중 INSERT 1회 + 리뷰어 아이디목록/참여횟수 UPDATE 1회
+                    data = {"결제금액": camp.get("payment_amount"), "리뷰비": camp.get("review_fee")}
+                    rows = psycopg2.extras.execute_values(
+                        cur, self._PROGRESS_INSERT_MANY_SQL,
+                        [self._progress_insert_params(campaign_id, reviewer_id, dict(data, 아이디=sid))
+                         for sid in accepted],
+                        template=self._PROGRESS_INSERT_ROW, fetch=True)
+                    inserted = {sid: pid for pid, sid in rows}
+                    self._add_reviewer_store_ids(cur, reviewer_id, accepted)
+                    result["total_remaining"] = capacity - len(accepted)
+                    if daily_left >= 0:
+                        result["daily_remaining"] = daily_left - len(accepted)
+
+        result["results"] = [
+            {"store_id": sid, "ok": True, "progress_id": inserted[sid]} if error is None
+            else {"store_id": sid, "ok": False, "error": error}
+            for sid, error in errors
+        ]
+        result["ok"] = bool(inserted)
+        if inserted:
+            self.invalidate_reviewer(name, phone)
+            # '신청' 등록은 구매/리뷰 단계 카운터를 늘리지 않음 → 상태 전환 없음
+            self.notify_counters_changed(campaign_id, stage_changed=False)
+        return result
+
+    @staticmethod
+    def _store_id_conflicts(cur, campaign_id: str, store_ids: list, group: str = "",
+                            days: int = 0) -> tuple[set, dict]:
+        """아이디 목록 일괄 확인 (1 쿼리).
+
+        Returns: (같은 캠페인에서 진행 중인 아이디 set,
+                  {아이디: 동시진행그룹 내 다른 캠페인명})
+        """
+        sql = """SELECT p.store_id, NULL AS conflict
+                 FROM progress_all p
+                 WHERE p.campaign_id = %s AND p.store_id = ANY(%s)
+                 AND p.status NOT IN %s"""
+        params = [campaign_id, list(store_ids), _DUP_IGNORE_STATUSES]
+        if group:
+            recent = "AND p.created_at >= NOW() - (%s * INTERVAL '1 day')" if days > 0 else ""
+            sql += f"""
+                 UNION ALL
+                 SELECT p.store_id, c.campaign_name
+                 FROM progress_all p
+                 JOIN campaigns c ON p.campaign_id = c.id
+                 WHERE c.exclusive_group = %s
+                 AND p.campaign_id != %s
+                 AND p.store_id = ANY(%s)
+                 AND p.status NOT IN %s
+                 {recent}"""
+            params += [group, campaign_id, list(store_ids), _EXCLUSIVE_IGNORE_STATUSES]
+            if days > 0:
+                params.append(days)
+        cur.execute(sql, params)
+        duplicates, conflicts = set(), {}
+        for store_id, conflict in cur.fetchall():
+            if conflict is None:
+                duplicates.add(store_id)
+            else:
+                conflicts.setdefault(store_id, conflict)
+        return duplicates, conflicts
+
+    @staticmethod
+    def _add_reviewer_store_ids(cur, reviewer_id: int, store_ids: list):
+        """리뷰어 아이디목록에 추가(중복 제외, 기존 순서 유지) + 참여횟수 += 건수 (1 문장)"""
+        cur.execute(
+            """UPDATE reviewers r
+               SET store_ids = COALESCE(ids.joined, ''),
+                   participation = r.participation + %s, updated_at = NOW()
+               FROM (
+                   SELECT string_agg(x, ', ' ORDER BY first_ord) AS joined
+                   FROM (
+                       SELECT btrim(x) AS x, MIN(ord) AS first_ord
+                       FROM unnest(
+                           string_to_array(COALESCE((SELECT store_ids FROM reviewers WHERE id = %s), ''), ',')
+                           || %s::text[]
+                       ) WITH ORDINALITY AS t(x, ord)
+                       WHERE btrim(x) != ''
+                       GROUP BY btrim(x)
+                   ) d
+               ) ids
+               WHERE r.id = %s""",
+            (len(store_ids), reviewer_id, list(store_ids), reviewer_id)
+        )
 
     def _safe_int(self, v) -> int:
         try:
@@ -1180,54 +2832,20 @@ class DBManager:
             crows = self._fetchall(
                 "SELECT * FROM campaigns WHERE id = ANY(%s)", (campaign_ids,)
             )
-            campaign_map = {r["id"]: self._campaign_to_sheet_dict(r) for r in crows}
+            campaign_map = {r["id"]: self._campaign_sheet_dict_versioned(r) for r in crows}
 
         results = []
         for row in rows:
-            reviewer = reviewer_map.get(row.get("reviewer_id"), {})
-            campaign = campaign_map.get(row.get("campaign_id"), {})
-            results.append({
-                "_row_idx": row["id"],
-                "id": row["id"],
-                "캠페인ID": row.get("campaign_id", ""),
-                "업체명": campaign.get("업체명", "") if campaign else "",
-                "날짜": row["created_at"].astimezone(KST).strftime("%Y-%m-%d %H:%M") if row.get("created_at") else "",
-                "created_at_iso": row["created_at"].astimezone(KST).isoformat() if row.get("created_at") else "",
-                "제품명": (campaign.get("캠페인명", "") or campaign.get("상품명", "")) if campaign else "",
-                "수취인명": row.get("recipient_name", ""),
-                "연락처": row.get("phone", ""),
-                "은행": row.get("bank", ""),
-                "계좌": row.get("account", ""),
-                "예금주": row.get("depositor", ""),
-                "결제금액": str(row.get("payment_amount", 0) or ""),
-                "아이디": row.get("store_id", ""),
-                "주문번호": row.get("order_number", ""),
-                "주소": row.get("address", ""),
-                "닉네임": row.get("nickname", ""),
-                "진행자이름": reviewer.get("name", "") if reviewer else "",
-                "진행자연락처": reviewer.get("phone", "") if reviewer else "",
-                "카카오친구": reviewer.get("kakao_friend", False) if reviewer else False,
-                "상태": row.get("status", ""),
-                "구매일": str(row["purchase_date"]) if row.get("purchase_date") else "",
-                "구매캡쳐링크": row.get("purchase_capture_url", ""),
-                "리뷰기한": str(row["review_deadline"]) if row.get("review_deadline") else "",
-                "리뷰제출일": str(row["review_submit_date"]) if row.get("review_submit_date") else "",
-                "리뷰캡쳐링크": row.get("review_capture_url", ""),
-                "리뷰비": str(row.get("review_fee", 0) or ""),
-                "입금금액": str(row.get("payment_total", 0) or ""),
-                "입금정리": str(row["settlement_date"]) if row.get("settlement_date") else "",
-                "입금완료": str(row["settled_date"]) if row.get("settled_date") else "",
-                "회수여부": "Y" if row.get("is_collected") else "",
-                "비고": row.get("remark", ""),
-                "AI구매검수": row.get("ai_purchase_result", ""),
-                "AI구매사유": row.get("ai_purchase_reason", ""),
-                "AI리뷰검수": row.get("ai_review_result", ""),
-                "AI리뷰사유": row.get("ai_review_reason", ""),
-                "AI검수시간": row["ai_verified_at"].astimezone(KST).strftime("%Y-%m-%d %H:%M") if row.get("ai_verified_at") else "",
-                "AI관리자판정": row.get("ai_override", ""),
-                "사진세트": row.get("photo_set_number"),
-                "리뷰내용번호": row.get("review_text_number"),
-            })
+            reviewer = reviewer_map.get(row.get("reviewer_id")) or {}
+            campaign = campaign_map.get(row.get("campaign_id")) or {}
+            results.append(_progress_sheet_dict(
+                row,
+                campaign.get("업체명", ""),
+                campaign.get("캠페인명", "") or campaign.get("상품명", ""),
+                reviewer.get("name", ""),
+                reviewer.get("phone", ""),
+                reviewer.get("kakao_friend", False),
+            ))
         return results
 
     def _progress_to_sheet_dict(self, row: dict) -> dict:
@@ -1242,7 +2860,7 @@ class DBManager:
         if not reviewer:
             return []
         rows = self._fetchall(
-            "SELECT * FROM progress WHERE reviewer_id = %s ORDER BY created_at DESC",
+            "SELECT * FROM progress_all WHERE reviewer_id = %s ORDER BY created_at DESC",
             (reviewer["id"],)
         )
         return self._progress_rows_to_sheet_dicts(rows)
@@ -1322,7 +2940,7 @@ class DBManager:
         if not reviewer:
             return {}
         row = self._fetchone(
-            """SELECT recipient_name, phone, bank, account, depositor, address FROM progress
+            """SELECT recipient_name, phone, bank, account, depositor, address FROM progress_all
                WHERE reviewer_id = %s AND bank != '' ORDER BY created_at DESC LIMIT 1""",
             (reviewer["id"],)
         )
@@ -1343,7 +2961,7 @@ class DBManager:
             return []
         rows = self._fetchall(
             """SELECT DISTINCT ON (bank, account) bank, account, depositor
-               FROM progress
+               FROM progress_all
                WHERE reviewer_id = %s AND bank != '' AND account != ''
                ORDER BY bank, account, created_at DESC""",
             (reviewer["id"],)
@@ -1395,12 +3013,16 @@ class DBManager:
                     WHERE id = %s""",
                 (drive_link, drive_link, STATUS_REVIEW_DONE, progress_id)
             )
+        else:
+            return
+        self.notify_counters_changed()
 
     def update_status(self, progress_id: int, status: str):
         self._execute(
             "UPDATE progress SET status = %s, updated_at = NOW() WHERE id = %s",
             (status, progress_id)
         )
+        self.notify_counters_changed()
 
     def update_progress_field(self, progress_id: int, field: str, value):
         """progress 테이블의 단일 필드 업데이트"""
@@ -1430,6 +3052,8 @@ class DBManager:
                 f"UPDATE progress SET {db_col} = %s, updated_at = NOW() WHERE id = %s",
                 (value, progress_id)
             )
+        if db_col in ("status", "created_at"):
+            self.notify_counters_changed()
 
     def delete_progress(self, progress_id: int) -> bool:
         """progress 행 삭제"""
@@ -1437,7 +3061,9 @@ class DBManager:
             with conn.cursor() as cur:
                 cur.execute("DELETE FROM progress WHERE id = %s", (progress_id,))
                 ok = cur.rowcount > 0
-            conn.commit()
+            self._commit(conn)
+        if ok:
+            self.notify_counters_changed()
         return ok
 
     def approve_review(self, progress_id: int):
@@ -1455,6 +3081,7 @@ class DBManager:
                WHERE id = %s""",
             (STATUS_REVIEW_WAIT, remark, progress_id)
         )
+        self.notify_counters_changed()
 
     def restore_from_timeout(self, progress_id: int):
         """타임아웃취소 → 가이드전달로 복원"""
@@ -1470,12 +3097,99 @@ class DBManager:
                WHERE id = %s""",
             (STATUS_SETTLED, self._safe_int(amount), progress_id)
         )
+        self.notify_counters_changed()
 
     def get_row_dict(self, progress_id: int) -> dict:
         """progress ID로 시트 호환 dict 반환"""
         row = self._fetchone("SELECT * FROM progress WHERE id = %s", (progress_id,))
         return self._progress_to_sheet_dict(row) if row else {}
 
+    # ─────────── 일괄 처리 (관리자 다중 선택) ───────────
+    #
+    # 행마다 단건 메서드를 부르면 id 수만큼 왕복+커밋이 생긴다.
+    # 아래는 id 배열을 ANY(%s)로 넘겨 문장 1개로 처리하고, 실제 반영된 id를 RETURNING으로 돌려준다.
+
+    def bulk_get_rows(self, progress_ids) -> list[dict]:
+        """여러 progress를 시트 호환 dict로 조회 (요청한 id 순서 유지, 없는 id는 제외)"""
+        ids = _int_ids(progress_ids)
+        if not ids:
+            return []
+        rows = self._fetchall("SELECT * FROM progress WHERE id = ANY(%s)", (ids,))
+        by_id = {r["id"]: r for r in rows}
+        ordered = [by_id[i] for i in ids if i in by_id]
+        return self._progress_rows_to_sheet_dicts(ordered)
+
+    def bulk_update_status(self, progress_ids, status: str) -> list[int]:
+        """여러 progress 상태 일괄 변경. 변경된 id 목록 반환.
+
+        update_progress_field("상태")와 같이 신청/가이드전달 복원 시 created_at도 리셋.
+        """
+        ids = _int_ids(progress_ids)
+        if not ids:
+            return []
+        reset = ", created_at = NOW()" if status in (STATUS_APPLIED, STATUS_GUIDE_SENT) else ""
+        rows = self._execute_returning_all(
+            f"""UPDATE progress SET status = %s, updated_at = NOW(){reset}
+                WHERE id = ANY(%s) RETURNING id""",
+            (status, ids)
+        )
+        if rows:
+            self.notify_counters_changed()
+        return [r["id"] for r in rows]
+
+    def bulk_process_settlement(self, progress_ids) -> list[int]:
+        """여러 건 정산 처리 (입금금액은 각 행의 payment_total 유지). 처리된 id 목록 반환."""
+        ids = _int_ids(progress_ids)
+        if not ids:
+            return []
+        rows = self._execute_returning_all(
+            """UPDATE progress SET status = %s, payment_total = COALESCE(payment_total, 0),
+               settlement_date = (NOW() AT TIME ZONE 'Asia/Seoul')::date,
+               settled_date = (NOW() AT TIME ZONE 'Asia/Seoul')::date,
+               updated_at = NOW()
+               WHERE id = ANY(%s) RETURNING id""",
+            (STATUS_SETTLED, ids)
+        )
+        if rows:
+            self.notify_counters_changed()
+        return [r["id"] for r in rows]
+
+    def bulk_delete_progress(self, progress_ids) -> list[int]:
+        """여러 progress 행 삭제. 삭제된 id 목록 반환."""
+        ids = _int_ids(progress_ids)
+        if not ids:
+            return []
+        rows = self._execute_returning_all(
+            "DELETE FROM progress WHERE id = ANY(%s) RETURNING id", (ids,)
+        )
+        if rows:
+            self.notify_counters_changed()
+        return [r["id"] for r in rows]
+
+    def bulk_extend_timeout(self, progress_ids) -> list[dict]:
+        """여러 건 타임아웃 연장 (created_at 리셋).
+
+        인메모리 타이머 리셋용으로 [{id, name, phone}] 반환 (진행자 → 없으면 수취인 기준).
+        """
+        ids = _int_ids(progress_ids)
+        if not ids:
+            return []
+        rows = self._execute_returning_all(
+            """WITH upd AS (
+                   UPDATE progress SET created_at = NOW(), updated_at = NOW()
+                   WHERE id = ANY(%s)
+                   RETURNING id, reviewer_id, recipient_name, phone
+               )
+               SELECT upd.id,
+                      COALESCE(NULLIF(r.name, ''), upd.recipient_name, '') AS name,
+                      COALESCE(NULLIF(r.phone, ''), upd.phone, '') AS phone
+               FROM upd LEFT JOIN reviewers r ON r.id = upd.reviewer_id""",
+            (ids,)
+        )
+        if rows:
+            self.notify_counters_changed()   # created_at 리셋 → 일별 카운터 이동
+        return rows
+
     def get_all_reviewers(self) -> list[dict]:
         """전체 progress 목록 (시트 호환)"""
         rows = self._fetchall("SELECT * FROM progress ORDER BY created_at DESC")
@@ -1483,8 +3197,13 @@ class DBManager:
 
     def get_progress_page(self, page: int = 1, per_page: int = 50,
                           campaign_id: str = "", status: str = "",
-                          q: str = "") -> tuple[list, int]:
-        """progress 페이지네이션 (JOIN으로 N+1 제거). (items, total_count) 반환."""
+                          q: str = "", cursor: str = "", before: bool = False,
+                          count: str = "exact") -> tuple[list, int]:
+        """progress 페이지네이션 (JOIN으로 N+1 제거). (items, total_count) 반환.
+
+        cursor가 있으면 OFFSET 대신 keyset (created_at, id) 기준으로 다음/이전 페이지 조회.
+        count="estimate"면 총 건수는 플래너 추정치, "none"이면 None.
+        """
         conditions = []
         params = []
         if campaign_id:
@@ -1496,23 +3215,37 @@ class DBManager:
         else:
             conditions.append("p.status != '타임아웃취소'")
         if q:
-            conditions.append(
-                "(r.name ILIKE %s OR r.phone ILIKE %s"
-                " OR p.recipient_name ILIKE %s OR p.phone ILIKE %s"
-                " OR p.store_id ILIKE %s)"
-            )
-            like = f"%{q}%"
-            params.extend([like, like, like, like, like])
+            # 진행자(reviewers)는 먼저 id로 풀어서 progress 쪽 인덱스 OR 조건에 합침
+            cond, cond_params = _ilike_any(("p.recipient_name", "p.phone", "p.store_id"), q)
+            reviewer_ids = self.search_reviewer_ids(q)
+            if len(reviewer_ids) >= SEARCH_REVIEWER_LIMIT:
+                # 너무 많이 일치하면 JOIN 쪽 컬럼으로 직접 비교
+                r_cond, r_params = _ilike_any(("r.name", "r.phone"), q)
+                cond = cond[:-1] + " OR " + r_cond + ")"
+                cond_params.extend(r_params)
+            elif reviewer_ids:
+                cond = cond[:-1] + " OR p.reviewer_id = ANY(%s))"
+                cond_params.append(reviewer_ids)
+            conditions.append(cond)
+            params.extend(cond_params)
 
         where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
 
-        count_sql = f"""SELECT COUNT(*) AS cnt
-                        FROM progress p
-                        JOIN reviewers r ON p.reviewer_id = r.id
-                        {where}"""
-        total = self._fetchone(count_sql, tuple(params)).get("cnt", 0)
+        total = self._count_rows(
+            f"FROM progress p JOIN reviewers r ON p.reviewer_id = r.id {where}",
+            tuple(params), count,
+        )
 
-        offset = (page - 1) * per_page
+        key_cond, key_params, order, reverse = self._keyset_clause(
+            cursor, before, "p.created_at", "p.id", int)
+        if key_cond:
+            where = "WHERE " + " AND ".join(conditions + [key_cond])
+            params = params + key_params
+            limit_sql = "LIMIT %s"
+            limit_params = (per_page,)
+        else:
+            limit_sql = "LIMIT %s OFFSET %s"
+            limit_params = (per_page, (page - 1) * per_page)
         data_sql = f"""
             SELECT p.*,
                    r.name AS reviewer_name, r.phone AS reviewer_phone,
@@ -1524,64 +3257,33 @@ class DBManager:
             JOIN reviewers r ON p.reviewer_id = r.id
             LEFT JOIN campaigns c ON p.campaign_id = c.id
             {where}
-            ORDER BY p.created_at DESC
-            LIMIT %s OFFSET %s
+            ORDER BY {order}
+            {limit_sql}
         """
-        rows = self._fetchall(data_sql, tuple(params) + (per_page, offset))
+        rows = self._fetchall(data_sql, tuple(params) + limit_params)
+        if reverse:
+            rows.reverse()
 
         items = []
         for row in rows:
-            items.append({
-                "_row_idx": row["id"],
-                "id": row["id"],
-                "캠페인ID": row.get("campaign_id", ""),
-                "업체명": row.get("company", ""),
-                "날짜": row["created_at"].astimezone(KST).strftime("%Y-%m-%d %H:%M") if row.get("created_at") else "",
-                "created_at_iso": row["created_at"].astimezone(KST).isoformat() if row.get("created_at") else "",
-                "제품명": row.get("product_label", ""),
-                "캠페인명": row.get("campaign_name", ""),
-                "상품명": row.get("c_product_name", ""),
-                "수취인명": row.get("recipient_name", ""),
-                "연락처": row.get("phone", ""),
-                "은행": row.get("bank", ""),
-                "계좌": row.get("account", ""),
-                "예금주": row.get("depositor", ""),
-                "결제금액": str(row.get("payment_amount", 0) or ""),
-                "아이디": row.get("store_id", ""),
-                "주문번호": row.get("order_number", ""),
-                "주소": row.get("address", ""),
-                "닉네임": row.get("nickname", ""),
-                "진행자이름": row.get("reviewer_name", ""),
-                "진행자연락처": row.get("reviewer_phone", ""),
-                "카카오친구": row.get("kakao_friend", False),
-                "상태": row.get("status", ""),
-                "구매일": str(row["purchase_date"]) if row.get("purchase_date") else "",
-                "구매캡쳐링크": row.get("purchase_capture_url", ""),
-                "리뷰기한": str(row["review_deadline"]) if row.get("review_deadline") else "",
-                "리뷰제출일": str(row["review_submit_date"]) if row.get("review_submit_date") else "",
-                "리뷰캡쳐링크": row.get("review_capture_url", ""),
-                "리뷰비": str(row.get("review_fee", 0) or ""),
-                "입금금액": str(row.get("payment_total", 0) or ""),
-                "입금정리": str(row["settlement_date"]) if row.get("settlement_date") else "",
-                "입금완료": str(row["settled_date"]) if row.get("settled_date") else "",
-                "회수여부": "Y" if row.get("is_collected") else "",
-                "비고": row.get("remark", ""),
-                "AI구매검수": row.get("ai_purchase_result", ""),
-                "AI구매사유": row.get("ai_purchase_reason", ""),
-                "AI리뷰검수": row.get("ai_review_result", ""),
-                "AI리뷰사유": row.get("ai_review_reason", ""),
-                "AI검수시간": row["ai_verified_at"].astimezone(KST).strftime("%Y-%m-%d %H:%M") if row.get("ai_verified_at") else "",
-                "AI관리자판정": row.get("ai_override", ""),
-                "사진세트": row.get("photo_set_number"),
-                "리뷰내용번호": row.get("review_text_number"),
-                "buy_time": row.get("buy_time", ""),
-            })
+            item = _progress_sheet_dict(
+                row,
+                row.get("company", ""),
+                row.get("product_label", ""),
+                row.get("reviewer_name", ""),
+                row.get("reviewer_phone", ""),
+                row.get("kakao_friend", False),
+            )
+            item["캠페인명"] = row.get("campaign_name", "")
+            item["상품명"] = row.get("c_product_name", "")
+            item["buy_time"] = row.get("buy_time", "")
+            items.append(item)
         return items, total
 
     def check_duplicate(self, campaign_id: str, store_id: str) -> bool:
-        """같은 캠페인ID + 같은 아이디 중복 여부"""
+        """같은 캠페인ID + 같은 아이디 중복 여부 (아카이브된 입금완료 포함)"""
         row = self._fetchone(
-            """SELECT 1 FROM progress
+            """SELECT 1 FROM progress_all
                WHERE campaign_id = %s AND store_id = %s
                AND status NOT IN %s LIMIT 1""",
             (campaign_id, store_id, _DUP_IGNORE_STATUSES)
@@ -1603,33 +3305,11 @@ class DBManager:
         if not group:
             return None
 
-        days = camp.get("exclusive_days") or 0
-        if days > 0:
-            row = self._fetchone(
-                """SELECT c.campaign_name
-                   FROM progress p
-                   JOIN campaigns c ON p.campaign_id = c.id
-                   WHERE c.exclusive_group = %s
-                   AND p.campaign_id != %s
-                   AND p.store_id = %s
-                   AND p.status NOT IN %s
-                   AND p.created_at >= NOW() - (%s * INTERVAL '1 day')
-                   LIMIT 1""",
-                (group, campaign_id, store_id, _EXCLUSIVE_IGNORE_STATUSES, days),
-            )
-        else:
-            row = self._fetchone(
-                """SELECT c.campaign_name
-                   FROM progress p
-                   JOIN campaigns c ON p.campaign_id = c.id
-                   WHERE c.exclusive_group = %s
-                   AND p.campaign_id != %s
-                   AND p.store_id = %s
-                   AND p.status NOT IN %s
-                   LIMIT 1""",
-                (group, campaign_id, store_id, _EXCLUSIVE_IGNORE_STATUSES),
-            )
-        return row["campaign_name"] if row else None
+        with self._conn() as conn:
+            with conn.cursor() as cur:
+                _, conflicts = self._store_id_conflicts(
+                    cur, campaign_id, [store_id], group, camp.get("exclusive_days") or 0)
+        return conflicts.get(store_id)
 
     def cancel_by_timeout(self, name: str, phone: str, campaign_id: str, store_ids: list[str]):
         """타임아웃 취소: 해당 유저의 해당 캠페인 신청/가이드전달 → 타임아웃취소"""
@@ -1646,9 +3326,10 @@ class DBManager:
                      store_ids, STATUS_APPLIED, STATUS_GUIDE_SENT)
                 )
                 count = cur.rowcount
-            conn.commit()
+            self._commit(conn)
         if count:
             logger.info("타임아웃 취소 %d건: %s (캠페인=%s)", count, name, campaign_id)
+            self.notify_counters_changed(campaign_id)
         return count
 
     def check_repurchase(self, name: str, phone: str, campaign_id: str) -> list[dict]:
@@ -1695,7 +3376,7 @@ class DBManager:
             return []
 
         rows = self._fetchall(
-            """SELECT campaign_id, status FROM progress
+            """SELECT campaign_id, status FROM progress_all
                WHERE reviewer_id = %s AND campaign_id = ANY(%s)
                AND status NOT IN (%s, %s)""",
             (reviewer["id"], other_ids, STATUS_TIMEOUT, STATUS_CANCELLED)
@@ -1720,7 +3401,7 @@ class DBManager:
                     (STATUS_TIMEOUT, STATUS_CANCELLED, cutoff)
                 )
                 count = cur.rowcount
-            conn.commit()
+            self._commit(conn)
         if count:
             logger.info("취소 행 삭제: %d건 (%d시간 초과)", count, hours)
         return count
@@ -1728,36 +3409,197 @@ class DBManager:
     def count_all_campaigns_detail(self) -> dict:
         """캠페인별 단계별 건수. {캠페인ID: {reserved, review_stage, payment_stage}}"""
         rows = self._fetchall(
-            """SELECT campaign_id,
-                  SUM(CASE WHEN status NOT IN (%s, %s) THEN 1 ELSE 0 END) AS reserved,
-                  SUM(CASE WHEN status IN ('리뷰대기','리뷰제출','입금대기','입금완료') THEN 1 ELSE 0 END) AS review_stage,
-                  SUM(CASE WHEN status IN ('입금대기','입금완료') THEN 1 ELSE 0 END) AS payment_stage
-               FROM progress GROUP BY campaign_id""",
-            (STATUS_TIMEOUT, STATUS_CANCELLED)
+            """SELECT campaign_id, reserved, review_stage,
+                      payment_wait + settled AS payment_stage
+               FROM campaign_counters WHERE total_rows > 0"""
         )
         return {r["campaign_id"]: {
-            "reserved": r["reserved"] or 0,
-            "review_stage": r["review_stage"] or 0,
-            "payment_stage": r["payment_stage"] or 0,
+            "reserved": r["reserved"],
+            "review_stage": r["review_stage"],
+            "payment_stage": r["payment_stage"],
         } for r in rows}
 
     def count_all_campaigns(self) -> dict:
         """하위호환: 캠페인별 구매완료 건수 ({캠페인ID: count})"""
         rows = self._fetchall(
-            """SELECT campaign_id, COUNT(*) as cnt FROM progress
-               WHERE status = ANY(%s) GROUP BY campaign_id""",
-            (list(_DONE_STATUSES),)
+            "SELECT campaign_id, purchase_done FROM campaign_counters WHERE purchase_done > 0"
         )
-        return {r["campaign_id"]: r["cnt"] for r in rows}
+        return {r["campaign_id"]: r["purchase_done"] for r in rows}
 
     def count_reserved_campaign(self, campaign_id: str) -> int:
         """특정 캠페인의 진행중 슬롯 수 (취소 제외 전체)"""
         row = self._fetchone(
-            """SELECT COUNT(*) as cnt FROM progress
-               WHERE campaign_id = %s AND status NOT IN (%s, %s)""",
-            (campaign_id, STATUS_TIMEOUT, STATUS_CANCELLED)
+            "SELECT reserved FROM campaign_counters WHERE campaign_id = %s",
+            (campaign_id,)
         )
-        return row["cnt"] if row else 0
+        return row["reserved"] if row else 0
+
+    def reconcile_campaign_counters(self) -> int:
+        """카운터 드리프트 보정. 작업 단위 밖에서 호출 (배치마다 바로 커밋).
+
+        1) 잠금 없이 progress_all 집계와 비교해 어긋난 캠페인만 찾고
+        2) 그 캠페인의 카운터 행만 짧은 트랜잭션에서 잠근 뒤 다시 집계해 덮어쓴다.
+        잠금 전에 카운터를 건드린 쓰기는 커밋을 기다린 뒤 집계에 포함되고, 잠금 이후의
+        쓰기는 트리거가 잠금 해제를 기다렸다가 보정값 위에 반영하므로 누락/중복이 없다.
+        다른 캠페인의 신청/상태 변경은 막지 않는다.
+        Returns: 보정된 캠페인 수
+        """
+        agg_cols = ", ".join(f"a.{c}" for c in _COUNTER_COLUMNS)
+        cur_cols = ", ".join(f"c.{c}" for c in _COUNTER_COLUMNS)
+        all_agg = _COUNTERS_AGG_SQL.format(where="")
+        daily_agg = _DAILY_AGG_SQL.format(where="")
+        drifted = [r["campaign_id"] for r in self._fetchall(
+            f"""SELECT COALESCE(a.campaign_id, c.campaign_id) AS campaign_id
+                FROM ({all_agg}) a
+                FULL JOIN campaign_counters c ON c.campaign_id = a.campaign_id
+                WHERE ({agg_cols}) IS DISTINCT FROM ({cur_cols})
+                  AND NOT (a.campaign_id IS NULL AND c.total_rows = 0)""",
+            replica=False,
+        )]
+        for i in range(0, len(drifted), RECONCILE_BATCH_SIZE):
+            self._fix_campaign_counters(drifted[i:i + RECONCILE_BATCH_SIZE])
+
+        daily_drifted = sorted({r["campaign_id"] for r in self._fetchall(
+            f"""SELECT COALESCE(a.campaign_id, d.campaign_id) AS campaign_id
+                FROM ({daily_agg}) a
+                FULL JOIN (SELECT * FROM campaign_daily_counters
+                           WHERE day >= (NOW() AT TIME ZONE 'Asia/Seoul')::date - 1) d
+                  ON d.campaign_id = a.campaign_id AND d.day = a.day
+                WHERE a.reserved IS DISTINCT FROM d.reserved
+                  AND NOT (a.campaign_id IS NULL AND d.reserved = 0)""",
+            replica=False,
+        )})
+        for i in range(0, len(daily_drifted), RECONCILE_BATCH_SIZE):
+            self._fix_daily_counters(daily_drifted[i:i + RECONCILE_BATCH_SIZE])
+
+        # 보관기간 지난 일별 행은 더 이상 쓰이지 않음 → 잠금 없이 삭제
+        self._execute(
+            """DELETE FROM campaign_daily_counters
+               WHERE day < (NOW() AT TIME ZONE 'Asia/Seoul')::date - %s""",
+            (DAILY_COUNTER_RETENTION_DAYS,)
+        )
+
+        if drifted or daily_drifted:
+            logger.warning("캠페인 카운터 드리프트 보정: 누적 %d개 / 일별 %d개 캠페인",
+                           len(drifted), len(daily_drifted))
+        return len(drifted)
+
+    def _fix_campaign_counters(self, campaign_ids: list[str]):
+        """캠페인 카운터 행만 잠그고 재집계로 덮어쓰기 (짧은 트랜잭션 1개)"""
+        assign = ", ".join(f"{c} = COALESCE(a.{c}, 0)" for c in _COUNTER_COLUMNS)
+        agg = _COUNTERS_AGG_SQL.format(where="WHERE p.campaign_id = ANY(%s)")
+        with self._conn() as conn:
+            with conn.cursor() as cur:
+                # 행이 없던 캠페인도 잠글 수 있도록 빈 행부터 (삭제된 캠페인은 제외)
+                cur.execute(
+                    """INSERT INTO campaign_counters (campaign_id)
+                       SELECT id FROM campaigns WHERE id = ANY(%s)
+                       ON CONFLICT (campaign_id) DO NOTHING""",
+                    (campaign_ids,)
+                )
+                cur.execute(
+                    """SELECT 1 FROM campaign_counters WHERE campaign_id = ANY(%s)
+                       ORDER BY campaign_id FOR UPDATE""",
+                    (campaign_ids,)
+                )
+                # 잠금 획득 후 시작하는 문장 → 앞서 커밋된 쓰기까지 포함한 집계
+                cur.execute(
+                    f"""UPDATE campaign_counters c SET {assign}, updated_at = NOW()
+                        FROM unnest(%s::text[]) AS t(campaign_id)
+                        LEFT JOIN ({agg}) a ON a.campaign_id = t.campaign_id
+                        WHERE c.campaign_id = t.campaign_id""",
+                    (campaign_ids, campaign_ids)
+                )
+            self._commit(conn)
+
+    def _fix_daily_counters(self, campaign_ids: list[str]):
+        """최근 2일 일별 카운터를 캠페인 단위로 잠그고 재집계로 덮어쓰기"""
+        agg = _DAILY_AGG_SQL.format(where="AND p.campaign_id = ANY(%s)")
+        with self._conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """INSERT INTO campaign_daily_counters (campaign_id, day, reserved)
+                       SELECT c.id, d.day, 0
+                       FROM campaigns c
+                       CROSS JOIN (VALUES ((NOW() AT TIME ZONE 'Asia/Seoul')::date - 1),
+                                          ((NOW() AT TIME ZONE 'Asia/Seoul')::date)) AS d(day)
+                       WHERE c.id = ANY(%s)
+                       ON CONFLICT (campaign_id, day) DO NOTHING""",
+                    (campaign_ids,)
+                )
+                cur.execute(
+                    """SELECT 1 FROM campaign_daily_counters
+                       WHERE campaign_id = ANY(%s)
+                         AND day >= (NOW() AT TIME ZONE 'Asia/Seoul')::date - 1
+                       ORDER BY campaign_id, day FOR UPDATE""",
+                    (campaign_ids,)
+                )
+                cur.execute(
+                    f"""UPDATE campaign_daily_counters d SET reserved = COALESCE(a.reserved, 0)
+                        FROM campaign_daily_counters t
+                        LEFT JOIN ({agg}) a ON a.campaign_id = t.campaign_id AND a.day = t.day
+                        WHERE t.campaign_id = ANY(%s)
+                          AND t.day >= (NOW() AT TIME ZONE 'Asia/Seoul')::date - 1
+                          AND d.campaign_id = t.campaign_id AND d.day = t.day""",
+                    (campaign_ids, campaign_ids)
+                )
+            self._commit(conn)
+
+    # ──────── 진행건 아카이브 ────────
+
+    def _progress_column_list(self) -> str:
+        cols = getattr(self, "_progress_columns", None)
+        if cols is None:
+            rows = self._fetchall(
+                """SELECT column_name FROM information_schema.columns
+                   WHERE table_schema = current_schema() AND table_name = 'progress'
+                   ORDER BY ordinal_position"""
+            )
+            cols = self._progress_columns = ", ".join(f'"{r["column_name"]}"' for r in rows)
+        return cols
+
+    def archive_settled_progress(self, days: int = ARCHIVE_AFTER_DAYS,
+                                 batch_size: int = ARCHIVE_BATCH_SIZE,
+                                 max_batches: int = ARCHIVE_MAX_BATCHES) -> int:
+        """입금완료 후 days일 지났고 캠페인이 마감(또는 삭제)된 행을 progress_archive로 이동.
+
+        배치마다 따로 커밋 (작업 단위 밖에서 호출할 것). 이동분은 카운터 트리거에서 제외.
+        Returns: 이동한 행 수
+        """
+        cols = self._progress_column_list()
+        cutoff = (now_kst() - timedelta(days=days)).date()
+        total = 0
+        for _ in range(max_batches):
+            with self._conn() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT set_config('kabiseo.archiving', 'on', true)")
+                    cur.execute(
+                        f"""WITH moved AS (
+                                DELETE FROM progress WHERE id IN (
+                                    SELECT p.id FROM progress p
+                                    LEFT JOIN campaigns c ON c.id = p.campaign_id
+                                    WHERE p.status = %s
+                                      AND COALESCE(p.settled_date, p.updated_at::date) < %s
+                                      AND (c.id IS NULL OR c.status IN %s)
+                                    ORDER BY p.id
+                                    LIMIT %s
+                                    FOR UPDATE OF p SKIP LOCKED
+                                )
+                                RETURNING *
+                            )
+                            INSERT INTO progress_archive ({cols})
+                            SELECT {cols} FROM moved""",
+                        (STATUS_SETTLED, cutoff, _ARCHIVE_CLOSED_CAMPAIGN_STATUSES, batch_size)
+                    )
+                    moved = cur.rowcount
+                    cur.execute("SELECT set_config('kabiseo.archiving', 'off', true)")
+                self._commit(conn)
+            total += moved
+            if moved < batch_size:
+                break
+        if total:
+            logger.info("진행건 아카이브: %d건 이동 (입금완료 %d일 경과)", total, days)
+        return total
 
     # ──────── 문의 (inquiries) ────────
 
@@ -1765,7 +3607,7 @@ class DBManager:
                        message: str, context: str = "", is_urgent: bool = False) -> int:
         """문의 접수. 생성된 inquiry id 반환."""
         with self._conn() as conn:
-            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            with conn.cursor(cursor_factory=_TimedDictCursor) as cur:
                 cur.execute(
                     """INSERT INTO inquiries
                        (reviewer_id, reviewer_name, reviewer_phone, message, context, is_urgent)
@@ -1773,7 +3615,7 @@ class DBManager:
                     (reviewer_id, name, phone, message, context, is_urgent)
                 )
                 row = cur.fetchone()
-            conn.commit()
+            self._commit(conn)
         return row["id"] if row else 0
 
     def get_inquiries(self, status: str = None) -> list[dict]:
@@ -1804,7 +3646,7 @@ class DBManager:
                     (reply_text, inquiry_id)
                 )
                 ok = cur.rowcount > 0
-            conn.commit()
+            self._commit(conn)
         return ok
 
     def get_pending_inquiry_count(self) -> int:
@@ -1812,6 +3654,14 @@ class DBManager:
         row = self._fetchone("SELECT COUNT(*) as cnt FROM inquiries WHERE status = '대기'")
         return row["cnt"] if row else 0
 
+    def get_ai_check_requests(self) -> list[dict]:
+        """AI 구매/리뷰 검수가 확인요청인 progress (시트 호환 dict)"""
+        rows = self._fetchall(
+            """SELECT * FROM progress
+               WHERE ai_purchase_result = '확인요청' OR ai_review_result = '확인요청'"""
+        )
+        return self._progress_rows_to_sheet_dicts(rows)
+
     def get_pending_review_count(self) -> int:
         """AI 검수 확인요청 건수."""
         row = self._fetchone(
@@ -1843,13 +3693,10 @@ class DBManager:
     def count_today_all_campaigns(self) -> dict:
         """오늘 캠페인별 신청 건수 ({캠페인ID: count})"""
         rows = self._fetchall(
-            """SELECT campaign_id, COUNT(*) as cnt FROM progress
-               WHERE (created_at AT TIME ZONE 'Asia/Seoul')::date = (NOW() AT TIME ZONE 'Asia/Seoul')::date
-               AND status NOT IN (%s, %s)
-               GROUP BY campaign_id""",
-            (STATUS_TIMEOUT, STATUS_CANCELLED)
+            """SELECT campaign_id, reserved FROM campaign_daily_counters
+               WHERE day = (NOW() AT TIME ZONE 'Asia/Seoul')::date AND reserved > 0"""
         )
-        return {r["campaign_id"]: r["cnt"] for r in rows}
+        return {r["campaign_id"]: r["reserved"] for r in rows}
 
     def count_today_user_campaign(self, name: str, phone: str, campaign_id: str) -> int:
         """오늘 특정 유저의 특정 캠페인 신청 건수"""
@@ -1970,6 +3817,7 @@ class DBManager:
             (new_status, reviewer["id"], campaign_id, store_id,
              STATUS_TIMEOUT, STATUS_CANCELLED)
         )
+        self.notify_counters_changed(campaign_id)
 
     def update_form_data(self, name: str, phone: str, campaign_id: str,
                          store_id: str, form_data: dict, campaign: dict = None):
@@ -2023,7 +3871,7 @@ class DBManager:
         if not reviewer:
             return set()
         rows = self._fetchall(
-            "SELECT DISTINCT store_id FROM progress WHERE reviewer_id = %s AND store_id != ''",
+            "SELECT DISTINCT store_id FROM progress_all WHERE reviewer_id = %s AND store_id != ''",
             (reviewer["id"],)
         )
         return {r["store_id"] for r in rows}
@@ -2057,7 +3905,7 @@ class DBManager:
         if days > 0:
             rows = self._fetchall(
                 """SELECT DISTINCT p.store_id
-                   FROM progress p
+                   FROM progress_all p
                    JOIN campaigns c ON p.campaign_id = c.id
                    WHERE c.exclusive_group = %s
                    AND p.campaign_id != %s
@@ -2069,7 +3917,7 @@ class DBManager:
         else:
             rows = self._fetchall(
                 """SELECT DISTINCT p.store_id
-                   FROM progress p
+                   FROM progress_all p
                    JOIN campaigns c ON p.campaign_id = c.id
                    WHERE c.exclusive_group = %s
                    AND p.campaign_id != %s
@@ -2116,7 +3964,7 @@ class DBManager:
     def add_manager(self, name: str, phone: str, role: str = "담당자") -> int:
         """담당자 추가. 중복 시 무시. id 반환."""
         with self._conn() as conn:
-            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            with conn.cursor(cursor_factory=_TimedDictCursor) as cur:
                 cur.execute(
                     """INSERT INTO managers (name, phone, role)
                        VALUES (%s, %s, %s)
@@ -2125,7 +3973,7 @@ class DBManager:
                     (name, phone, role)
                 )
                 row = cur.fetchone()
-            conn.commit()
+            self._commit(conn)
         return row["id"] if row else 0
 
     def update_manager(self, manager_id: int, **kwargs):
@@ -2154,14 +4002,16 @@ class DBManager:
             "UPDATE campaigns SET status = %s, updated_at = NOW() WHERE id = %s",
             (status, campaign_id)
         )
+        self.invalidate_campaign(campaign_id)
 
     def delete_campaign(self, campaign_id: str) -> bool:
-        """캠페인 삭제. 연결된 progress의 campaign_id는 NULL로 설정됨 (ON DELETE SET NULL)."""
+        """캠페인 삭제. 연결된 progress/progress_archive의 campaign_id는 NULL로 설정됨 (ON DELETE SET NULL)."""
         with self._conn() as conn:
             with conn.cursor() as cur:
                 cur.execute("DELETE FROM campaigns WHERE id = %s", (campaign_id,))
                 ok = cur.rowcount > 0
-            conn.commit()
+            self._commit(conn)
+        self.invalidate_campaign(campaign_id)
         return ok
 
     # ──────── 대화이력 (chat_messages) ────────
@@ -2213,14 +4063,15 @@ class DBManager:
         )
 
     def search_chat_messages(self, keyword: str) -> list[dict]:
-        """대화 메시지 검색"""
+        """대화 메시지 검색 (message / reviewer_id trigram 인덱스)"""
+        cond, params = _ilike_any(("message", "reviewer_id"), keyword)
         return self._fetchall(
-            """SELECT reviewer_id, sender, message,
-                      EXTRACT(EPOCH FROM created_at) as timestamp
-               FROM chat_messages
-               WHERE message ILIKE %s OR reviewer_id ILIKE %s
-               ORDER BY created_at DESC LIMIT 200""",
-            (f"%{keyword}%", f"%{keyword}%")
+            f"""SELECT reviewer_id, sender, message,
+                       EXTRACT(EPOCH FROM created_at) as timestamp
+                FROM chat_messages
+                WHERE {cond}
+                ORDER BY created_at DESC LIMIT 200""",
+            tuple(params)
         )
 
     def rate_chat_message(self, reviewer_id: str, timestamp: float, rating: str) -> bool:
@@ -2238,21 +4089,115 @@ class DBManager:
                     (rating, reviewer_id, timestamp)
                 )
                 ok = cur.rowcount > 0
-            conn.commit()
+            self._commit(conn)
         return ok
 
+    def maintain_chat_partitions(self, months_ahead: int = CHAT_PARTITION_MONTHS_AHEAD) -> int:
+        """이번 달 ~ months_ahead개월 뒤 파티션이 없으면 생성. 생성 시도한 개수 반환."""
+        this_month = now_kst().date().replace(day=1)
+        months = [_add_months(this_month, i) for i in range(months_ahead + 1)]
+        existing = self._chat_partitions()
+        missing = [m for m in months if m not in existing]
+        for m in missing:
+            try:
+                self._execute(_chat_partition_ddl(m))
+                logger.info("대화이력 파티션 생성: %s%s", _CHAT_PARTITION_PREFIX, f"{m:%Y%m}")
+            except Exception as e:
+                # default 파티션에 해당 월 행이 있으면 생성 불가 → 다음 주기에 재시도
+                logger.error("대화이력 파티션 생성 실패 (%s): %s", f"{m:%Y%m}", e)
+        return len(missing)
+
+    def _chat_partitions(self) -> dict:
+        """월 파티션 {해당 월 1일(date): 테이블명}"""
+        rows = self._fetchall(
+            """SELECT c.relname FROM pg_inherits i
+               JOIN pg_class c ON c.oid = i.inhrelid
+               WHERE i.inhparent = 'chat_messages'::regclass"""
+        )
+        result = {}
+        for r in rows:
+            month_start = _chat_partition_month(r["relname"])
+            if month_start is not None:
+                result[month_start] = r["relname"]
+        return result
+
     def cleanup_old_chat(self, days: int = 90) -> int:
-        """오래된 대화 삭제"""
+        """보관기간이 통째로 지난 월 파티션 분리 후 DROP (+ default 파티션의 오래된 행 삭제).
+
+        월 단위로 지우므로 실제 보관은 days ~ days+1개월.
+        삭제 행 수 반환 (파티션은 pg_class.reltuples 추정치 → 전체 COUNT 스캔 없음).
+        파티션 하나가 실패해도 나머지와 default 파티션 정리는 계속한다.
+        """
+        cutoff = (now_kst() - timedelta(days=days)).date()
+        # 지난 주기에 분리만 되고 DROP이 실패한 월 테이블도 포함
+        detached = self._fetchall(
+            """SELECT relname FROM pg_class
+               WHERE relkind = 'r' AND NOT relispartition AND relname LIKE %s""",
+            (_CHAT_PARTITION_PREFIX.replace("_", "\\_") + "%",)
+        )
+        months = dict(self._chat_partitions())
+        for r in detached:
+            month_start = _chat_partition_month(r["relname"])
+            if month_start is not None:
+                months.setdefault(month_start, r["relname"])
+        expired = [name for month_start, name in sorted(months.items())
+                   if _add_months(month_start, 1) <= cutoff]
+        count = 0
+        if expired:
+            with self._conn() as conn:
+                conn.autocommit = True   # 파티션별로 바로 커밋 → DETACH 잠금을 DROP까지 끌지 않음
+                try:
+                    with conn.cursor() as cur:
+                        for name in expired:
+                            try:
+                                cur.execute(
+                                    "SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+                                    (name,)
+                                )
+                                row = cur.fetchone()
+                                rows = row[0] if row else 0
+                                if not self._detach_chat_partition(cur, name):
+                                    continue
+                                cur.execute(f"DROP TABLE IF EXISTS {name}")
+                            except Exception as e:
+                                logger.error("대화이력 파티션 삭제 실패 (다음 주기에 재시도) %s: %s", name, e)
+                                continue
+                            count += rows
+                            logger.info("대화이력 파티션 삭제: %s (약 %d건)", name, rows)
+                finally:
+                    conn.autocommit = False
         with self._conn() as conn:
             with conn.cursor() as cur:
                 cur.execute(
-                    "DELETE FROM chat_messages WHERE created_at < NOW() - make_interval(days => %s)",
+                    f"DELETE FROM {_CHAT_DEFAULT_PARTITION} WHERE created_at < NOW() - make_interval(days => %s)",
                     (days,)
                 )
-                count = cur.rowcount
-            conn.commit()
+                count += cur.rowcount
+            self._commit(conn)
         return count
 
+    @staticmethod
+    def _detach_chat_partition(cur, name: str) -> bool:
+        """chat_messages에서 파티션 분리 (autocommit 커서). 분리됐으면 True.
+
+        일반 DETACH: chat_messages에 ACCESS EXCLUSIVE 잠금 (카탈로그 변경만이라 잡은 뒤엔 즉시 끝남).
+        default 파티션이 있으면 DETACH ... CONCURRENTLY는 PostgreSQL이 허용하지 않으므로,
+        대신 잠금 대기를 CHAT_DETACH_LOCK_TIMEOUT으로 제한 → 긴 조회 뒤에 채팅 쓰기가 줄 서지 않게 하고
+        못 잡으면 이번 주기는 건너뜀.
+        """
+        cur.execute("SELECT 1 FROM pg_inherits WHERE inhrelid = to_regclass(%s)", (name,))
+        if cur.fetchone() is None:
+            return True   # 이미 분리됨 (DROP만 남음)
+        cur.execute("SET lock_timeout = %s", (CHAT_DETACH_LOCK_TIMEOUT,))
+        try:
+            cur.execute(f"ALTER TABLE chat_messages DETACH PARTITION {name}")
+        except psycopg2.errors.LockNotAvailable:
+            logger.warning("대화이력 파티션 분리 잠금 대기 초과 (다음 주기에 재시도): %s", name)
+            return False
+        finally:
+            cur.execute("RESET lock_timeout")
+        return True
+
     # ─────────── suppliers (공급자 프리셋) ───────────
 
     def create_supplier(self, data: dict) -> int:
@@ -2370,10 +4315,11 @@ class DBManager:
 
     def add_campaign_photo(self, campaign_id: str, set_number: int, file_index: int,
                            drive_url: str, filename: str = ""):
+        # 사진 INSERT + 새 세트 번호 슬롯 추가를 한 문장 묶음으로
         self._execute(
             """INSERT INTO campaign_photos (campaign_id, set_number, file_index, drive_url, filename)
-               VALUES (%s, %s, %s, %s, %s)""",
-            (campaign_id, set_number, file_index, drive_url, filename),
+               VALUES (%s, %s, %s, %s, %s);""" + _asset_slot_fill_sql("photo", campaign_filter=True),
+            (campaign_id, set_number, file_index, drive_url, filename, campaign_id),
         )
 
     def get_campaign_photo_sets(self, campaign_id: str) -> dict:
@@ -2394,27 +4340,22 @@ class DBManager:
         return sets
 
     def delete_campaign_photos(self, campaign_id: str):
-        self._execute("DELETE FROM campaign_photos WHERE campaign_id = %s", (campaign_id,))
+        self._execute(
+            """DELETE FROM campaign_photos WHERE campaign_id = %s;
+               DELETE FROM campaign_asset_slots WHERE campaign_id = %s AND kind = 'photo'""",
+            (campaign_id, campaign_id),
+        )
 
     def delete_campaign_photo_by_id(self, photo_id: int):
-        self._execute("DELETE FROM campaign_photos WHERE id = %s", (photo_id,))
+        campaign_id = self._execute_returning(
+            "DELETE FROM campaign_photos WHERE id = %s RETURNING campaign_id", (photo_id,))
+        if campaign_id:
+            self._sync_asset_slots(campaign_id, "photo")
 
     def get_next_photo_set_number(self, campaign_id: str) -> int | None:
-        """미할당된 가장 작은 세트 번호 반환. 없으면 None."""
-        row = self._fetchone(
-            """SELECT cp.set_number FROM campaign_photos cp
-               WHERE cp.campaign_id = %s
-               AND cp.set_number NOT IN (
-                   SELECT DISTINCT photo_set_number FROM progress
-                   WHERE campaign_id = %s AND photo_set_number IS NOT NULL
-                   AND status NOT IN ('타임아웃취소', '취소')
-               )
-               GROUP BY cp.set_number
-               ORDER BY cp.set_number
-               LIMIT 1""",
-            (campaign_id, campaign_id),
-        )
-        return row["set_number"] if row else None
+        """미할당된 가장 작은 세트 번호 반환 (조회만, 점유하지 않음). 없으면 None.
+        배분은 claim_asset_slots 사용."""
+        return self._next_free_asset(campaign_id, "photo")
 
     def assign_photo_set(self, progress_ids: list[int], set_number: int):
         """progress 목록에 사진 세트 번호 할당"""
@@ -2475,8 +4416,8 @@ class DBManager:
     def add_campaign_review_text(self, campaign_id: str, text_number: int, review_text: str):
         self._execute(
             """INSERT INTO campaign_review_texts (campaign_id, text_number, review_text)
-               VALUES (%s, %s, %s)""",
-            (campaign_id, text_number, review_text),
+               VALUES (%s, %s, %s);""" + _asset_slot_fill_sql("text", campaign_filter=True),
+            (campaign_id, text_number, review_text, campaign_id),
         )
 
     def get_campaign_review_texts(self, campaign_id: str) -> dict:
@@ -2488,23 +4429,16 @@ class DBManager:
         return {r["text_number"]: r["review_text"] for r in rows}
 
     def delete_campaign_review_texts(self, campaign_id: str):
-        self._execute("DELETE FROM campaign_review_texts WHERE campaign_id = %s", (campaign_id,))
-
-    def get_next_review_text_number(self, campaign_id: str) -> int | None:
-        """미할당된 가장 작은 리뷰내용 번호 반환. 없으면 None."""
-        row = self._fetchone(
-            """SELECT crt.text_number FROM campaign_review_texts crt
-               WHERE crt.campaign_id = %s
-               AND crt.text_number NOT IN (
-                   SELECT DISTINCT review_text_number FROM progress
-                   WHERE campaign_id = %s AND review_text_number IS NOT NULL
-                   AND status NOT IN ('타임아웃취소', '취소')
-               )
-               ORDER BY crt.text_number
-               LIMIT 1""",
+        self._execute(
+            """DELETE FROM campaign_review_texts WHERE campaign_id = %s;
+               DELETE FROM campaign_asset_slots WHERE campaign_id = %s AND kind = 'text'""",
             (campaign_id, campaign_id),
         )
-        return row["text_number"] if row else None
+
+    def get_next_review_text_number(self, campaign_id: str) -> int | None:
+        """미할당된 가장 작은 리뷰내용 번호 반환 (조회만, 점유하지 않음). 없으면 None.
+        배분은 claim_asset_slots 사용."""
+        return self._next_free_asset(campaign_id, "text")
 
     def assign_review_text(self, progress_ids: list[int], text_number: int):
         """progress 목록에 리뷰내용 번호 할당"""
@@ -2548,6 +4482,108 @@ class DBManager:
             assigned[r["review_text_number"]] = {"name": r["name"], "phone": r["phone"]}
         return {tn: assigned.get(tn) for tn in review_texts}
 
+    # ─────────── 사진세트/리뷰내용 배분 슬롯 ───────────
+
+    def claim_asset_slots(self, campaign_id: str, kind: str, progress_ids,
+                          preferred: dict | None = None) -> dict:
+        """빈 사진세트(kind="photo")/리뷰내용(kind="text") 번호를 진행건들에 배분.
+
+        빈 슬롯을 FOR UPDATE SKIP LOCKED로 잡으므로 동시 신청/관리자 배분끼리 같은 번호를
+        받지 않는다. progress_ids 순서대로 작은 번호부터 배분하고, preferred={progress_id: 번호}가
+        있으면 그 번호가 비어 있을 때 우선 (리뷰내용을 사진세트 번호에 맞출 때).
+        이미 번호가 있거나 취소된 진행건은 건너뛰고, 슬롯이 모자라면 앞쪽 진행건만 배분.
+
+        Returns: {progress_id: 번호}
+        """
+        progress_col = _ASSET_SOURCES[kind][2]
+        pids = list(dict.fromkeys(int(p) for p in progress_ids or []))
+        if not pids:
+            return {}
+        preferred = preferred or {}
+        claimed = {}
+        with self._short_transaction() as conn:
+            with conn.cursor() as cur:
+                # 진행건 잠금 → 같은 진행건을 두 배분이 동시에 채우지 않음
+                cur.execute(
+                    f"""SELECT id FROM progress
+                        WHERE id = ANY(%s) AND {progress_col} IS NULL
+                        AND status NOT IN (%s, %s)
+                        FOR UPDATE""",
+                    (pids, STATUS_TIMEOUT, STATUS_CANCELLED)
+                )
+                eligible = {r[0] for r in cur.fetchall()}
+                pids = [p for p in pids if p in eligible]
+                if not pids:
+                    return {}
+
+                wanted = list({preferred[p] for p in pids if preferred.get(p) is not None})
+                if wanted:
+                    cur.execute(
+                        """SELECT number FROM campaign_asset_slots
+                           WHERE campaign_id = %s AND kind = %s AND progress_id IS NULL
+                           AND number = ANY(%s)
+                           FOR UPDATE SKIP LOCKED""",
+                        (campaign_id, kind, wanted)
+                    )
+                    free = {r[0] for r in cur.fetchall()}
+                    for pid in pids:
+                        number = preferred.get(pid)
+                        if number in free:
+                            claimed[pid] = number
+                            free.discard(number)
+
+                rest = [p for p in pids if p not in claimed]
+                if rest:
+                    # 자기 트랜잭션이 잠근 행은 SKIP LOCKED로 걸러지지 않으므로 직접 제외
+                    cur.execute(
+                        """SELECT number FROM campaign_asset_slots
+                           WHERE campaign_id = %s AND kind = %s AND progress_id IS NULL
+                           AND NOT (number = ANY(%s))
+                           ORDER BY number
+                           LIMIT %s
+                           FOR UPDATE SKIP LOCKED""",
+                        (campaign_id, kind, list(claimed.values()), len(rest))
+                    )
+                    claimed.update(zip(rest, (r[0] for r in cur.fetchall())))
+
+                if claimed:
+                    pid_list, numbers = list(claimed), list(claimed.values())
+                    cur.execute(
+                        """UPDATE campaign_asset_slots s
+                           SET progress_id = v.pid, claimed_at = NOW()
+                           FROM unnest(%s::int[], %s::int[]) AS v(pid, number)
+                           WHERE s.campaign_id = %s AND s.kind = %s AND s.number = v.number""",
+                        (pid_list, numbers, campaign_id, kind)
+                    )
+                    cur.execute(
+                        f"""UPDATE progress p SET {progress_col} = v.number
+                            FROM unnest(%s::int[], %s::int[]) AS v(pid, number)
+                            WHERE p.id = v.pid""",
+                        (pid_list, numbers)
+                    )
+        return claimed
+
+    def _next_free_asset(self, campaign_id: str, kind: str) -> int | None:
+        row = self._fetchone(
+            """SELECT number FROM campaign_asset_slots
+               WHERE campaign_id = %s AND kind = %s AND progress_id IS NULL
+               ORDER BY number LIMIT 1""",
+            (campaign_id, kind),
+        )
+        return row["number"] if row else None
+
+    def _sync_asset_slots(self, campaign_id: str, kind: str):
+        """원본(사진/리뷰내용) 변경 후 슬롯 맞추기: 없어진 번호 삭제 + 새 번호 추가"""
+        table, number_col, _ = _ASSET_SOURCES[kind]
+        self._execute(
+            f"""DELETE FROM campaign_asset_slots s
+                WHERE s.campaign_id = %s AND s.kind = %s
+                AND NOT EXISTS (SELECT 1 FROM {table} t
+                                WHERE t.campaign_id = s.campaign_id AND t.{number_col} = s.number);"""
+            + _asset_slot_fill_sql(kind, campaign_filter=True),
+            (campaign_id, kind, campaign_id),
+        )
+
     # ─────────── Drive 업로드 큐 ───────────
 
     def enqueue_drive_upload(self, progress_id: int, capture_type: str,
@@ -2565,7 +4601,7 @@ class DBManager:
     def claim_next_upload(self) -> dict | None:
         """큐에서 다음 pending 작업을 가져오고 processing으로 변경"""
         with self._conn() as conn:
-            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            with conn.cursor(cursor_factory=_TimedDictCursor) as cur:
                 cur.execute("""
                     UPDATE drive_upload_queue
                     SET status = 'processing', attempt_count = attempt_count + 1
@@ -2579,7 +4615,7 @@ class DBManager:
                     RETURNING *
                 """)
                 row = cur.fetchone()
-            conn.commit()
+            self._commit(conn)
             return dict(row) if row else None
 
     def complete_upload(self, queue_id: int):
@@ -2769,7 +4805,7 @@ class DBManager:
                       contact_name: str = "", contact_phone: str = "",
                       contact_email: str = "", memo: str = "", agency_id: int = None) -> int:
         with self._conn() as conn:
-            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            with conn.cursor(cursor_factory=_TimedDictCursor) as cur:
                 cur.execute(
                     """INSERT INTO clients (login_id, password_hash, company_name,
                                            contact_name, contact_phone, contact_email, memo, agency_id)
@@ -2777,7 +4813,7 @@ class DBManager:
                     (login_id, password_hash, company_name, contact_name, contact_phone, contact_email, memo, agency_id)
                 )
                 row = cur.fetchone()
-            conn.commit()
+            self._commit(conn)
         return row["id"] if row else 0
 
     def get_client_by_login(self, login_id: str) -> dict:
@@ -2847,7 +4883,7 @@ class DBManager:
                       contact_name: str = "", contact_phone: str = "",
                       contact_email: str = "", memo: str = "") -> int:
         with self._conn() as conn:
-            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            with conn.cursor(cursor_factory=_TimedDictCursor) as cur:
                 cur.execute(
                     """INSERT INTO agencies (login_id, password_hash, company_name,
                                            contact_name, contact_phone, contact_email, memo)
@@ -2855,7 +4891,7 @@ class DBManager:
                     (login_id, password_hash, company_name, contact_name, contact_phone, contact_email, memo)
                 )
                 row = cur.fetchone()
-            conn.commit()
+            self._commit(conn)
         return row["id"] if row else 0
 
     def get_agency_by_login(self, login_id: str) -> dict:
@@ -2893,14 +4929,14 @@ class DBManager:
 
     def create_admin(self, login_id: str, password_hash: str, name: str = "") -> int:
         with self._conn() as conn:
-            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            with conn.cursor(cursor_factory=_TimedDictCursor) as cur:
                 cur.execute(
                     """INSERT INTO admins (login_id, password_hash, name)
                        VALUES (%s, %s, %s) RETURNING id""",
                     (login_id, password_hash, name)
                 )
                 row = cur.fetchone()
-            conn.commit()
+            self._commit(conn)
         return row["id"] if row else 0
 
     def get_admin_by_login(self, login_id: str) -> dict:
@@ -3016,6 +5052,7 @@ class DBManager:
         if not row or row["status"] != "임시저장":
             return False
         self._execute("DELETE FROM campaigns WHERE id = %s AND status = '임시저장'", (campaign_id,))
+        self.invalidate_campaign(campaign_id)
         return True
 
     # ─────────── 기존리뷰어 모집 ───────────
@@ -0,0 +1,37 @@
+"""
+http_cache.py - 조건부 GET (ETag / 304) 헬퍼
+
+폴링이 잦은 캠페인 API용. ETag는 응답 본문이 아니라 본문을 결정하는
+버전 값(카탈로그/카운터 버전, 구매가능시간 상태 등)으로 만들어서,
+일치하면 응답을 만들거나 직렬화하지 않고 바로 304를 돌려준다.
+"""
+
+import hashlib
+
+from flask import request, jsonify, Response
+
+CACHE_PUBLIC = "public, max-age=5"     # 익명(개인화 없음) 응답
+CACHE_PRIVATE = "private, no-cache"    # 개인화 응답: 저장은 브라우저만, 매번 재검증
+
+
+def make_etag(*parts) -> str:
+    raw = "|".join(str(p) for p in parts)
+    return hashlib.sha1(raw.encode()).hexdigest()[:20]
+
+
+def not_modified(etag: str, cache_control: str) -> Response | None:
+    """If-None-Match가 etag와 일치하면 304 응답, 아니면 None"""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    resp = Response(status=304)
+    resp.set_etag(etag, weak=True)
+    resp.headers["Cache-Control"] = cache_control
+    return resp
+
+
+def etag_json(data, etag: str, cache_control: str) -> Response:
+    """jsonify + ETag/Cache-Control 헤더"""
+    resp = jsonify(data)
+    resp.set_etag(etag, weak=True)
+    resp.headers["Cache-Control"] = cache_control
+    return resp
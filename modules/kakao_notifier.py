@@ -29,7 +29,10 @@ class KakaoNotifier:
 
     def _get_progress_info(self, progress_id: int) -> dict:
         """progress 행에서 발송에 필요한 정보 추출"""
-        row = self.db.get_row_dict(progress_id)
+        return self._progress_info(self.db.get_row_dict(progress_id))
+
+    @staticmethod
+    def _progress_info(row: dict) -> dict:
         if not row:
             return {}
         return {
@@ -123,7 +126,20 @@ class KakaoNotifier:
 
     def send_reminder(self, progress_id: int, custom_message: str = "") -> bool:
         """관리자 수동 독촉 — 상태별 기본 메시지 + 링크"""
-        info = self._get_progress_info(progress_id)
+        return self._send_reminder(self._get_progress_info(progress_id), custom_message)
+
+    def send_reminders(self, progress_ids, custom_message: str = "") -> int:
+        """관리자 일괄 독촉 — progress는 한 번에 조회. 발송 성공 건수 반환"""
+        sent = 0
+        for row in self.db.bulk_get_rows(progress_ids):
+            try:
+                if self._send_reminder(self._progress_info(row), custom_message):
+                    sent += 1
+            except Exception as e:
+                logger.warning("일괄 독촉 발송 실패 (id %s): %s", row.get("id"), e)
+        return sent
+
+    def _send_reminder(self, info: dict, custom_message: str) -> bool:
         if not info.get("name") or not info.get("phone"):
             return False
 
@@ -261,6 +277,8 @@ class KakaoNotifier:
                 "UPDATE progress SET last_reminder_date = %s WHERE id = ANY(%s)",
                 (today, all_ids)
             )
+            # 발송 기록은 바로 커밋 (작업 단위가 나중에 롤백/중단돼도 재발송 안 함)
+            self.db.flush_unit_of_work()
             if ok:
                 sent += 1
 
@@ -0,0 +1,155 @@
+"""
+query_stats.py - DB 쿼리 계측 집계기
+
+쿼리 1건마다 (범위, 메서드, 소요시간, 행 수)를 받아 누적한다.
+  범위   = Flask 엔드포인트 또는 백그라운드 작업 이름 (작업 단위 label)
+  메서드 = 쿼리를 실행한 DBManager 메서드 이름
+
+프로세스 단위 인메모리 집계 (재시작 시 초기화). 관리자 API에서 top-N 조회.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = int(os.environ.get("DB_SLOW_QUERY_MS", "500"))   # 0이면 느린 쿼리 로그 끔
+SAMPLE_SIZE = 200   # p95 계산용 (범위, 메서드)별 최근 소요시간 샘플 수
+SQL_PREVIEW_LEN = 300
+
+
+class _Stat:
+    __slots__ = ("count", "total_ms", "max_ms", "rows", "errors", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.errors = 0
+        self.samples = deque(maxlen=SAMPLE_SIZE)
+
+
+def _p95(samples) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+class QueryStats:
+    """(범위, 메서드)별 쿼리 시간/행 수 누적 + 느린 쿼리 로그"""
+
+    def __init__(self, slow_ms: int = SLOW_QUERY_MS):
+        self.slow_ms = slow_ms
+        self._stats = {}   # (scope, method) → _Stat
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.since = time.time()
+
+    # ─────────── 범위 (작업 단위) ───────────
+
+    def set_scope(self, scope: str):
+        self._local.scope = scope
+
+    def clear_scope(self):
+        self._local.scope = None
+
+    def current_scope(self) -> str:
+        scope = getattr(self._local, "scope", None)
+        if scope:
+            return scope
+        # 작업 단위 밖: 이름 붙은 백그라운드 스레드는 스레드 이름, 나머지는 묶어서 집계
+        name = threading.current_thread().name
+        if name.startswith(("Thread-", "Dummy-", "GreenThread")):
+            return "(no-scope)"
+        return name
+
+    # ─────────── 기록 ───────────
+
+    def record(self, method: str, elapsed_ms: float, rows: int, sql=None, error: bool = False):
+        scope = self.current_scope()
+        key = (scope, method)
+        with self._lock:
+            st = self._stats.get(key)
+            if st is None:
+                st = self._stats[key] = _Stat()
+            st.count += 1
+            st.total_ms += elapsed_ms
+            if elapsed_ms > st.max_ms:
+                st.max_ms = elapsed_ms
+            if rows > 0:
+                st.rows += rows
+            if error:
+                st.errors += 1
+            st.samples.append(elapsed_ms)
+        if self.slow_ms and elapsed_ms >= self.slow_ms:
+            preview = " ".join(str(sql or "").split())[:SQL_PREVIEW_LEN]
+            logger.warning("느린 쿼리 %.0fms [%s] %s rows=%d: %s",
+                           elapsed_ms, scope, method, max(rows, 0), preview)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self.since = time.time()
+
+    # ─────────── 조회 ───────────
+
+    def top(self, n: int = 20, sort: str = "total", group: str = "method") -> list[dict]:
+        """상위 n개 집계
+
+        group: "method"(메서드별), "scope"(엔드포인트/작업별), "scope_method"(조합별)
+        sort: "total" | "p95" | "count" | "max"
+        """
+        with self._lock:
+            items = [(k, st.count, st.total_ms, st.max_ms, st.rows, st.errors, list(st.samples))
+                     for k, st in self._stats.items()]
+
+        merged = {}
+        for (scope, method), count, total, mx, rows, errors, samples in items:
+            if group == "scope":
+                key = (scope,)
+            elif group == "scope_method":
+                key = (scope, method)
+            else:
+                key = (method,)
+            m = merged.get(key)
+            if m is None:
+                m = merged[key] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                   "rows": 0, "errors": 0, "samples": []}
+            m["count"] += count
+            m["total_ms"] += total
+            m["max_ms"] = max(m["max_ms"], mx)
+            m["rows"] += rows
+            m["errors"] += errors
+            m["samples"].extend(samples)
+
+        result = []
+        for key, m in merged.items():
+            entry = {}
+            if group == "scope":
+                entry["scope"] = key[0]
+            elif group == "scope_method":
+                entry["scope"], entry["method"] = key
+            else:
+                entry["method"] = key[0]
+            entry.update({
+                "count": m["count"],
+                "total_ms": round(m["total_ms"], 1),
+                "avg_ms": round(m["total_ms"] / m["count"], 2) if m["count"] else 0.0,
+                "p95_ms": round(_p95(m["samples"]), 2),
+                "max_ms": round(m["max_ms"], 1),
+                "rows": m["rows"],
+                "errors": m["errors"],
+            })
+            result.append(entry)
+
+        sort_key = {"p95": "p95_ms", "count": "count", "max": "max_ms"}.get(sort, "total_ms")
+        result.sort(key=lambda e: e[sort_key], reverse=True)
+        return result[:n]
+
+
+query_stats = QueryStats()   # 프로세스 전역
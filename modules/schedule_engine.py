@@ -0,0 +1,110 @@
+"""
+schedule_engine.py - 캠페인 일일 모집 일정
+
+일정(daily_schedule) / 시작일 / 일수량을 캠페인 버전당 한 번만 파싱해서
+(시작일 서수, 일자별 목표 튜플, 일수량 폴백)으로 만들어 두고,
+오늘 목표 / 오늘 잔여 / 시작 전 여부는 날짜 차이 인덱싱만으로 답한다.
+
+캐시 키는 (캠페인ID, updated_at) — 캠페인 수정 시 updated_at이 바뀌므로 자동 갱신.
+updated_at이 없는 dict(미리보기 등)는 필드 값 자체를 키로 쓴다.
+"""
+
+import re
+from datetime import datetime
+
+from modules.ttl_cache import TTLCache
+from modules.utils import now_kst, safe_int
+
+SCHEDULE_CACHE_SIZE = 2048
+SCHEDULE_CACHE_TTL = 3600   # 1시간 (버전 키라 만료는 메모리 정리용)
+
+_RANGE_RE = re.compile(r"(\d+)\s*[-~]\s*(\d+)")
+
+_cache = TTLCache(SCHEDULE_CACHE_SIZE, SCHEDULE_CACHE_TTL)
+
+
+class DailySchedule:
+    """컴파일된 일일 일정 (불변)"""
+
+    __slots__ = ("start_date", "start_ordinal", "days", "fallback")
+
+    def __init__(self, start_date, days: tuple, fallback: int):
+        self.start_date = start_date            # date 또는 None
+        self.start_ordinal = start_date.toordinal() if start_date else None
+        self.days = days                        # 일자별 목표 (시작일 = 0번)
+        self.fallback = fallback                # 일수량 최대값 (범위면 큰 값)
+
+    def day_index(self, today=None) -> int | None:
+        """시작일 기준 오늘 일차 (0-based). 시작일 없으면 None"""
+        if self.start_ordinal is None:
+            return None
+        today = today or now_kst().date()
+        return today.toordinal() - self.start_ordinal
+
+    def target(self, today=None) -> int:
+        """오늘 목표 수량 (0 = 일일 제한 없음).
+
+        일정 기간 중이면 해당 일차 목표, 일정이 끝났으면 0,
+        일정/시작일이 없거나 시작 전이면 일수량.
+        """
+        if self.days:
+            idx = self.day_index(today)
+            if idx is not None and idx >= 0:
+                return self.days[idx] if idx < len(self.days) else 0
+        return self.fallback
+
+    def display_target(self, today=None) -> int:
+        """관리자 목록 표시용: 일정상 목표가 0(종료/휴무)이면 일수량을 보여준다."""
+        return self.target(today) or self.fallback
+
+    def remaining(self, today_done: int, today=None) -> int:
+        """오늘 잔여 슬롯. 일일 제한 없으면 -1"""
+        target = self.target(today)
+        if target <= 0:
+            return -1
+        return max(0, target - today_done)
+
+    def not_started(self, today=None) -> bool:
+        idx = self.day_index(today)
+        return idx is not None and idx < 0
+
+
+def compile_schedule(campaign: dict) -> DailySchedule:
+    """캠페인 시트 dict → DailySchedule (캐시 없이 파싱)"""
+    start_date = None
+    start_str = (campaign.get("시작일") or "").strip()
+    if start_str:
+        try:
+            start_date = datetime.strptime(start_str, "%Y-%m-%d").date()
+        except ValueError:
+            pass
+
+    schedule = campaign.get("일정") or []
+    days = tuple(safe_int(v) for v in schedule) if isinstance(schedule, list) else ()
+    if start_date is None:
+        days = ()   # 시작일 없으면 일정은 적용 불가 → 일수량 폴백
+
+    fallback = 0
+    daily_str = (campaign.get("일수량") or "").strip()
+    if daily_str:
+        m = _RANGE_RE.match(daily_str)
+        fallback = safe_int(m.group(2)) if m else safe_int(daily_str)
+
+    return DailySchedule(start_date, days, fallback)
+
+
+def schedule_for(campaign: dict) -> DailySchedule:
+    """캠페인 버전별 캐시된 DailySchedule"""
+    campaign_id = campaign.get("캠페인ID") or campaign.get("id")
+    version = campaign.get("updated_at")
+    if campaign_id and version:
+        key = (campaign_id, version)
+    else:
+        schedule = campaign.get("일정") or []
+        key = (campaign.get("시작일") or "", campaign.get("일수량") or "",
+               tuple(schedule) if isinstance(schedule, list) else ())
+    compiled = _cache.get(key)
+    if compiled is None:
+        compiled = compile_schedule(campaign)
+        _cache.set(key, compiled)
+    return compiled
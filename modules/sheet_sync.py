@@ -30,8 +30,8 @@ SHEET_HEADERS = [
 _NUM_COLS = len(SHEET_HEADERS)  # 24
 _LAST_COL = "X"
 
-# progress + campaign + reviewer JOIN 쿼리
-_SYNC_SQL = """
+# progress + campaign + reviewer JOIN 쿼리 ({table}: 전체는 아카이브 포함 progress_all)
+_SYNC_SQL_TEMPLATE = """
     SELECT
         p.id,
         c.company,
@@ -56,19 +56,21 @@ _SYNC_SQL = """
         p.purchase_capture_url,
         p.review_capture_url,
         p.updated_at
-    FROM progress p
+    FROM {table} p
     LEFT JOIN campaigns c ON p.campaign_id = c.id
     LEFT JOIN reviewers r ON p.reviewer_id = r.id
     ORDER BY p.id
 """
+_SYNC_SQL = _SYNC_SQL_TEMPLATE.format(table="progress_all")
 
 FULL_SYNC_EVERY = 360  # 360 사이클(=6시간)마다 전체 재동기화
 
-# 변경분만 가져오는 쿼리
-_SYNC_CHANGED_SQL = _SYNC_SQL.replace("ORDER BY p.id", "WHERE (p.updated_at > %s OR p.created_at > %s) ORDER BY p.id")
+# 변경분만 가져오는 쿼리 (아카이브 행은 바뀌지 않으므로 progress만)
+_SYNC_CHANGED_SQL = _SYNC_SQL_TEMPLATE.format(table="progress").replace(
+    "ORDER BY p.id", "WHERE (p.updated_at > %s OR p.created_at > %s) ORDER BY p.id")
 
-# ID만 가져오는 경량 쿼리 (삭제 감지용)
-_SYNC_IDS_SQL = "SELECT id FROM progress ORDER BY id"
+# ID만 가져오는 경량 쿼리 (삭제 감지용, 아카이브로 옮긴 행은 삭제 아님)
+_SYNC_IDS_SQL = "SELECT id FROM progress_all ORDER BY id"
 
 
 class SheetSync:
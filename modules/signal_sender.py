@@ -28,12 +28,27 @@ def _format_phone(phone: str) -> str:
     return phone
 
 
+def _flush_db():
+    """외부 전송 전 현재 요청/작업의 미커밋 DB 쓰기 커밋.
+
+    네트워크 대기 동안 행 잠금/커넥션을 잡지 않고, 발송 이후 롤백으로
+    발송 전 기록(알림일 등)이 사라져 재발송되는 일이 없도록.
+    """
+    try:
+        import models
+        if models.db_manager:
+            models.db_manager.flush_unit_of_work()
+    except Exception as e:
+        logger.warning("전송 전 DB 커밋 실패: %s", e)
+
+
 def send_task(task_type: str, data: dict, priority: int = 2) -> bool:
     """서버PC에 태스크 전송. 성공 시 True, 실패 시 False."""
     if not TASK_API_URL:
         logger.warning("TASK_API_URL 미설정, 태스크 전송 스킵")
         return False
 
+    _flush_db()
     try:
         r = requests.post(
             f"{TASK_API_URL}/api/task/submit",
@@ -87,6 +102,7 @@ def request_notification(name: str, phone: str, message: str) -> bool:
 
 def cancel_campaign_tasks(campaign_id: str) -> int:
     """서버PC의 해당 캠페인 대기 홍보 태스크 일괄 취소. 취소된 건수 반환."""
+    _flush_db()
     try:
         r = requests.post(
             f"{TASK_API_URL}/api/task/cancel-campaign",
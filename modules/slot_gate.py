@@ -0,0 +1,98 @@
+"""
+slot_gate.py - 캠페인 매진 빠른 거절 게이트
+
+인기 캠페인 구매시간이 열리면 신청이 한꺼번에 몰리는데, 정원이 다 찬 뒤에도
+요청마다 reserve_slots가 캠페인 행을 잠그고 카운터를 다시 읽는다.
+이 게이트는 reserve_slots가 잠금 아래에서 읽은 잔여(총/금일)를 캠페인별로 기억해 두고,
+잔여가 요청 수보다 적으면 DB에 가지 않고 바로 거절한다.
+
+  갱신   : reserve_slots가 등록 없이 끝난 경우의 잔여 (정원/금일 초과 등 그 시점 잔여)
+           등록에 성공하면 커밋 직후 변경 알림이 어차피 지우므로 기록하지 않음
+  무효화 : DBManager 변경 알림 (취소/타임아웃/삭제 등으로 자리가 날 수 있음) 즉시
+  만료   : GATE_TTL (다른 워커에서 자리가 난 경우가 반영되는 최대 지연)
+  KST 날짜가 바뀌면 금일 잔여는 버림
+
+최종 판정은 항상 reserve_slots 트랜잭션. 게이트는 "확실히 모자란" 경우만 거른다.
+"""
+
+import time
+import logging
+
+from modules.utils import now_kst
+
+logger = logging.getLogger(__name__)
+
+GATE_TTL = 5   # 초
+
+
+class SlotGate:
+    """캠페인별 마지막으로 확인한 잔여 슬롯 (프로세스 로컬)"""
+
+    def __init__(self, db, ttl: float = GATE_TTL):
+        self.ttl = ttl
+        self._state = {}   # campaign_id → (총 잔여, 금일 잔여(-1=제한 없음), KST 날짜, 기록 시각)
+        self.hits = 0
+        self.misses = 0
+        db.add_change_listener(self._on_change)
+
+    # ─────────── 무효화 ───────────
+
+    def _on_change(self, kind: str, campaign_id: str = None):
+        if campaign_id is None:
+            self._state.clear()
+        else:
+            self._state.pop(campaign_id, None)
+
+    # ─────────── 갱신 ───────────
+
+    def record(self, campaign_id: str, reservation: dict):
+        """등록 없이 끝난 reserve_slots 결과의 잔여 반영.
+
+        등록 성공(ok)이면 무시: 작업 단위 커밋 후 notify_counters_changed가 이 항목을 지우고,
+        잔여를 읽기 전에 끝난 실패(not_found/closed)는 잔여 정보가 없다.
+        """
+        if reservation.get("ok") or "total_remaining" not in reservation:
+            return
+        self._state[campaign_id] = (
+            reservation["total_remaining"], reservation["daily_remaining"],
+            now_kst().date(), time.monotonic())
+
+    # ─────────── 조회 ───────────
+
+    def remaining(self, campaign_id: str) -> tuple[int, int] | None:
+        """유효한 (총 잔여, 금일 잔여) 또는 None(모름)"""
+        state = self._state.get(campaign_id)
+        if state is None:
+            return None
+        total_left, daily_left, day, recorded_at = state
+        if time.monotonic() - recorded_at >= self.ttl:
+            self._state.pop(campaign_id, None)
+            return None
+        if day != now_kst().date():
+            daily_left = -1
+        return total_left, daily_left
+
+    def check(self, campaign_id: str, count: int = 1) -> tuple[str, int] | None:
+        """count건 신청이 확실히 불가하면 (사유, 잔여), 아니면 None(DB에서 판정).
+
+        사유는 reserve_slots와 같은 코드: "capacity" | "daily"
+        """
+        known = self.remaining(campaign_id)
+        if known is not None:
+            total_left, daily_left = known
+            if total_left < count:
+                self.hits += 1
+                return "capacity", max(0, total_left)
+            if 0 <= daily_left < count:
+                self.hits += 1
+                return "daily", daily_left
+        self.misses += 1
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "campaigns": len(self._state),
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -18,6 +18,7 @@ timeout_manager.py - 30분 타임아웃 관리
 import time
 import logging
 import threading
+from contextlib import nullcontext
 from datetime import timezone
 
 logger = logging.getLogger(__name__)
@@ -64,7 +65,7 @@ class TimeoutManager:
         if self._running:
             return
         self._running = True
-        self._thread = threading.Thread(target=self._check_loop, daemon=True)
+        self._thread = threading.Thread(target=self._check_loop, daemon=True, name="timeout-manager")
         self._thread.start()
         logger.info(f"타임아웃 매니저 시작 (경고: {self.warning}초, 취소: {self.timeout}초)")
 
@@ -79,41 +80,85 @@ class TimeoutManager:
         db_check_counter = 0
         deadline_check_counter = 0
         cleanup_counter = 0
+        reconcile_counter = 0
+        status_sweep_counter = 0
+        archive_counter = 0
         while self._running:
-            try:
-                self._check_all()
-            except Exception as e:
-                logger.error(f"타임아웃 체크 에러: {e}")
+            # 단계마다 따로 작업 단위 → 단계가 끝나면 바로 커밋 (틱 전체 동안 잠금/커넥션 유지 안 함)
+            self._run_step("timeout_check", self._check_all, "타임아웃 체크 에러")
 
             # DB 기반 타임아웃: 30초마다 (15초 * 2)
             db_check_counter += 1
             if db_check_counter >= 2:
                 db_check_counter = 0
-                try:
-                    self._check_db_stale()
-                except Exception as e:
-                    logger.error(f"DB 타임아웃 체크 에러: {e}")
+                self._run_step("timeout_db_stale", self._check_db_stale, "DB 타임아웃 체크 에러")
 
             # 리뷰 기한 리마인더: 1시간마다 (15초 * 240 = 3600초)
             deadline_check_counter += 1
             if deadline_check_counter >= 240:
                 deadline_check_counter = 0
-                try:
-                    self._check_review_deadlines()
-                except Exception as e:
-                    logger.error(f"리뷰 기한 체크 에러: {e}")
+                self._run_step("review_deadlines", self._check_review_deadlines, "리뷰 기한 체크 에러")
 
             # 타임아웃취소 자동삭제: 1시간마다 (15초 * 240)
             cleanup_counter += 1
             if cleanup_counter >= 240:
                 cleanup_counter = 0
+                self._run_step("timeout_cleanup", self._cleanup_timeout_cancelled, "타임아웃취소 정리 에러")
+
+            # 캠페인 카운터 드리프트 보정: 6시간마다 (15초 * 1440)
+            # 작업 단위 밖에서 실행 → 어긋난 캠페인 배치마다 따로 커밋되어 잠금이 짧음
+            reconcile_counter += 1
+            if reconcile_counter >= 1440:
+                reconcile_counter = 0
+                try:
+                    if self._db_manager:
+                        self._db_manager.reconcile_campaign_counters()
+                except Exception as e:
+                    logger.error(f"캠페인 카운터 보정 에러: {e}")
+
+            # 캠페인 자동 상태 전환 보정: 10분마다 (15초 * 40)
+            # 평소 전환은 카운터 트리거가 처리 → 잠금 경합으로 건너뛴 것만 반영
+            status_sweep_counter += 1
+            if status_sweep_counter >= 40:
+                status_sweep_counter = 0
+                self._run_step("status_sweep", self._sweep_campaign_statuses, "캠페인 상태 전환 보정 에러")
+
+            # 입금완료 오래된 행 아카이브: 6시간마다 (15초 * 1440)
+            # 작업 단위 밖에서 실행 → 배치마다 따로 커밋되어 잠금이 짧음
+            archive_counter += 1
+            if archive_counter >= 1440:
+                archive_counter = 0
                 try:
-                    self._cleanup_timeout_cancelled()
+                    if self._db_manager:
+                        self._db_manager.archive_settled_progress()
                 except Exception as e:
-                    logger.error(f"타임아웃취소 정리 에러: {e}")
+                    logger.error(f"진행건 아카이브 에러: {e}")
 
             time.sleep(15)  # 15초마다 체크
 
+    def _run_step(self, label: str, fn, error_message: str):
+        """단계 1개를 자체 DB 작업 단위로 실행. 단계 에러는 로그만 남기고 그때까지의 쓰기는 커밋."""
+        try:
+            with self._job_scope(label):
+                try:
+                    fn()
+                except Exception as e:
+                    logger.error(f"{error_message}: {e}")
+        except Exception as e:
+            logger.error(f"타임아웃 작업 커밋 에러 ({label}): {e}")
+
+    def _sweep_campaign_statuses(self):
+        if self._db_manager:
+            changed = self._db_manager.reconcile_campaign_statuses()
+            if changed:
+                logger.info("캠페인 상태 전환 보정: %s", changed)
+
+    def _job_scope(self, label: str = "timeout_manager"):
+        """단계 1회분을 DB 작업 단위로 묶음 (쓰기 일괄 커밋, 외부 전송 전에는 signal_sender가 커밋)"""
+        if self._db_manager:
+            return self._db_manager.unit_of_work(label)
+        return nullcontext()
+
     def _get_db_created_epoch(self, state) -> float:
         """DB에서 progress.created_at을 가져와 epoch 반환 (캠페인 신청 시점)"""
         if not self._db_manager:
@@ -485,6 +530,7 @@ class TimeoutManager:
                    WHERE id = ANY(%s)""",
                 (all_cancel_ids,)
             )
+            self._db_manager.notify_counters_changed()
             logger.info("DB 기반 자동 취소: %d건", len(all_cancel_ids))
             # warned 클리어
             for pid in all_cancel_ids:
@@ -4,10 +4,12 @@ reviewer.py - 리뷰어 웹 UI Blueprint
 캠페인 목록, 신청, 가이드, 캡쳐 업로드 등 리뷰어 플로우 전체.
 """
 
+import json
 import logging
 from flask import Blueprint, render_template, request, jsonify
 
 import models
+from modules.http_cache import CACHE_PUBLIC, CACHE_PRIVATE, make_etag, not_modified, etag_json
 
 logger = logging.getLogger(__name__)
 
@@ -60,132 +62,78 @@ def my_page():
 
 @reviewer_bp.route("/api/campaigns")
 def api_campaigns():
-    """캠페인 목록 JSON (campaign_id 포함)"""
+    """캠페인 목록 JSON (campaign_id 포함)
+
+    name/phone 없이 부르면 익명 목록 (공유 캐시 가능). 내 진행 이력은
+    /api/my/campaign-ids로 따로 받는다. name/phone을 주면 하위호환용으로
+    카드마다 my_history를 합쳐서 돌려준다.
+    """
     if not models.campaign_manager or not models.db_manager:
         return jsonify([])
 
-    from modules.utils import safe_int, is_within_buy_time
+    from modules.utils import safe_int, now_kst as _now_kst
 
     name = request.args.get("name", "").strip()
     phone = request.args.get("phone", "").strip()
 
-    all_campaigns = models.campaign_manager.get_all_campaigns()
-    if not all_campaigns:
-        return jsonify([])
-
-    detail_counts = {}
-    today_counts = {}
-    reviewer_items = []
+    # 공개/모집중 캠페인 + 카운터 + 파생값은 공유 카탈로그, 내 진행 아이디만 별도 조회
+    catalog = models.campaign_manager.catalog
+    personal = bool(name and phone)
+    now = _now_kst()
     try:
-        detail_counts = models.db_manager.count_all_campaigns_detail()
+        entries = catalog.entries()
+        my_history = models.db_manager.get_my_campaign_history(name, phone) if entries else {}
+        version = catalog.version()
     except Exception as e:
-        logger.error("count_all_campaigns_detail 에러: %s", e, exc_info=True)
-    try:
-        today_counts = models.db_manager.count_today_all_campaigns()
-    except Exception:
-        pass
-    if name and phone:
-        try:
-            reviewer_items = models.db_manager.search_by_name_phone(name, phone)
-        except Exception:
-            pass
+        logger.error("캠페인 카탈로그 에러: %s", e, exc_info=True)
+        return jsonify([])
+    if not entries:
+        return jsonify([])
 
-    from datetime import datetime as _datetime
-    from modules.utils import now_kst as _now_kst
+    # 응답을 결정하는 값: 카탈로그/카운터 버전 + 구매가능시간 상태 (+ 내 이력)
+    cache_control = CACHE_PRIVATE if personal else CACHE_PUBLIC
+    etag = make_etag("campaigns", version, catalog.buy_time_state(now),
+                     json.dumps(my_history, sort_keys=True) if personal else "")
+    cached = not_modified(etag, cache_control)
+    if cached is not None:
+        return cached
 
     cards = []
-    for c in all_campaigns:
-        campaign_id = c.get("캠페인ID", "")
-        status = c.get("상태", "")
-        if c.get("공개여부", "").strip().upper() in ("N",):
-            continue
-        if status not in ("모집중", "진행중", ""):
-            continue
-        total = safe_int(c.get("총수량", 0))
-        dc = detail_counts.get(campaign_id, {})
-        reserved = dc.get("reserved", 0) or safe_int(c.get("완료수량", 0))
-        review_stage = dc.get("review_stage", 0)
-        payment_stage = dc.get("payment_stage", 0)
-        total_remaining = total - reserved
-
-        # 마감 판단: 입금대기+ >= 총수량 → 캠페인마감, 리뷰대기+ >= 총수량 → 모집마감
-        is_closed = False
-        closed_reason = ""
-        if total > 0 and payment_stage >= total:
-            is_closed = True
-            closed_reason = "캠페인마감"
-        elif total > 0 and review_stage >= total:
-            is_closed = True
-            closed_reason = "모집마감"
-        elif total_remaining <= 0:
-            is_closed = True
-            closed_reason = "마감"
-
-        daily_target = models.campaign_manager._get_today_target(c)
-        today_done = today_counts.get(campaign_id, 0)
-        daily_full = daily_target > 0 and today_done >= daily_target
-        if not is_closed and daily_full:
-            is_closed = True
-            closed_reason = "금일마감"
-
-        if daily_target > 0:
-            remaining = daily_target - today_done
-        else:
-            remaining = total_remaining
-
-        buy_time_str = c.get("구매가능시간", "").strip()
-        buy_time_active = is_within_buy_time(buy_time_str)
-
-        # 시작일 전 여부 체크
-        start_date_raw = (c.get("시작일") or "").strip()
-        not_started = False
-        if start_date_raw:
-            try:
-                _sd = _now_kst().strftime("%Y-%m-%d")
-                if _sd < start_date_raw:
-                    not_started = True
-                    if not is_closed:
-                        is_closed = True
-                        closed_reason = f"{start_date_raw} 오픈"
-            except Exception:
-                pass
+    for entry in entries:
+        c = entry["campaign"]
+        campaign_id = entry["campaign_id"]
+        closed_reason = entry["closed_reason"]
+        is_closed = bool(closed_reason)
+        remaining = entry["board_remaining"]
 
         card = {
             "campaign_id": campaign_id,
             "name": c.get("캠페인명", "") or c.get("상품명", ""),
             "store": c.get("업체명", ""),
-            "total": total,
+            "total": entry["total"],
             "remaining": max(remaining, 0),
             "urgent": not is_closed and 0 < remaining <= 5,
-            "buy_time": buy_time_str,
-            "buy_time_closed": not buy_time_active,
+            "buy_time": entry["buy_time"],
+            "buy_time_closed": not catalog.buy_time_active(entry, now),
             "product_price": str(c.get("결제금액", "") or c.get("상품금액", "")),
             "review_fee": str(c.get("리뷰비", "") or ""),
             "platform": str(c.get("플랫폼", "") or c.get("캠페인유형", "") or ""),
             "closed": is_closed,
             "closed_reason": closed_reason,
-            "not_started": not_started,
+            "not_started": entry["not_started"],
             "max_per_person_daily": safe_int(c.get("1인일일제한", 0)),
             "schedule": c.get("일정", []) or [],
-            "start_date": start_date_raw,
+            "start_date": entry["start_date"],
         }
 
         # 내 진행 이력
-        if campaign_id and reviewer_items:
-            my_history = []
-            for item in reviewer_items:
-                if item.get("캠페인ID") == campaign_id:
-                    sid = item.get("아이디", "").strip()
-                    st = item.get("상태", "")
-                    if sid and st not in ("타임아웃취소", "취소"):
-                        my_history.append({"id": sid, "status": st, "progress_id": item.get("id")})
-            if my_history:
-                card["my_history"] = my_history
+        if my_history.get(campaign_id):
+            card["my_history"] = my_history[campaign_id]
 
         cards.append(card)
 
     # 신청가능 → 구매시간전 → 금일마감 → 모집/캠페인마감 순
-    today_str = _now_kst().strftime("%Y-%m-%d")
+    today_str = now.strftime("%Y-%m-%d")
     def sort_key(x):
         sd = x.get("start_date", "")
         future = 1 if sd and sd > today_str else 0
@@ -198,7 +146,31 @@ def api_campaigns():
         else:
             return (3, future, x["name"])
     cards.sort(key=sort_key)
-    return jsonify(cards)
+    return etag_json(cards, etag, cache_control)
+
+
+@reviewer_bp.route("/api/my/campaign-ids")
+def api_my_campaign_ids():
+    """캠페인 목록 오버레이: 내 진행중 아이디 (campaign_id, store_id, status, progress_id)
+
+    /api/campaigns(익명, 공유 캐시 가능)와 따로 받아 클라이언트에서 합친다.
+    """
+    name = request.args.get("name", "").strip()
+    phone = request.args.get("phone", "").strip()
+    if not name or not phone or not models.db_manager:
+        return jsonify({"items": []})
+
+    try:
+        items = models.db_manager.get_my_campaign_ids(name, phone)
+    except Exception as e:
+        logger.error("내 캠페인 아이디 조회 에러: %s", e, exc_info=True)
+        return jsonify({"items": []})
+
+    etag = make_etag("my-campaign-ids", json.dumps(items, sort_keys=True))
+    cached = not_modified(etag, CACHE_PRIVATE)
+    if cached is not None:
+        return cached
+    return etag_json({"items": items}, etag, CACHE_PRIVATE)
 
 
 @reviewer_bp.route("/api/campaign/<campaign_id>")
@@ -207,24 +179,64 @@ def api_campaign_detail(campaign_id):
     if not models.campaign_manager:
         return jsonify({"error": "not_ready"}), 503
 
-    campaign = models.campaign_manager.get_campaign_by_id(campaign_id)
-    if not campaign:
-        return jsonify({"error": "not_found"}), 404
-
-    # 잔여 수량 계산
     from modules.utils import safe_int, is_within_buy_time
-    total = safe_int(campaign.get("총수량", 0))
+
+    name = request.args.get("name", "").strip()
+    phone = request.args.get("phone", "").strip()
+    personal = bool(name and phone)
+
+    # 공개/모집중 캠페인은 카탈로그 값으로 (카운터 조회 없이 ETag 비교)
+    catalog = models.campaign_manager.catalog
     try:
-        counts = models.db_manager.count_all_campaigns()
-        done = counts.get(campaign_id, 0)
+        entry = catalog.get(campaign_id)
     except Exception:
-        done = safe_int(campaign.get("완료수량", 0))
-    remaining = total - done
+        entry = None
+
+    if entry:
+        campaign = entry["campaign"]
+        total = entry["total"]
+        remaining = entry["total_remaining"]
+        daily_remaining = max(0, entry["daily_target"] - entry["today_done"]) if entry["daily_target"] > 0 else -1
+        buy_time_active = catalog.buy_time_active(entry)
+    else:
+        campaign = models.campaign_manager.get_campaign_by_id(campaign_id)
+        if not campaign:
+            return jsonify({"error": "not_found"}), 404
+
+        # 잔여 수량 계산
+        total = safe_int(campaign.get("총수량", 0))
+        try:
+            counts = models.db_manager.count_all_campaigns()
+            done = counts.get(campaign_id, 0)
+        except Exception:
+            done = safe_int(campaign.get("완료수량", 0))
+        remaining = total - done
 
-    # 일일 잔여
-    daily_remaining = -1
-    if models.campaign_manager:
+        # 일일 잔여
         daily_remaining = models.campaign_manager.check_daily_remaining(campaign_id)
+        buy_time_active = is_within_buy_time(campaign.get("구매가능시간", ""))
+
+    # 신청 게이트가 매진을 확인했으면 카탈로그(최대 CATALOG_TTL 지연)보다 우선
+    known = models.campaign_manager.slot_gate.remaining(campaign_id)
+    if known is not None:
+        if known[0] <= 0:
+            remaining = 0
+        if known[1] == 0:
+            daily_remaining = 0
+
+    my_ids = None
+    if personal:
+        try:
+            my_ids = models.db_manager.get_user_campaign_ids(name, phone, campaign_id)
+        except Exception:
+            my_ids = []
+
+    cache_control = CACHE_PRIVATE if personal else CACHE_PUBLIC
+    etag = make_etag("campaign", campaign_id, campaign.get("updated_at", ""),
+                     remaining, daily_remaining, buy_time_active, my_ids)
+    cached = not_modified(etag, cache_control)
+    if cached is not None:
+        return cached
 
     result = {
         "campaign_id": campaign_id,
@@ -243,7 +255,7 @@ def api_campaign_detail(campaign_id):
         "options": campaign.get("옵션", ""),
         "option_list": campaign.get("옵션목록", "[]"),
         "buy_time": campaign.get("구매가능시간", ""),
-        "buy_time_active": is_within_buy_time(campaign.get("구매가능시간", "")),
+        "buy_time_active": buy_time_active,
         "status": campaign.get("상태", ""),
         "campaign_guide": campaign.get("캠페인가이드", ""),
         "review_guide": campaign.get("리뷰가이드내용", ""),
@@ -261,16 +273,10 @@ def api_campaign_detail(campaign_id):
     }
 
     # 리뷰어 이력 추가 (로그인한 경우)
-    name = request.args.get("name", "").strip()
-    phone = request.args.get("phone", "").strip()
-    if name and phone:
-        try:
-            my_ids = models.db_manager.get_user_campaign_ids(name, phone, campaign_id)
-            result["my_ids"] = my_ids
-        except Exception:
-            result["my_ids"] = []
+    if my_ids is not None:
+        result["my_ids"] = my_ids
 
-    return jsonify(result)
+    return etag_json(result, etag, cache_control)
 
 
 @reviewer_bp.route("/api/apply", methods=["POST"])
@@ -316,77 +322,58 @@ def api_apply():
     if buy_time_str and not is_within_buy_time(buy_time_str):
         return jsonify({"ok": False, "error": f"현재 구매시간이 아닙니다. 구매시간: {buy_time_str}"}), 400
 
-    # 정원 확인
-    capacity = models.campaign_manager.check_capacity(campaign_id)
-    if capacity < len(store_ids):
-        return jsonify({"ok": False, "error": f"잔여 {capacity}자리입니다. 요청 수를 줄여주세요."}), 400
-
-    # 일일 잔여 확인
-    daily_remaining = models.campaign_manager.check_daily_remaining(campaign_id)
-    if daily_remaining >= 0 and daily_remaining < len(store_ids):
-        return jsonify({"ok": False, "error": f"금일 잔여 {daily_remaining}자리입니다."}), 400
-
-    # 1인 일일 제한 확인
-    from modules.utils import safe_int
-    max_pp = safe_int(campaign.get("1인일일제한", 0))
-    if max_pp > 0:
-        already = models.db_manager.count_today_user_campaign(name, phone, campaign_id)
-        if already + len(store_ids) > max_pp:
-            remain = max(0, max_pp - already)
-            return jsonify({"ok": False, "error": f"1인 하루 최대 {max_pp}건입니다. (잔여 {remain}건)"}), 400
-
-    # 중복 체크 및 등록
-    results = []
-    for sid in store_ids:
-        sid = sid.strip()
-        if not sid:
-            continue
-        if models.reviewer_manager.check_duplicate(campaign_id, sid):
-            results.append({"store_id": sid, "ok": False, "error": "이미 등록된 아이디"})
-            continue
-        # 동시진행그룹 중복 체크
-        group_conflict = models.db_manager.check_exclusive_group_duplicate(campaign_id, sid)
-        if group_conflict:
-            results.append({"store_id": sid, "ok": False, "error": f"동시진행 캠페인 [{group_conflict}]에서 사용 중"})
-            continue
-
-        try:
-            progress_id = models.reviewer_manager.register(name, phone, campaign, sid)
-            # 아이디 목록 업데이트
-            models.db_manager.update_reviewer_store_ids(name, phone, sid)
-            # 사진 세트 자동 할당 (계정별)
-            assigned_photo_set = None
-            try:
-                photo_sets = models.db_manager.get_campaign_photo_sets(campaign_id)
-                if photo_sets:
-                    next_set = models.db_manager.get_next_photo_set_number(campaign_id)
-                    if next_set is not None:
-                        models.db_manager.assign_photo_set([progress_id], next_set)
-                        assigned_photo_set = next_set
-                        logger.info("사진세트 %d 자동할당: %s / %s (progress %d)", next_set, name, sid, progress_id)
-            except Exception as pe:
-                logger.warning("사진세트 자동할당 실패: %s", pe)
-            # 리뷰내용 자동 할당
-            try:
-                review_texts = models.db_manager.get_campaign_review_texts(campaign_id)
-                if review_texts:
-                    # 사진세트와 같은 번호 우선 매칭
-                    if assigned_photo_set and assigned_photo_set in review_texts:
-                        models.db_manager.assign_review_text([progress_id], assigned_photo_set)
-                        logger.info("리뷰내용 %d 자동할당(사진매칭): progress %d", assigned_photo_set, progress_id)
-                    else:
-                        next_text = models.db_manager.get_next_review_text_number(campaign_id)
-                        if next_text is not None:
-                            models.db_manager.assign_review_text([progress_id], next_text)
-                            logger.info("리뷰내용 %d 자동할당: progress %d", next_text, progress_id)
-            except Exception as te:
-                logger.warning("리뷰내용 자동할당 실패: %s", te)
-            results.append({"store_id": sid, "ok": True, "progress_id": progress_id})
-        except Exception as e:
-            logger.error("신청 에러: %s", e, exc_info=True)
-            results.append({"store_id": sid, "ok": False, "error": str(e)})
-
+    # 매진 빠른 거절: 최근 확인한 잔여가 요청 수보다 적으면 DB 없이 거절 (최종 판정은 reserve_slots)
+    # 마감/시작일/구매시간 안내가 잔여 안내보다 우선이므로 그 확인 뒤에 둔다
+    gate = models.campaign_manager.slot_gate
+    blocked = gate.check(campaign_id, len([s for s in store_ids if str(s).strip()]))
+    if blocked:
+        reason, left = blocked
+        if reason == "daily":
+            return jsonify({"ok": False, "error": f"금일 잔여 {left}자리입니다."}), 400
+        return jsonify({"ok": False, "error": f"잔여 {left}자리입니다. 요청 수를 줄여주세요."}), 400
+
+    # 정원/일일잔여/1인제한/중복/동시진행그룹 확인 + 등록(+ 리뷰어 아이디목록)을
+    # 캠페인 잠금 아래 한 트랜잭션으로. 아이디 여러 개도 확인 1회 + INSERT 1회.
+    reservation = models.db_manager.reserve_slots(campaign_id, name, phone, store_ids)
+    gate.record(campaign_id, reservation)
+    reason = reservation["reason"]
+    if reason == "not_found":
+        return jsonify({"ok": False, "error": "캠페인을 찾을 수 없습니다"}), 404
+    if reason == "closed":
+        return jsonify({"ok": False, "error": "모집이 마감된 캠페인입니다."}), 400
+    if reason == "capacity":
+        return jsonify({"ok": False, "error": f"잔여 {reservation['remaining']}자리입니다. 요청 수를 줄여주세요."}), 400
+    if reason == "daily":
+        return jsonify({"ok": False, "error": f"금일 잔여 {reservation['remaining']}자리입니다."}), 400
+    if reason == "per_person":
+        return jsonify({"ok": False, "error": f"1인 하루 최대 {reservation['limit']}건입니다. (잔여 {reservation['remaining']}건)"}), 400
+
+    results = reservation["results"]
+    display_name = campaign.get("캠페인명", "") or campaign.get("상품명", "")
     success = [r for r in results if r.get("ok")]
+    for r in success:
+        logger.info("리뷰어 등록: %s (%s) - %s [%s]", name, phone, display_name, r["store_id"])
+
+    # 사진세트 / 리뷰내용 자동 할당 (계정별, 신청 아이디 전체를 한 번에)
+    # 슬롯은 이미 확정됨 → 할당 실패는 로그만 (관리자 배분으로 보충 가능)
+    progress_ids = [r["progress_id"] for r in success]
+    photo_sets = {}
+    if progress_ids:
+        try:
+            photo_sets = models.db_manager.claim_asset_slots(campaign_id, "photo", progress_ids)
+            for pid, set_number in photo_sets.items():
+                logger.info("사진세트 %d 자동할당: %s (progress %d)", set_number, name, pid)
+        except Exception as pe:
+            logger.warning("사진세트 자동할당 실패: %s", pe)
+        try:
+            # 사진세트와 같은 번호 우선 매칭
+            texts = models.db_manager.claim_asset_slots(
+                campaign_id, "text", progress_ids, preferred=photo_sets)
+            for pid, text_number in texts.items():
+                matched = "(사진매칭)" if photo_sets.get(pid) == text_number else ""
+                logger.info("리뷰내용 %d 자동할당%s: progress %d", text_number, matched, pid)
+        except Exception as te:
+            logger.warning("리뷰내용 자동할당 실패: %s", te)
 
     # 카카오 친구추가 요청 (신청 성공 시, 미등록 친구만)
     if success:
@@ -770,6 +757,7 @@ def api_task_purchase(progress_id):
                 progress_id,
             )
         )
+        models.db_manager.notify_counters_changed(campaign_id)
 
         # 2. Drive 업로드 큐에 각 파일 추가
         from app import _make_upload_filename
@@ -788,7 +776,6 @@ def api_task_purchase(progress_id):
                 file.content_type or "image/jpeg", file_bytes
             )
         models.db_manager.set_upload_pending(progress_id, "purchase")
-        models.db_manager.auto_update_campaign_statuses()
 
         return jsonify({"ok": True, "message": "구매 캡쳐 제출 완료!"})
     except Exception as e:
@@ -837,8 +824,7 @@ def api_task_review(progress_id):
                updated_at = NOW() WHERE id = %s""",
             (progress_id,)
         )
-
-        models.db_manager.auto_update_campaign_statuses()
+        models.db_manager.notify_counters_changed()
         return jsonify({"ok": True, "message": "리뷰 캡쳐 제출 완료!"})
     except Exception as e:
         logger.error("리뷰 제출 에러: %s", e, exc_info=True)
@@ -0,0 +1,21 @@
+"""
+테스트 공통 설정
+
+app.py와 같은 환경에서 돌도록 테스트 모듈/앱 모듈 import보다 먼저 eventlet monkey patch와
+psycopg2 green 패치를 1회 적용한다. fixture 안에서 패치하면 이미 import된 threading/psycopg2와
+섞이고 되돌릴 수도 없어 이후 실행되는 모듈로 새어 나감.
+eventlet/psycogreen이 없으면 패치하지 않음 (green thread가 필요한 테스트는 skip).
+"""
+
+try:
+    import eventlet
+except ImportError:
+    eventlet = None
+else:
+    eventlet.monkey_patch()
+    try:
+        from psycogreen.eventlet import patch_psycopg
+    except ImportError:
+        pass
+    else:
+        patch_psycopg()
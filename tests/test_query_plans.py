@@ -0,0 +1,158 @@
+"""
+자주 실행되는 progress/chat 조회가 설계한 인덱스(_HOT_INDEXES)를 타는지 EXPLAIN으로 확인
+
+  DATABASE_URL=postgresql://... python -m pytest tests/test_query_plans.py
+  DATABASE_URL 미설정 시 전체 skip
+  DBManager 생성 시 마이그레이션이 실행되므로 버려도 되는 DB에서만 실행
+  (시드 데이터/ANALYZE는 한 트랜잭션 안에서 하고 테스트 후 ROLLBACK)
+"""
+
+import os
+
+import pytest
+
+DATABASE_URL = os.environ.get("DATABASE_URL", "")
+
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="DATABASE_URL 미설정 (PostgreSQL 필요)")
+
+SEED_ROWS = 20000
+SEED_REVIEWERS = 200
+SEED_CAMPAIGNS = 20
+
+
+@pytest.fixture(scope="module")
+def cur():
+    psycopg2 = pytest.importorskip("psycopg2")
+    from modules.db_manager import DBManager
+    DBManager(DATABASE_URL, min_conn=1, max_conn=2)   # 마이그레이션 (인덱스 생성)
+
+    conn = psycopg2.connect(DATABASE_URL)
+    try:
+        with conn.cursor() as c:
+            _seed(c)
+            yield c
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def _seed(c):
+    """운영과 비슷한 분포: 대부분 완료 상태, 진행 중/취소/확인요청은 소수"""
+    c.execute(
+        """INSERT INTO reviewers (name, phone)
+           SELECT '__plan_test_' || i, '010' || lpad(i::text, 8, '0')
+           FROM generate_series(1, %s) i
+           RETURNING id""",
+        (SEED_REVIEWERS,))
+    reviewer_ids = [r[0] for r in c.fetchall()]
+    c.execute(
+        """INSERT INTO campaigns (id, campaign_name, total_qty)
+           SELECT '__plan_test_' || i, '플랜 테스트 ' || i, 100000
+           FROM generate_series(1, %s) i""",
+        (SEED_CAMPAIGNS,))
+    c.execute(
+        """INSERT INTO progress (campaign_id, reviewer_id, store_id, status, depositor,
+                                 ai_purchase_result, ai_review_result, created_at)
+           SELECT '__plan_test_' || (1 + i %% %s),
+                  (%s::int[])[1 + i %% %s],
+                  's' || i,
+                  CASE i %% 100 WHEN 0 THEN '신청' WHEN 1 THEN '가이드전달'
+                                WHEN 2 THEN '취소' WHEN 3 THEN '구매캡쳐대기' ELSE '입금완료' END,
+                  'd' || (i %% 500),
+                  CASE WHEN i %% 400 = 0 THEN '확인요청' ELSE '' END,
+                  CASE WHEN i %% 400 = 7 THEN '확인요청' ELSE '' END,
+                  NOW() - i * INTERVAL '1 minute'
+           FROM generate_series(1, %s) i""",
+        (SEED_CAMPAIGNS, reviewer_ids, SEED_REVIEWERS, SEED_ROWS))
+    c.execute(
+        """INSERT INTO chat_messages (reviewer_id, sender, message, created_at)
+           SELECT 'r' || (i %% %s), CASE WHEN i %% 2 = 0 THEN 'user' ELSE 'bot' END, 'm',
+                  NOW() - (i %% 600) * INTERVAL '1 second'
+           FROM generate_series(1, %s) i""",
+        (SEED_REVIEWERS, SEED_ROWS))
+    c.execute("ANALYZE progress")
+    c.execute("ANALYZE chat_messages")
+
+
+def _plan_indexes(c, sql, params=()) -> set:
+    """EXPLAIN 결과에서 사용한 인덱스 이름 (파티션 인덱스는 부모 인덱스 이름으로)"""
+    c.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+    plan = c.fetchone()[0][0]["Plan"]
+    names, stack = set(), [plan]
+    while stack:
+        node = stack.pop()
+        if "Index Name" in node:
+            names.add(node["Index Name"])
+        stack.extend(node.get("Plans", ()))
+    resolved = set()
+    for name in names:
+        c.execute("SELECT COALESCE(pg_partition_root(%s::regclass)::text, %s)", (name, name))
+        resolved.add(c.fetchone()[0])
+    return resolved
+
+
+def test_db_stale_uses_pending_partial_index(cur):
+    # TimeoutManager._check_db_stale
+    used = _plan_indexes(cur, "SELECT id FROM progress p WHERE p.status IN ('신청', '가이드전달')")
+    assert "idx_progress_pending_created" in used
+
+
+def test_cancelled_cleanup_uses_partial_index(cur):
+    # delete_old_cancelled_rows
+    used = _plan_indexes(
+        cur, "SELECT id FROM progress WHERE status IN (%s, %s) AND created_at < NOW() - INTERVAL '1 hour'",
+        ("타임아웃취소", "취소"))
+    assert "idx_progress_cancelled_created" in used
+
+
+def test_search_by_depositor_uses_composite_index(cur):
+    used = _plan_indexes(
+        cur, "SELECT * FROM progress WHERE depositor = %s AND status = %s", ("d7", "구매캡쳐대기"))
+    assert "idx_progress_depositor_status" in used
+
+
+def test_ai_check_requests_use_partial_indexes(cur):
+    # get_ai_check_requests / get_pending_review_count
+    used = _plan_indexes(
+        cur, "SELECT * FROM progress WHERE ai_purchase_result = '확인요청' OR ai_review_result = '확인요청'")
+    assert {"idx_progress_ai_purchase_check", "idx_progress_ai_review_check"} <= used
+
+
+def test_reviewer_lookup_uses_composite_index(cur):
+    # 내 신청내역/타임아웃 취소 (reviewer_id 단독 인덱스는 제거됨)
+    cur.execute("SELECT id FROM reviewers WHERE name = '__plan_test_1'")
+    reviewer_id = cur.fetchone()[0]
+    used = _plan_indexes(cur, "SELECT * FROM progress WHERE reviewer_id = %s", (reviewer_id,))
+    assert "idx_progress_reviewer_campaign_store" in used
+    used = _plan_indexes(
+        cur, "SELECT id FROM progress WHERE reviewer_id = %s AND campaign_id = %s AND store_id = %s",
+        (reviewer_id, "__plan_test_2", "s1"))
+    assert used & {"idx_progress_reviewer_campaign_store", "idx_progress_store"}
+
+
+def test_chat_history_uses_reviewer_created_index(cur):
+    # get_chat_history
+    used = _plan_indexes(
+        cur, """SELECT sender, message FROM chat_messages
+                WHERE reviewer_id = %s AND created_at > NOW() - INTERVAL '90 days'
+                ORDER BY created_at""",
+        ("r7",))
+    assert used & {"idx_chat_reviewer_created", "idx_chat_reviewer_sender_created"}
+    assert "idx_chat_reviewer" not in used
+
+
+def test_chat_unread_uses_reviewer_sender_index(cur):
+    # count_chat_unread
+    used = _plan_indexes(
+        cur, """SELECT COUNT(*) FROM chat_messages
+                WHERE reviewer_id = %s AND sender = 'bot' AND created_at > NOW() - INTERVAL '1 day'""",
+        ("r7",))
+    assert "idx_chat_reviewer_sender_created" in used
+
+
+def test_hot_indexes_are_valid(cur):
+    from modules.db_manager import _HOT_INDEXES
+    for idx_name, _ in _HOT_INDEXES:
+        cur.execute("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)", (idx_name,))
+        row = cur.fetchone()
+        assert row is not None and row[0], idx_name
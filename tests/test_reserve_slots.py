@@ -0,0 +1,137 @@
+"""
+reserve_slots 동시성 테스트
+
+여러 green thread가 같은 캠페인에 동시에 신청해도
+정원 / 금일 목표 / 1인 일일 제한을 넘겨 예약되지 않는지 확인한다.
+
+  DATABASE_URL=postgresql://... python -m pytest tests/test_reserve_slots.py
+  DATABASE_URL 미설정 시 전체 skip
+  DBManager 생성 시 마이그레이션이 실행되고 테스트 데이터를 쓰므로 버려도 되는 DB에서만 실행
+"""
+
+import os
+import uuid
+
+import pytest
+
+DATABASE_URL = os.environ.get("DATABASE_URL", "")
+
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="DATABASE_URL 미설정 (PostgreSQL 필요)")
+
+NAME_PREFIX = "__slot_test_"
+CONCURRENCY = 40
+
+
+@pytest.fixture(scope="module")
+def green():
+    # monkey patch / psycopg2 green 패치는 conftest.py에서 import 전에 1회 적용
+    eventlet = pytest.importorskip("eventlet")
+    pytest.importorskip("psycogreen.eventlet")
+    if not eventlet.patcher.is_monkey_patched("thread"):
+        pytest.skip("eventlet monkey patch 미적용")
+    return eventlet
+
+
+@pytest.fixture(scope="module")
+def db(green):
+    from modules.db_manager import DBManager
+    manager = DBManager(DATABASE_URL, min_conn=2, max_conn=CONCURRENCY // 2)
+    yield manager
+    manager._execute("DELETE FROM reviewers WHERE name LIKE %s", (NAME_PREFIX + "%",))
+
+
+@pytest.fixture
+def campaign(db):
+    """campaign(total_qty=, daily_qty=, max_per_person_daily=) → 캠페인 id (테스트 후 삭제)"""
+    created = []
+
+    def create(total_qty, daily_qty=0, max_per_person_daily=0):
+        campaign_id = "t" + uuid.uuid4().hex[:12]
+        db._execute(
+            """INSERT INTO campaigns (id, status, campaign_name, is_public,
+                                      total_qty, daily_qty, max_per_person_daily)
+               VALUES (%s, '모집중', %s, TRUE, %s, %s, %s)""",
+            (campaign_id, "동시성 테스트 " + campaign_id, total_qty, daily_qty, max_per_person_daily)
+        )
+        created.append(campaign_id)
+        return campaign_id
+
+    yield create
+    for campaign_id in created:
+        db._execute("DELETE FROM progress WHERE campaign_id = %s", (campaign_id,))
+        db._execute("DELETE FROM campaigns WHERE id = %s", (campaign_id,))
+
+
+def _hammer(green, db, campaign_id, requests):
+    """requests: [(이름, 연락처, [아이디...])] 를 동시에 신청 → reserve_slots 결과 목록"""
+    pool = green.GreenPool(CONCURRENCY)
+    return list(pool.starmap(
+        lambda name, phone, sids: db.reserve_slots(campaign_id, name, phone, sids),
+        requests))
+
+
+def _reserved(db, campaign_id) -> tuple[int, int]:
+    """(진행 중 progress 행 수, campaign_counters.reserved)"""
+    from modules.db_manager import STATUS_TIMEOUT, STATUS_CANCELLED
+    rows = db._fetchone(
+        """SELECT (SELECT COUNT(*) FROM progress
+                   WHERE campaign_id = %s AND status NOT IN (%s, %s)) AS actual,
+                  COALESCE((SELECT reserved FROM campaign_counters WHERE campaign_id = %s), 0) AS counter""",
+        (campaign_id, STATUS_TIMEOUT, STATUS_CANCELLED, campaign_id), replica=False)
+    return rows["actual"], rows["counter"]
+
+
+def _accepted(results) -> int:
+    return sum(1 for r in results for item in r["results"] if item["ok"])
+
+
+def test_capacity_never_exceeded(green, db, campaign):
+    campaign_id = campaign(total_qty=5)
+    tag = uuid.uuid4().hex[:6]
+    results = _hammer(green, db, campaign_id, [
+        (f"{NAME_PREFIX}{tag}_{i}", f"010{i:08d}", [f"cap_{tag}_{i}"]) for i in range(CONCURRENCY)
+    ])
+
+    assert _accepted(results) == 5
+    assert {r["reason"] for r in results if not r["ok"]} == {"capacity"}
+    assert _reserved(db, campaign_id) == (5, 5)
+
+
+def test_daily_target_never_exceeded(green, db, campaign):
+    campaign_id = campaign(total_qty=100, daily_qty=3)
+    tag = uuid.uuid4().hex[:6]
+    results = _hammer(green, db, campaign_id, [
+        (f"{NAME_PREFIX}{tag}_{i}", f"010{i:08d}", [f"day_{tag}_{i}"]) for i in range(CONCURRENCY)
+    ])
+
+    assert _accepted(results) == 3
+    assert {r["reason"] for r in results if not r["ok"]} == {"daily"}
+    assert _reserved(db, campaign_id) == (3, 3)
+
+
+def test_per_person_limit_never_exceeded(green, db, campaign):
+    # 같은 사람이 처음 신청하는 경우 (리뷰어 행이 아직 없음) 포함
+    campaign_id = campaign(total_qty=100, max_per_person_daily=2)
+    tag = uuid.uuid4().hex[:6]
+    name, phone = f"{NAME_PREFIX}{tag}", "01099990000"
+    results = _hammer(green, db, campaign_id, [
+        (name, phone, [f"pp_{tag}_{i}"]) for i in range(CONCURRENCY)
+    ])
+
+    assert _accepted(results) == 2
+    assert {r["reason"] for r in results if not r["ok"]} == {"per_person"}
+    assert _reserved(db, campaign_id) == (2, 2)
+
+
+def test_multi_id_requests_all_or_nothing(green, db, campaign):
+    # 3개 아이디 신청은 잔여가 3 미만이면 통째로 거절 → 9건에서 멈춤
+    campaign_id = campaign(total_qty=10)
+    tag = uuid.uuid4().hex[:6]
+    results = _hammer(green, db, campaign_id, [
+        (f"{NAME_PREFIX}{tag}_{i}", f"010{i:08d}", [f"multi_{tag}_{i}_{k}" for k in range(3)])
+        for i in range(CONCURRENCY)
+    ])
+
+    assert _accepted(results) == 9
+    assert all(len([x for x in r["results"] if x["ok"]]) in (0, 3) for r in results)
+    assert _reserved(db, campaign_id) == (9, 9)